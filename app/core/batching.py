@@ -0,0 +1,38 @@
+# app/core/batching.py
+from typing import List, Sequence
+
+
+def build_token_budget_batches(
+    lengths: Sequence[int], max_tokens: int, max_batch_size: int
+) -> List[List[int]]:
+    """
+    Chunk indekslerini token uzunluğuna göre (uzundan kısaya) sıralar ve her partinin dolgulu
+    (padded) maliyeti 'parti boyu x en uzun dizi' max_tokens'ı aşmayacak şekilde gruplar.
+    Benzer uzunluktaki diziler aynı partiye düştüğü için dolgu (padding) israfı en aza iner;
+    kısa chunk'lar büyük, uzun chunk'lar küçük partilerde işlenir.
+    Dönen indeksler orijinal sıraya göredir; sonuçlar bu indekslerle yerine yazılmalıdır.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True)
+
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_max = 0
+    for index in order:
+        length = max(1, lengths[index])
+        # Azalan sırada ilerlendiği için partinin en uzun dizisi ilk elemandır.
+        padded_max = current_max or length
+        if current and (
+            len(current) >= max_batch_size
+            or (len(current) + 1) * padded_max > max_tokens
+        ):
+            batches.append(current)
+            current = []
+            current_max = 0
+            padded_max = length
+
+        current.append(index)
+        current_max = padded_max
+
+    if current:
+        batches.append(current)
+    return batches
@@ -0,0 +1,155 @@
+# app/core/boilerplate.py
+"""
+Site genelinde tekrar eden satırların (div ile çizilmiş menüler, yasal uyarılar, çerez bildirimleri)
+atılması. Her host için satırların kaç farklı sayfada (URL) geçtiği öğrenilir; yeterli sayfa
+görüldükten sonra sayfaların WEB_BOILERPLATE_RATIO kadarında geçen satırlar chunk'lara girmez.
+Sayfaların satır anahtarları durum deposunda saklanır, bir sonraki döngü önceki döngünün
+öğrendikleriyle başlar.
+"""
+
+import asyncio
+import hashlib
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from app.core import state_store
+from app.core.config import settings
+
+STATE_NAMESPACE = "boilerplate"
+
+_models: Dict[str, "HostLineModel"] = {}
+
+
+def _line_key(line: str) -> str:
+    return hashlib.blake2b(line.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _state_key(host: str, url: str) -> str:
+    return f"{host}|{url}"
+
+
+class HostLineModel:
+    """
+    Bir host'un URL -> sayfanın son sürümündeki satır anahtarları ve satır -> o satırı içeren farklı
+    sayfa sayısı modeli. Aynı URL yeniden indirildiğinde eski sürümün satırları düşülür; döngüler
+    boyunca aynı sayfa birden fazla sayılmaz. En fazla WEB_BOILERPLATE_WINDOW_PAGES sayfa tutulur,
+    en uzun süredir görülmeyen sayfalar çıkarılır; site şablonu değişince eski satırlar unutulur.
+    """
+
+    def __init__(
+        self, host: str, pages: Optional[Dict[str, Tuple[int, List[str]]]] = None
+    ):
+        self.host = host
+        # URL -> (görülme sırası, satır anahtarları); sözlük sırası görülme sırasıdır.
+        self.pages: Dict[str, Tuple[int, List[str]]] = {}
+        self.counts: Dict[str, int] = {}
+        for url, (seq, keys) in sorted(
+            (pages or {}).items(), key=lambda item: item[1][0]
+        ):
+            self._add(url, seq, keys)
+        self._next_seq = max((seq for seq, _ in self.pages.values()), default=0) + 1
+        self._changed: Dict[str, None] = {}
+        self._removed: Dict[str, None] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._changed or self._removed)
+
+    def _add(self, url: str, seq: int, keys: List[str]):
+        self.pages[url] = (seq, keys)
+        for key in keys:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def _remove(self, url: str):
+        _, keys = self.pages.pop(url, (0, []))
+        for key in keys:
+            count = self.counts[key] - 1
+            if count:
+                self.counts[key] = count
+            else:
+                del self.counts[key]
+
+    def strip(self, url: str, text: str) -> str:
+        """Sayfayı (URL'nin önceki sürümünün yerine) modele ekler ve şablon satırlarını atar."""
+        lines = text.split("\n")
+        keys = [_line_key(line) for line in lines]
+        with self._lock:
+            self._remove(url)
+            self._add(url, self._next_seq, list(dict.fromkeys(keys)))
+            self._next_seq += 1
+            self._changed[url] = None
+            self._removed.pop(url, None)
+            while len(self.pages) > settings.WEB_BOILERPLATE_WINDOW_PAGES:
+                oldest = next(iter(self.pages))
+                self._remove(oldest)
+                self._changed.pop(oldest, None)
+                self._removed[oldest] = None
+
+            if len(self.pages) < settings.WEB_BOILERPLATE_MIN_PAGES:
+                return text
+            threshold = settings.WEB_BOILERPLATE_RATIO * len(self.pages)
+            kept = [
+                line
+                for line, key in zip(lines, keys)
+                if self.counts.get(key, 0) < threshold
+            ]
+
+        # Sayfanın tamamı şablondan ibaretse (ör. boş liste sayfası) metin olduğu gibi bırakılır.
+        if not kept:
+            return text
+        return "\n".join(kept)
+
+    def take_changes(self) -> Tuple[Dict[str, list], List[str]]:
+        """Son kayıttan beri değişen sayfa kayıtlarını ve silinecek anahtarları döndürür."""
+        with self._lock:
+            changed = {
+                _state_key(self.host, url): list(self.pages[url])
+                for url in self._changed
+            }
+            removed = [_state_key(self.host, url) for url in self._removed]
+            self._changed = {}
+            self._removed = {}
+        return changed, removed
+
+
+def _load_model(host: str) -> HostLineModel:
+    prefix = _state_key(host, "")
+    stored = state_store.get_store().scan(STATE_NAMESPACE, prefix)
+    return HostLineModel(
+        host,
+        {key[len(prefix) :]: (seq, keys) for key, (seq, keys) in stored.items()},
+    )
+
+
+async def strip_boilerplate(url: str, text: str) -> str:
+    if not settings.WEB_BOILERPLATE_ENABLED or not text:
+        return text
+
+    host = urlsplit(url).netloc
+    model = _models.get(host)
+    if model is None:
+        loaded = await asyncio.to_thread(_load_model, host)
+        model = _models.setdefault(host, loaded)
+    return await asyncio.to_thread(model.strip, url, text)
+
+
+def _save_changes(changes: List[Tuple[Dict[str, list], List[str]]]):
+    store = state_store.get_store()
+    for changed, removed in changes:
+        if changed:
+            store.put_many(STATE_NAMESPACE, changed)
+        if removed:
+            store.delete_many(STATE_NAMESPACE, removed)
+
+
+async def save_boilerplate_models(hosts: Iterable[str]):
+    """Değişen host modellerini durum deposuna yazar (ingester commit'inde çağrılır)."""
+    changes = [
+        _models[host].take_changes()
+        for host in set(hosts)
+        if host in _models and _models[host].dirty
+    ]
+    if changes:
+        await asyncio.to_thread(_save_changes, changes)
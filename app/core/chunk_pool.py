@@ -0,0 +1,139 @@
+# app/core/chunk_pool.py
+"""
+Chunk'lama ve chunk özetlerinin (point ID girdisi) hesaplanması CPU'ya bağlıdır; asyncio döngüsünde
+yapılırsa /health ve gRPC istekleri bekler. Küçük dokümanlar thread'de, büyük dokümanlar
+(KNOWLEDGE_INDEXING_CHUNK_PROCESSES > 0 ise) ayrı süreçlerde işlenir.
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, List, Optional, Tuple
+
+import structlog
+
+from app.core.chunking import iter_chunks, token_chunk_texts
+from app.core.config import settings
+from app.core.manifest import chunk_content_hash
+from app.core.models import Document
+
+logger = structlog.get_logger()
+
+# (chunk metni, token uzunluğu veya None, chunk özeti)
+HashedChunk = Tuple[str, Optional[int], str]
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def chunk_document(text: str, metadata: dict) -> List[HashedChunk]:
+    """Tek dokümanı karakter modunda chunk'lar ve her chunk'ın özetini hesaplar."""
+    return [
+        (chunk, None, chunk_content_hash(chunk, metadata))
+        for chunk in iter_chunks(text)
+    ]
+
+
+def _chunk_documents(documents: List[Document]) -> List[List[HashedChunk]]:
+    return [chunk_document(doc.page_content, doc.metadata) for doc in documents]
+
+
+def _token_chunk_documents(
+    tokenizer: Any,
+    documents: List[Document],
+    max_tokens: int,
+    overlap_tokens: int,
+    specials: int,
+) -> List[List[HashedChunk]]:
+    chunked = token_chunk_texts(
+        tokenizer, [doc.page_content for doc in documents], max_tokens, overlap_tokens
+    )
+    return [
+        [
+            (chunk, count + specials, chunk_content_hash(chunk, doc.metadata))
+            for chunk, count in chunks
+        ]
+        for doc, chunks in zip(documents, chunked)
+    ]
+
+
+def _get_executor() -> Optional[ProcessPoolExecutor]:
+    global _executor
+
+    if settings.KNOWLEDGE_INDEXING_CHUNK_PROCESSES <= 0:
+        return None
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.KNOWLEDGE_INDEXING_CHUNK_PROCESSES,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        logger.info(
+            f"Chunking process pool started with {settings.KNOWLEDGE_INDEXING_CHUNK_PROCESSES} workers.",
+            event_name="CHUNK_POOL_STARTED",
+            processes=settings.KNOWLEDGE_INDEXING_CHUNK_PROCESSES,
+        )
+    return _executor
+
+
+async def chunk_documents(
+    documents: List[Document],
+    token_limits: Optional[Tuple[int, int]] = None,
+    tokenizer: Any = None,
+) -> List[List[HashedChunk]]:
+    """
+    Dokümanları döngü dışında chunk'lar. Token modunda (token_limits = (chunk başına token,
+    özel token sayısı)) partideki dokümanlar tek tokenizer çağrısıyla thread'de işlenir;
+    tokenizer Rust tarafında GIL'i bıraktığı için süreç havuzuna gerek kalmaz.
+    """
+    if token_limits is not None:
+        max_tokens, specials = token_limits
+        return await asyncio.to_thread(
+            _token_chunk_documents,
+            tokenizer,
+            documents,
+            max_tokens,
+            min(settings.KNOWLEDGE_INDEXING_CHUNK_OVERLAP_TOKENS, max_tokens - 1),
+            specials,
+        )
+
+    executor = _get_executor()
+    min_chars = settings.KNOWLEDGE_INDEXING_CHUNK_PROCESS_MIN_CHARS
+    large = (
+        [i for i, doc in enumerate(documents) if len(doc.page_content) >= min_chars]
+        if executor is not None
+        else []
+    )
+    if not large:
+        return await asyncio.to_thread(_chunk_documents, documents)
+
+    loop = asyncio.get_running_loop()
+    large_set = set(large)
+    small = [doc for i, doc in enumerate(documents) if i not in large_set]
+    small_chunks, large_chunks = await asyncio.gather(
+        asyncio.to_thread(_chunk_documents, small),
+        asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    executor,
+                    chunk_document,
+                    documents[i].page_content,
+                    documents[i].metadata,
+                )
+                for i in large
+            )
+        ),
+    )
+
+    small_results = iter(small_chunks)
+    large_results = dict(zip(large, large_chunks))
+    return [
+        large_results[i] if i in large_set else next(small_results)
+        for i in range(len(documents))
+    ]
+
+
+def close_chunk_pool():
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -1,6 +1,21 @@
 # sentiric-knowledge-indexing-service/app/core/chunking.py
 import re
-from typing import List
+from bisect import bisect_left
+from typing import Any, Generator, Iterable, Iterator, List, Sequence, Tuple
+
+
+# Ayırıcılar (öncelik sırasına göre) ve kesimin ayırıcıya göre konumu: noktalama chunk'ta kalır,
+# boşluk karakterleri iki chunk arasında atılır.
+_SEPARATORS = [
+    ("\n\n", 0),
+    ("\n", 0),
+    (". ", 1),
+    ("? ", 1),
+    ("! ", 1),
+    (";", 1),
+    (",", 1),
+    (" ", 0),
+]
 
 
 def split_text_into_chunks(
@@ -10,80 +25,201 @@ def split_text_into_chunks(
     Metni anlamsal bütünlüğü korumaya çalışarak parçalara böler.
     Öncelik sırası: Paragraf -> Satır -> Cümle -> Kelime.
     """
-    if not text:
-        return []
+    return list(iter_chunks(text, chunk_size, chunk_overlap))
 
-    # 1. Gereksiz boşlukları temizle ama paragraf yapısını koru
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    text = text.strip()
 
-    # Ayırıcılar (Öncelik sırasına göre)
-    separators = ["\n\n", "\n", ". ", "? ", "! ", ";", ",", " ", ""]
+def iter_chunks(
+    text: str, chunk_size: int = 512, chunk_overlap: int = 50
+) -> Iterator[str]:
+    """Chunk'ları tembel (lazy) üretir; metin bir kez normalize edilir, sonra span'ler kesilir."""
+    if not text:
+        return
 
-    return _recursive_split(text, separators, chunk_size, chunk_overlap)
+    # Gereksiz boşlukları temizle ama paragraf yapısını koru (gerekmiyorsa metin kopyalanmaz)
+    if "\n\n\n" in text:
+        text = re.sub(r"\n{3,}", "\n\n", text)
+    for start, end in iter_chunk_spans(text, chunk_size, chunk_overlap):
+        yield text[start:end]
 
 
-def _recursive_split(
-    text: str, separators: List[str], chunk_size: int, chunk_overlap: int
-) -> List[str]:
+def iter_chunk_spans(
+    text: str, chunk_size: int = 512, chunk_overlap: int = 50
+) -> Iterator[Tuple[int, int]]:
     """
-    Recursive bölme mantığı.
+    Tek geçişte (start, end) offset'leri üretir; metin kopyalanmaz.
+
+    Her chunk en fazla chunk_size karakterdir. Kesim, pencerenin ikinci yarısında bulunan en
+    öncelikli ayırıcıdan (paragraf -> satır -> cümle -> kelime) yapılır; hiçbiri yoksa pencere
+    sonunda sert kesilir. Her ayırıcı için pencere içinde tek bir rfind yapıldığından toplam iş
+    metin uzunluğuyla doğrusaldır. Paragraf içinden kesildiyse bir sonraki chunk, öncekinin son
+    chunk_overlap karakterinden (kelime ortasına denk gelmeyecek şekilde) başlar.
+    Baştaki / sondaki boşluklar span'e dahil edilmez.
     """
-    final_chunks = []
-
-    # Ayırıcı listesi bittiyse mecburen karakter bazlı böl
-    if not separators:
-        return [
-            text[i : i + chunk_size]
-            for i in range(0, len(text), chunk_size - chunk_overlap)
-        ]
-
-    separator = separators[0]
-    next_separators = separators[1:]
-
-    # Mevcut ayırıcıya göre böl
-    if separator == "":
-        splits = list(text)  # Karakter bazlı
-    else:
-        splits = text.split(separator)
-
-    # Parçaları birleştirerek chunk oluştur
-    current_chunk = []
-    current_length = 0
-
-    for split in splits:
-        split_len = len(split)
-
-        # Eğer tek bir parça bile chunk_size'dan büyükse, onu bir alt ayırıcı ile böl
-        if split_len > chunk_size:
-            if current_chunk:
-                final_chunks.append(separator.join(current_chunk))
-                current_chunk = []
-                current_length = 0
-
-            sub_chunks = _recursive_split(
-                split, next_separators, chunk_size, chunk_overlap
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    if not 0 <= chunk_overlap < chunk_size:
+        raise ValueError("chunk_overlap must be in [0, chunk_size)")
+
+    length = len(text)
+    min_fill = chunk_size // 2
+    start = _skip_whitespace(text, 0, length)
+    while start < length:
+        limit = start + chunk_size
+        if limit >= length:
+            end = _trim_right(text, start, length)
+            if end > start:
+                yield start, end
+            return
+
+        cut = limit
+        paragraph_break = False
+        for separator, keep in _SEPARATORS:
+            index = text.rfind(separator, start + min_fill, limit)
+            if index != -1:
+                cut = index + keep
+                paragraph_break = separator == "\n\n"
+                break
+
+        end = _trim_right(text, start, cut)
+        if end > start:
+            yield start, end
+
+        next_start = cut
+        if chunk_overlap and not paragraph_break:
+            # Overlap kelime sınırından başlar; sınır yoksa overlap uygulanmaz. Paragraf
+            # sınırında kesilen chunk'lar bağımsızdır, önceki paragrafın sonu taşınmaz.
+            position = max(cut - chunk_overlap, start + 1)
+            while position < cut and not text[position].isspace():
+                position += 1
+            if position < cut:
+                next_start = position
+        start = _skip_whitespace(text, next_start, length)
+
+
+def token_chunk_texts(
+    tokenizer: Any, texts: List[str], max_tokens: int, overlap_tokens: int = 0
+) -> List[List[Tuple[str, int]]]:
+    """
+    Metinleri modelin hızlı (fast) tokenizer'ıyla tek partide tokenize eder ve her metni en fazla
+    max_tokens token'lık chunk'lara böler. Her metin için (chunk, token sayısı) listesi döner;
+    token sayısı özel token'ları (CLS / SEP) içermez ve embedding partilerinin bütçesinde yeniden
+    kullanılır, böylece chunk'lar embedding aşamasında uzunluk için tekrar tokenize edilmez.
+    """
+    texts = [
+        re.sub(r"\n{3,}", "\n\n", text) if "\n\n\n" in text else text for text in texts
+    ]
+    encoded = tokenizer(
+        texts,
+        add_special_tokens=False,
+        return_offsets_mapping=True,
+        return_attention_mask=False,
+        return_token_type_ids=False,
+        truncation=False,
+        verbose=False,
+    )
+    return [
+        [
+            (text[start:end], count)
+            for start, end, count in iter_token_chunk_spans(
+                text, offsets, max_tokens, overlap_tokens
             )
-            final_chunks.extend(sub_chunks)
-            continue
-
-        # Mevcut chunk'a ekleyince taşıyor mu?
-        if current_length + split_len + len(separator) > chunk_size:
-            if current_chunk:
-                doc_chunk = separator.join(current_chunk)
-                final_chunks.append(doc_chunk)
-
-                # Overlap mantığı: Son birkaç parçayı yeni chunk'ın başına ekle
-                # Basitlik için şimdilik overlap'i sadece bir önceki parçayı alarak simüle ediyoruz
-                # Daha karmaşık overlap mantığı burada işlem maliyetini artırabilir.
-                current_chunk = []
-                current_length = 0
-
-        current_chunk.append(split)
-        current_length += split_len + len(separator)
+        ]
+        for text, offsets in zip(texts, encoded["offset_mapping"])
+    ]
 
-    # Son kalan parçayı ekle
-    if current_chunk:
-        final_chunks.append(separator.join(current_chunk))
 
-    return final_chunks
+def iter_token_chunk_spans(
+    text: str,
+    offsets: Sequence[Tuple[int, int]],
+    max_tokens: int,
+    overlap_tokens: int = 0,
+) -> Iterator[Tuple[int, int, int]]:
+    """
+    iter_chunk_spans'in token karşılığı: pencere karakter yerine token sayısıyla (max_tokens)
+    ölçülür, kesim yine pencerenin ikinci yarısındaki en öncelikli ayırıcıdan yapılır ve token
+    sınırına hizalanır. (start, end, token sayısı) üretir.
+    """
+    if max_tokens <= 0:
+        raise ValueError("max_tokens must be positive")
+    if not 0 <= overlap_tokens < max_tokens:
+        raise ValueError("overlap_tokens must be in [0, max_tokens)")
+
+    starts = [start for start, _ in offsets]
+    count = len(offsets)
+    i = 0
+    while i < count:
+        limit = i + max_tokens
+        if limit >= count:
+            cut = count
+            paragraph_break = True
+        else:
+            cut = limit
+            paragraph_break = False
+            window_end = starts[limit]
+            min_start = starts[i + max_tokens // 2]
+            for separator, keep in _SEPARATORS:
+                index = text.rfind(separator, min_start, window_end)
+                if index != -1:
+                    # Kesim noktasından sonra başlayan ilk token'a hizalanır.
+                    cut = max(bisect_left(starts, index + keep, i, limit), i + 1)
+                    paragraph_break = separator == "\n\n"
+                    break
+
+        start = _skip_whitespace(text, starts[i], offsets[cut - 1][1])
+        end = _trim_right(text, start, offsets[cut - 1][1])
+        if end > start:
+            yield start, end, cut - i
+
+        next_i = cut
+        if overlap_tokens and not paragraph_break:
+            # Overlap bir kelimenin ilk token'ından başlar; yoksa uygulanmaz.
+            j = max(cut - overlap_tokens, i + 1)
+            while j < cut and starts[j] > 0 and not text[starts[j] - 1].isspace():
+                j += 1
+            if j < cut:
+                next_i = j
+        i = next_i
+
+
+def _skip_whitespace(text: str, position: int, end: int) -> int:
+    while position < end and text[position].isspace():
+        position += 1
+    return position
+
+
+def _trim_right(text: str, start: int, end: int) -> int:
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return end
+
+
+def iter_paragraph_segments(
+    blocks: Iterable[str], target_chars: int
+) -> Generator[str, None, None]:
+    """
+    Parça parça gelen metni (ör. büyük bir dosyanın blokları) paragraf sınırlarında, en az
+    target_chars uzunluğunda segmentlere böler; bellekte en fazla birkaç segment tutulur.
+    Sınırlar paragraf aralarına denk geldiği için her segment ayrı chunk'lansa da sonuç bütün
+    metnin chunk'larına çok yakındır. Paragraf yoksa satır sonunda, o da yoksa sert kesilir.
+    """
+    hard_limit = target_chars * 4
+    buffer = ""
+    for block in blocks:
+        buffer += block
+        start = 0
+        while len(buffer) - start >= target_chars:
+            cut = buffer.find("\n\n", start + target_chars, start + hard_limit)
+            if cut == -1:
+                if len(buffer) - start < hard_limit:
+                    break
+                cut = buffer.rfind("\n", start + target_chars, start + hard_limit)
+                if cut == -1:
+                    cut = start + hard_limit
+            segment = buffer[start:cut]
+            start = cut
+            if segment.strip():
+                yield segment
+        buffer = buffer[start:]
+
+    if buffer.strip():
+        yield buffer
@@ -0,0 +1,464 @@
+# app/core/collections.py
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Dict, Optional, Set
+
+import structlog
+from qdrant_client import models
+
+from app.core.config import settings
+from app.core.manifest import DOCUMENT_KEY_FIELD
+
+if TYPE_CHECKING:
+    from app.workers.indexing_worker import IndexingManager
+
+logger = structlog.get_logger()
+
+PAYLOAD_INDEX_FIELDS = ("source_uri", "source_type", DOCUMENT_KEY_FIELD)
+TENANT_ID_FIELD = "tenant_id"
+# Toplu yükleme sırasında koleksiyon metadata'sında tutulan sahip (worker_id) ve başlangıç zamanı.
+BULK_LOAD_METADATA_KEY = "bulk_load"
+
+
+def collection_name_for(tenant_id: str) -> str:
+    """Kiracının noktalarının yazılacağı koleksiyon: paylaşılan koleksiyon veya kiracıya özel olan."""
+    return settings.QDRANT_MULTITENANT_COLLECTION or (
+        f"{settings.QDRANT_DB_COLLECTION_PREFIX}{tenant_id}"
+    )
+
+
+def is_shared_collection(collection_name: str) -> bool:
+    return collection_name == settings.QDRANT_MULTITENANT_COLLECTION
+
+
+def tenant_condition(tenant_id: str) -> models.FieldCondition:
+    return models.FieldCondition(
+        key=TENANT_ID_FIELD, match=models.MatchValue(value=tenant_id)
+    )
+
+
+def quantization_config() -> Optional[models.QuantizationConfig]:
+    """QDRANT_QUANTIZATION ayarına göre koleksiyonun kuantizasyon yapılandırmasını döndürür."""
+    kind = settings.QDRANT_QUANTIZATION
+    always_ram = settings.QDRANT_QUANTIZATION_ALWAYS_RAM
+    if kind == "none":
+        return None
+    elif kind == "scalar":
+        return models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(
+                type=models.ScalarType.INT8,
+                quantile=settings.QDRANT_SCALAR_QUANTILE,
+                always_ram=always_ram,
+            )
+        )
+    elif kind == "product":
+        return models.ProductQuantization(
+            product=models.ProductQuantizationConfig(
+                compression=models.CompressionRatio(
+                    settings.QDRANT_PRODUCT_COMPRESSION
+                ),
+                always_ram=always_ram,
+            )
+        )
+    elif kind == "binary":
+        return models.BinaryQuantization(
+            binary=models.BinaryQuantizationConfig(always_ram=always_ram)
+        )
+    else:
+        raise ValueError(f"Desteklenmeyen kuantizasyon türü: {kind}")
+
+
+def _quantization_kind(config) -> str:
+    if config is None:
+        return "none"
+    for kind in ("scalar", "product", "binary"):
+        if getattr(config, kind, None) is not None:
+            return kind
+    return "unknown"
+
+
+class CollectionManager:
+    """
+    Qdrant koleksiyonlarının şemasını yönetir. Doğrulanmış koleksiyonlar süreç içinde önbelleğe
+    alınır; her veri kaynağı için 'get_collection' çağrısı yapılmaz. Koleksiyonla ilgili bir hata
+    olduğunda kayıt geçersiz kılınır ve bir sonraki kullanımda yeniden doğrulanır.
+    Yeni veya boş koleksiyonlar döngü boyunca toplu yükleme (HNSW kapalı) modunda doldurulur.
+    """
+
+    def __init__(self, manager: "IndexingManager"):
+        self.manager = manager
+        self._known: Set[str] = set()
+        self._lock = asyncio.Lock()
+        # Bu döngüde toplu yükleme modunda doldurulan koleksiyonlar.
+        self._bulk_load: Set[str] = set()
+        # Ayarları geri yüklenmiş, indeksi Qdrant'ta hâlâ kurulan koleksiyonlar -> geri yükleme anı.
+        self._optimizing: Dict[str, float] = {}
+
+    @property
+    def client(self):
+        return self.manager.qdrant_client
+
+    def invalidate(self, collection_name: str):
+        self._known.discard(collection_name)
+
+    def _hnsw_config(
+        self, collection_name: str, bulk_load: bool = False
+    ) -> models.HnswConfigDiff:
+        m = 0 if bulk_load else settings.QDRANT_HNSW_M
+        if is_shared_collection(collection_name):
+            # Paylaşılan koleksiyonda global graf kurulmaz; her kiracı için ayrı graf (payload_m)
+            # kurulur. Aramalar her zaman tenant_id filtresi ile yapılır.
+            return models.HnswConfigDiff(
+                m=0,
+                payload_m=m,
+                ef_construct=settings.QDRANT_HNSW_EF_CONSTRUCT,
+                on_disk=settings.QDRANT_HNSW_ON_DISK,
+            )
+        return models.HnswConfigDiff(
+            m=m,
+            ef_construct=settings.QDRANT_HNSW_EF_CONSTRUCT,
+            on_disk=settings.QDRANT_HNSW_ON_DISK,
+        )
+
+    def _optimizers_config(
+        self, bulk_load: bool = False
+    ) -> models.OptimizersConfigDiff:
+        return models.OptimizersConfigDiff(
+            indexing_threshold=0 if bulk_load else settings.QDRANT_INDEXING_THRESHOLD
+        )
+
+    async def ensure(self, collection_name: str, dimension: Optional[int] = None):
+        if collection_name in self._known:
+            return
+        async with self._lock:
+            if collection_name in self._known:
+                return
+            await asyncio.wait_for(self._ensure(collection_name, dimension), timeout=30)
+            self._known.add(collection_name)
+
+    async def _ensure(self, collection_name: str, dimension: Optional[int]):
+        bulk_load = settings.QDRANT_BULK_LOAD_ENABLED
+        if not await self.client.collection_exists(collection_name=collection_name):
+            await self._create(
+                collection_name, bulk_load, dimension or self.manager.embedder.dimension
+            )
+            if bulk_load:
+                self._bulk_load.add(collection_name)
+            return
+
+        info = await self.client.get_collection(collection_name=collection_name)
+        await self._reconcile(collection_name, info)
+        if self._graph_m(collection_name, info) == 0:
+            owner = self._bulk_load_owner(info)
+            if await self._owner_active(collection_name, owner):
+                # Başka bir pod (veya aynı kiracının başka bir kaynağı) koleksiyonu hâlâ dolduruyor;
+                # ayarları yüklemenin sahibi geri yükler.
+                logger.info(
+                    f"Collection {collection_name} is being bulk-loaded by {owner}.",
+                    event_name="QDRANT_BULK_LOAD_IN_PROGRESS",
+                    collection=collection_name,
+                    owner=owner,
+                )
+                return
+            if not (bulk_load and not info.points_count):
+                # Yarıda kalmış bir toplu yükleme (ör. pod çöktü); indeks ayarları geri yüklenir.
+                logger.warn(
+                    f"Collection {collection_name} was left in bulk-load mode, restoring index.",
+                    event_name="QDRANT_BULK_LOAD_RECOVERED",
+                    collection=collection_name,
+                    owner=owner,
+                )
+                await self._set_bulk_load(collection_name, False)
+                return
+        if bulk_load and not info.points_count:
+            await self._set_bulk_load(collection_name, True)
+            self._bulk_load.add(collection_name)
+
+    def _bulk_load_owner(self, info: models.CollectionInfo) -> Optional[str]:
+        marker = (info.config.metadata or {}).get(BULK_LOAD_METADATA_KEY)
+        return marker.get("owner") if isinstance(marker, dict) else None
+
+    async def _owner_active(self, collection_name: str, owner: Optional[str]) -> bool:
+        """
+        m=0 olan koleksiyonun toplu yüklemesi hâlâ sürüyor mu? Kiralar kaynak bazlı olduğundan sahip
+        worker'ın süresi dolmamış bir kirası varsa yükleme sürüyor sayılır. Sahibi kaydedilmemiş
+        (eski sürümde başlatılmış) yüklemeler yarıda kalmış kabul edilir.
+        """
+        if owner is None:
+            return False
+        if owner == self.manager.scheduler.worker_id:
+            return collection_name in self._bulk_load
+        return await self.manager.scheduler.has_active_leases(owner)
+
+    def _bulk_load_metadata(self, enabled: bool) -> dict:
+        if not enabled:
+            # Qdrant metadata'yı birleştirir; None verilen anahtar silinir.
+            return {BULK_LOAD_METADATA_KEY: None}
+        return {
+            BULK_LOAD_METADATA_KEY: {
+                "owner": self.manager.scheduler.worker_id,
+                "started_at": datetime.now(timezone.utc).isoformat(),
+            }
+        }
+
+    def _graph_m(
+        self, collection_name: str, info: models.CollectionInfo
+    ) -> Optional[int]:
+        hnsw = info.config.hnsw_config
+        return hnsw.payload_m if is_shared_collection(collection_name) else hnsw.m
+
+    async def _create(self, collection_name: str, bulk_load: bool, dimension: int):
+        logger.info(
+            f"Creating vector collection: {collection_name}",
+            event_name="QDRANT_COLLECTION_CREATE",
+            bulk_load=bulk_load,
+            quantization=settings.QDRANT_QUANTIZATION,
+            vectors_on_disk=settings.QDRANT_VECTORS_ON_DISK,
+        )
+        await self.client.create_collection(
+            collection_name=collection_name,
+            vectors_config=models.VectorParams(
+                size=dimension,
+                distance=models.Distance.COSINE,
+                on_disk=settings.QDRANT_VECTORS_ON_DISK,
+            ),
+            on_disk_payload=settings.QDRANT_PAYLOAD_ON_DISK,
+            hnsw_config=self._hnsw_config(collection_name, bulk_load),
+            optimizers_config=self._optimizers_config(bulk_load),
+            quantization_config=quantization_config(),
+            metadata=self._bulk_load_metadata(True) if bulk_load else None,
+        )
+        if is_shared_collection(collection_name):
+            await self._create_tenant_index(collection_name)
+        for field_name in PAYLOAD_INDEX_FIELDS:
+            await self.client.create_payload_index(
+                collection_name=collection_name,
+                field_name=field_name,
+                field_schema=models.PayloadSchemaType.KEYWORD,
+            )
+
+    async def _create_tenant_index(self, collection_name: str):
+        # Kiracı bölümleme anahtarı: Qdrant aynı kiracının noktalarını birlikte saklar.
+        await self.client.create_payload_index(
+            collection_name=collection_name,
+            field_name=TENANT_ID_FIELD,
+            field_schema=models.KeywordIndexParams(
+                type=models.KeywordIndexType.KEYWORD, is_tenant=True
+            ),
+        )
+
+    async def _reconcile(self, collection_name: str, info: models.CollectionInfo):
+        """
+        Mevcut koleksiyonu dağıtım ayarlarına (kuantizasyon, on_disk) getirir. Değişiklikler
+        Qdrant tarafında optimizer tarafından arka planda uygulanır. Önceden oluşturulmuş paylaşılan
+        koleksiyonlara eksik kiracı (is_tenant) indeksi eklenir.
+        """
+        if is_shared_collection(collection_name):
+            tenant_index = (info.payload_schema or {}).get(TENANT_ID_FIELD)
+            params = tenant_index.params if tenant_index else None
+            if not getattr(params, "is_tenant", False):
+                await self._create_tenant_index(collection_name)
+                logger.info(
+                    f"Tenant index created on {collection_name}.",
+                    event_name="QDRANT_TENANT_INDEX_CREATED",
+                    collection=collection_name,
+                )
+
+        params = info.config.params
+        changes = {}
+        if (
+            _quantization_kind(info.config.quantization_config)
+            != settings.QDRANT_QUANTIZATION
+        ):
+            changes["quantization_config"] = (
+                quantization_config() or models.Disabled.DISABLED
+            )
+        vectors_on_disk = settings.QDRANT_VECTORS_ON_DISK
+        if vectors_on_disk is not None and vectors_on_disk != bool(
+            getattr(params.vectors, "on_disk", False)
+        ):
+            changes["vectors_config"] = {
+                "": models.VectorParamsDiff(on_disk=vectors_on_disk)
+            }
+        payload_on_disk = settings.QDRANT_PAYLOAD_ON_DISK
+        if payload_on_disk is not None and payload_on_disk != bool(
+            params.on_disk_payload
+        ):
+            changes["collection_params"] = models.CollectionParamsDiff(
+                on_disk_payload=payload_on_disk
+            )
+        if not changes:
+            return
+
+        await self.client.update_collection(collection_name=collection_name, **changes)
+        logger.info(
+            f"Collection {collection_name} reconfigured.",
+            event_name="QDRANT_COLLECTION_RECONFIGURED",
+            collection=collection_name,
+            changes=sorted(changes),
+        )
+
+    async def _set_bulk_load(self, collection_name: str, enabled: bool):
+        await self.client.update_collection(
+            collection_name=collection_name,
+            hnsw_config=self._hnsw_config(collection_name, enabled),
+            optimizers_config=self._optimizers_config(enabled),
+            metadata=self._bulk_load_metadata(enabled),
+        )
+        logger.info(
+            f"Bulk-load mode {'enabled' if enabled else 'disabled'} for {collection_name}.",
+            event_name="QDRANT_BULK_LOAD_ON" if enabled else "QDRANT_BULK_LOAD_OFF",
+            collection=collection_name,
+        )
+
+    async def finish_bulk_loads(self):
+        """
+        Toplu yüklenen koleksiyonların HNSW / indeksleme ayarlarını geri yükler ve beklemeden döner.
+        İndeks Qdrant'ta arka planda kurulur; önceki döngülerde geri yüklenen koleksiyonların
+        'green' olup olmadığı burada tek istekle kontrol edilir.
+        """
+        await self._check_optimizing()
+
+        collections, self._bulk_load = self._bulk_load, set()
+        for collection_name in collections:
+            # Bir sonraki döngüde boşluk / m=0 kontrolleri yeniden yapılır.
+            self.invalidate(collection_name)
+            try:
+                info = await self.client.get_collection(collection_name=collection_name)
+                owner = self._bulk_load_owner(info)
+                if owner not in (None, self.manager.scheduler.worker_id) and (
+                    await self._owner_active(collection_name, owner)
+                ):
+                    # Koleksiyonu bu arada başka bir pod da toplu yüklemeye aldı; ayarları o geri yükler.
+                    continue
+                await self._set_bulk_load(collection_name, False)
+                self._optimizing[collection_name] = time.perf_counter()
+            except Exception as e:
+                logger.error(
+                    f"Failed to restore index settings for {collection_name}.",
+                    event_name="QDRANT_BULK_LOAD_RESTORE_FAILED",
+                    collection=collection_name,
+                    error=str(e),
+                )
+
+    async def _check_optimizing(self):
+        for collection_name, restored_at in list(self._optimizing.items()):
+            elapsed = time.perf_counter() - restored_at
+            try:
+                info = await self.client.get_collection(collection_name=collection_name)
+            except Exception as e:
+                logger.warn(
+                    f"Could not check index status of {collection_name}.",
+                    event_name="QDRANT_BULK_LOAD_STATUS_FAILED",
+                    collection=collection_name,
+                    error=str(e),
+                )
+                continue
+            if info.status == models.CollectionStatus.GREEN:
+                del self._optimizing[collection_name]
+                logger.info(
+                    f"Collection {collection_name} indexed after bulk load.",
+                    event_name="QDRANT_BULK_LOAD_DONE",
+                    collection=collection_name,
+                    duration_seconds=round(elapsed, 2),
+                )
+            elif elapsed > settings.QDRANT_BULK_LOAD_OPTIMIZE_TIMEOUT_SECONDS:
+                # İndeks kurulmaya devam eder; sadece takip bırakılır.
+                del self._optimizing[collection_name]
+                logger.warn(
+                    f"Collection {collection_name} is still optimizing, no longer tracking it.",
+                    event_name="QDRANT_BULK_LOAD_OPTIMIZE_TIMEOUT",
+                    collection=collection_name,
+                    status=str(info.status),
+                )
+
+
+async def migrate_tenant_collections(
+    manager: "IndexingManager",
+    tenant_id: Optional[str] = None,
+    batch_size: int = 256,
+    drop_source: bool = False,
+) -> Dict[str, int]:
+    """
+    Kiracıya özel '{QDRANT_DB_COLLECTION_PREFIX}{tenant_id}' koleksiyonlarını partiler halinde
+    (vektör ve payload ile, aynı point ID'leriyle) paylaşılan koleksiyona kopyalar. Kopyalanan
+    nokta sayısı hedefte doğrulanmadan kaynak koleksiyon silinmez.
+    """
+    target = settings.QDRANT_MULTITENANT_COLLECTION
+    if not target:
+        raise ValueError("QDRANT_MULTITENANT_COLLECTION is not configured.")
+
+    client = manager.qdrant_client
+    prefix = settings.QDRANT_DB_COLLECTION_PREFIX
+    names = sorted(
+        c.name
+        for c in (await client.get_collections()).collections
+        if c.name.startswith(prefix) and c.name != target
+    )
+    if tenant_id:
+        names = [name for name in names if name == f"{prefix}{tenant_id}"]
+
+    copied: Dict[str, int] = {}
+    for name in names:
+        tenant = name[len(prefix) :]
+        info = await client.get_collection(collection_name=name)
+        await manager.collections.ensure(
+            target, dimension=info.config.params.vectors.size
+        )
+
+        count = 0
+        offset = None
+        while True:
+            records, offset = await client.scroll(
+                collection_name=name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True,
+            )
+            if records:
+                await client.upsert(
+                    collection_name=target,
+                    points=models.Batch(
+                        ids=[record.id for record in records],
+                        vectors=[record.vector for record in records],
+                        payloads=[
+                            {**(record.payload or {}), TENANT_ID_FIELD: tenant}
+                            for record in records
+                        ],
+                    ),
+                    wait=True,
+                )
+                count += len(records)
+            if offset is None:
+                break
+
+        migrated = (
+            await client.count(
+                collection_name=target,
+                count_filter=models.Filter(must=[tenant_condition(tenant)]),
+                exact=True,
+            )
+        ).count
+        copied[name] = count
+        logger.info(
+            f"Collection {name} migrated to {target}.",
+            event_name="QDRANT_COLLECTION_MIGRATED",
+            collection=name,
+            target=target,
+            tenant_id=tenant,
+            copied=count,
+            target_count=migrated,
+        )
+
+        if drop_source and migrated >= count:
+            await client.delete_collection(collection_name=name)
+            logger.info(
+                f"Source collection {name} dropped.",
+                event_name="QDRANT_COLLECTION_DROPPED",
+                collection=name,
+            )
+
+    await manager.collections.finish_bulk_loads()
+    return copied
@@ -26,16 +26,154 @@ class Settings(BaseSettings):
     KNOWLEDGE_INDEXING_SERVICE_KEY_PATH: str
 
     POSTGRES_URL: str
+    POSTGRES_POOL_MIN_SIZE: int = 1
+    POSTGRES_POOL_MAX_SIZE: int = 10
+    POSTGRES_POOL_ACQUIRE_TIMEOUT_SECONDS: float = 15.0
+    POSTGRES_COMMAND_TIMEOUT_SECONDS: float = 60.0
+    # Postgres kaynaklarında cursor ile tek seferde çekilip pipeline'a verilen satır sayısı.
+    POSTGRES_INGEST_BATCH_SIZE: int = 1000
+    # Watermark'lı kaynaklarda 'updated_at > last_indexed_at - overlap' ile okunur (geç commit'lere karşı).
+    POSTGRES_INGEST_WATERMARK_OVERLAP_SECONDS: int = 300
+    # Postgres kaynakları paylaşılan havuzdan değil ayrı bir bağlantıdan okunur; pipeline beklerken
+    # açık kalan okuma transaction'ı bu süreyi aşarsa sunucu bağlantıyı kapatır (kaynak başarısız olur).
+    POSTGRES_INGEST_IDLE_IN_TRANSACTION_TIMEOUT_SECONDS: int = 900
 
     QDRANT_HTTP_URL: str
     QDRANT_API_KEY: Optional[str] = None
     QDRANT_DB_COLLECTION_PREFIX: str = "sentiric_kb_"
+    # Verilirse tüm kiracılar bu tek koleksiyona yazılır ('tenant_id' payload'ı ile bölümlenir);
+    # boşsa her kiracının kendi '{QDRANT_DB_COLLECTION_PREFIX}{tenant_id}' koleksiyonu kullanılır.
+    QDRANT_MULTITENANT_COLLECTION: Optional[str] = None
+    # gRPC ile yazma/okuma (REST JSON'a göre daha hızlı vektör serileştirme).
+    QDRANT_PREFER_GRPC: bool = False
+    QDRANT_GRPC_PORT: int = 6334
+    QDRANT_TIMEOUT_SECONDS: int = 30
+    # Upsert'ler bu boyutta partilerle, aynı anda en fazla QDRANT_UPSERT_CONCURRENCY parti uçuşta olacak
+    # şekilde yazılır. Ara partiler 'wait=False' ile gönderilir; son parti 'wait=True' ile bariyerdir.
+    QDRANT_UPSERT_BATCH_SIZE: int = 256
+    QDRANT_UPSERT_CONCURRENCY: int = 4
+    # Koleksiyonun HNSW / optimizer ayarları.
+    QDRANT_HNSW_M: int = 16
+    QDRANT_HNSW_EF_CONSTRUCT: int = 100
+    QDRANT_HNSW_ON_DISK: Optional[bool] = None
+    QDRANT_INDEXING_THRESHOLD: int = 20000
+    # Yeni veya boş koleksiyonlara ilk yükleme HNSW kapalıyken (m=0, indexing_threshold=0) yapılır;
+    # döngü sonunda indeks ayarları geri yüklenir. Optimizasyon beklenmez; sonraki döngülerde en fazla
+    # OPTIMIZE_TIMEOUT_SECONDS boyunca 'green' durumu kontrol edilip loglanır.
+    QDRANT_BULK_LOAD_ENABLED: bool = True
+    QDRANT_BULK_LOAD_OPTIMIZE_TIMEOUT_SECONDS: int = 1800
+    # Depolama: 'none', 'scalar' (int8), 'product' veya 'binary' kuantizasyon; orijinal vektörler ve
+    # payload diske alınabilir (boş bırakılan on_disk ayarları Qdrant sunucu varsayılanını kullanır).
+    # Mevcut koleksiyonlar ilk kullanımda bu ayarlara getirilir.
+    QDRANT_QUANTIZATION: str = "none"
+    QDRANT_QUANTIZATION_ALWAYS_RAM: bool = True
+    QDRANT_SCALAR_QUANTILE: float = 0.99
+    QDRANT_PRODUCT_COMPRESSION: str = "x16"
+    QDRANT_VECTORS_ON_DISK: Optional[bool] = None
+    QDRANT_PAYLOAD_ON_DISK: Optional[bool] = None
 
     QDRANT_DB_EMBEDDING_MODEL_NAME: str = (
         "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
     )
 
     KNOWLEDGE_INDEXING_INTERVAL_SECONDS: int = 3600
+    # Çoklu pod: kaynaklar 'FOR UPDATE SKIP LOCKED' ile kiralanır, kira heartbeat ile uzatılır.
+    KNOWLEDGE_INDEXING_LEASING_ENABLED: bool = True
+    KNOWLEDGE_INDEXING_LEASE_SECONDS: int = 600
+    KNOWLEDGE_INDEXING_CLAIM_LIMIT: int = 50
+    # Sadece yeni/değişen chunk'ları vektörleştirir, kaybolanları ID ile siler.
+    KNOWLEDGE_INDEXING_DIFF_MODE: bool = True
+    # Chunk boyu birimi: 'chars' (512 karakter) veya 'tokens' (modelin tokenizer'ı ile, max_seq_length'e göre).
+    KNOWLEDGE_INDEXING_CHUNK_UNIT: str = "chars"
+    # 'tokens' modunda chunk başına üst sınır; 0 ise model limiti (max_seq_length - özel token'lar).
+    KNOWLEDGE_INDEXING_CHUNK_TOKENS: int = 0
+    KNOWLEDGE_INDEXING_CHUNK_OVERLAP_TOKENS: int = 16
+    # >0 ise büyük dokümanlar (en az CHUNK_PROCESS_MIN_CHARS karakter) ayrı süreçlerde chunk'lanır;
+    # küçük dokümanlar her durumda thread'de chunk'lanır, asyncio döngüsü bloklanmaz.
+    KNOWLEDGE_INDEXING_CHUNK_PROCESSES: int = 0
+    KNOWLEDGE_INDEXING_CHUNK_PROCESS_MIN_CHARS: int = 200_000
+    # Kiracı genelinde yakın-kopya chunk tespiti (SimHash): 'off', 'skip' (embed edilmez, saklanmaz)
+    # veya 'link' (mevcut noktanın vektörü kopyalanır, payload'a 'duplicate_of' eklenir).
+    # Artımlı kaynaklarda (dizin, web, tarama) 'skip' yerine 'link' uygulanır.
+    KNOWLEDGE_INDEXING_DEDUP_MODE: str = "off"
+    # 64 bitlik parmak izleri arasında kopya sayılan en büyük Hamming mesafesi.
+    KNOWLEDGE_INDEXING_DEDUP_MAX_DISTANCE: int = 3
+    # Bundan az kelimeli chunk'lar (başlıklar, tek satırlar) kopya kontrolüne girmez.
+    KNOWLEDGE_INDEXING_DEDUP_MIN_WORDS: int = 8
+    # Pipeline aşamalarının işçi sayıları ve aşamalar arası kuyruk kapasitesi (backpressure).
+    KNOWLEDGE_INDEXING_FETCH_WORKERS: int = 8
+    KNOWLEDGE_INDEXING_CHUNK_WORKERS: int = 2
+    KNOWLEDGE_INDEXING_EMBED_WORKERS: int = 1
+    KNOWLEDGE_INDEXING_UPSERT_WORKERS: int = 4
+    KNOWLEDGE_INDEXING_QUEUE_SIZE: int = 8
+    # Datasource durum güncellemeleri biriktirilip bu aralıkla toplu yazılır (write-behind).
+    KNOWLEDGE_INDEXING_STATUS_FLUSH_INTERVAL_SECONDS: float = 2.0
+    # Pod'a özel yerel durum dosyaları (embedding cache vb.) için dizin.
+    KNOWLEDGE_INDEXING_STATE_DIR: str = "/app/index-state"
+
+    # Web kaynakları: paylaşılan HTTP/2 istemcisi (keep-alive bağlantı havuzu).
+    WEB_USER_AGENT: str = "SentiricBot/1.0"
+    WEB_HTTP2_ENABLED: bool = True
+    WEB_REQUEST_TIMEOUT_SECONDS: float = 30.0
+    WEB_MAX_CONNECTIONS: int = 100
+    WEB_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    # Site tarama (sitemap / bağlantı izleme) modu: eşzamanlılık, host başına nezaket ve sınırlar.
+    WEB_CRAWL_CONCURRENCY: int = 16
+    WEB_CRAWL_PER_HOST_CONCURRENCY: int = 4
+    # Aynı host'a ardışık istekler arası en az bekleme; robots.txt Crawl-delay daha büyükse o kullanılır.
+    WEB_CRAWL_DELAY_SECONDS: float = 0.25
+    WEB_CRAWL_MAX_DEPTH: int = 3
+    WEB_CRAWL_MAX_PAGES: int = 5000
+    # Pipeline'a tek partide verilen sayfa sayısı.
+    WEB_CRAWL_BATCH_PAGES: int = 16
+    # Site şablonu temizliği: host başına satırların kaç farklı sayfada geçtiği öğrenilir; en az MIN_PAGES
+    # sayfa görüldükten sonra sayfaların RATIO kadarında geçen satırlar (menü, yasal uyarı vb.) chunk'lara girmez.
+    WEB_BOILERPLATE_ENABLED: bool = True
+    WEB_BOILERPLATE_MIN_PAGES: int = 5
+    WEB_BOILERPLATE_RATIO: float = 0.6
+    # Host başına en fazla WINDOW_PAGES sayfa tutulur; en uzun süredir görülmeyen sayfalar unutulur.
+    WEB_BOILERPLATE_WINDOW_PAGES: int = 500
+    # HTML ayrıştırıcı: 'html.parser' (varsayılan), 'lxml' veya 'selectolax' (en hızlı).
+    # Değiştirmek çıkarılan metnin özetini değiştirebilir; sayfalar bir kez yeniden embed edilir.
+    HTML_PARSER: str = "html.parser"
+    # >0 ise HTML çıkarımı ayrı süreçlerde yapılır; 0 ise thread'de (döngü yine bloklanmaz).
+    HTML_EXTRACT_PROCESSES: int = 0
+
+    # Dosya kaynakları: dizin modunda sadece bu uzantılar okunur (glob modunda desen belirler).
+    FILE_DIRECTORY_EXTENSIONS: str = (
+        ".txt,.md,.markdown,.rst,.csv,.tsv,.json,.jsonl,.yaml,.yml,.xml,.html,.htm,.log"
+    )
+    # Pipeline'a tek partide verilen (ve eşzamanlı okunan) dosya sayısı.
+    FILE_BATCH_FILES: int = 32
+    # Bu boyuttan büyük dosyalar belleğe alınmadan (mmap, blok blok) okunur ve segmentlere bölünür.
+    FILE_STREAM_THRESHOLD_BYTES: int = 32 * 1024 * 1024
+    FILE_STREAM_BLOCK_BYTES: int = 1024 * 1024
+    # Segmentler paragraf sınırında kesilir; pipeline'a tek partide FILE_STREAM_BATCH_SEGMENTS segment gider.
+    FILE_STREAM_SEGMENT_CHARS: int = 64_000
+    FILE_STREAM_BATCH_SEGMENTS: int = 16
+
+    # Embedding arka ucu: 'sentence_transformers' (torch) veya 'onnx' (ONNX Runtime, CPU).
+    # ONNX modeli ilk açılışta durum dizinine aktarılır; istenirse ağırlıklar int8'e kuantize edilir.
+    EMBEDDING_BACKEND: str = "sentence_transformers"
+    EMBEDDING_ONNX_QUANTIZE: bool = False
+
+    # Embedding partileri sabit adet yerine dolgulu token bütçesiyle (parti boyu x en uzun dizi) sınırlanır.
+    EMBEDDING_MAX_TOKENS_PER_BATCH: int = 8192
+    EMBEDDING_MAX_BATCH_SIZE: int = 128
+
+    # >0 ise embedding, modeli her süreçte bir kez yükleyen ayrı süreçlerde yapılır (GIL dışı).
+    # Başlatma yöntemi 'spawn' veya 'forkserver'; 'fork' (çalışan thread'lerle kilitlenme riski) reddedilir.
+    EMBEDDING_WORKER_PROCESSES: int = 0
+    EMBEDDING_WORKER_START_METHOD: str = "spawn"
+    # Süreç başına torch / onnxruntime thread sayısı; 0 ise CPU sayısı / süreç sayısı.
+    EMBEDDING_WORKER_THREADS: int = 0
+
+    # Event loop gecikme ölçümü (event_loop_lag_seconds); eşik aşılırsa uyarı loglanır.
+    EVENT_LOOP_LAG_INTERVAL_SECONDS: float = 0.5
+    EVENT_LOOP_LAG_WARN_SECONDS: float = 1.0
+
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 200_000
 
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", extra="ignore"
@@ -0,0 +1,104 @@
+# app/core/database.py
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import asyncpg
+import structlog
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+_pool: Optional[asyncpg.Pool] = None
+_pool_lock = asyncio.Lock()
+
+
+async def init_pool() -> asyncpg.Pool:
+    """
+    Servis genelinde paylaşılan asyncpg bağlantı havuzunu (bir kez) oluşturur.
+    """
+    global _pool
+    async with _pool_lock:
+        if _pool is None:
+            _pool = await asyncio.wait_for(
+                asyncpg.create_pool(
+                    dsn=settings.POSTGRES_URL,
+                    min_size=settings.POSTGRES_POOL_MIN_SIZE,
+                    max_size=settings.POSTGRES_POOL_MAX_SIZE,
+                    command_timeout=settings.POSTGRES_COMMAND_TIMEOUT_SECONDS,
+                ),
+                timeout=settings.POSTGRES_POOL_ACQUIRE_TIMEOUT_SECONDS,
+            )
+            logger.info(
+                "PostgreSQL connection pool created.",
+                event_name="DB_POOL_CREATED",
+                min_size=settings.POSTGRES_POOL_MIN_SIZE,
+                max_size=settings.POSTGRES_POOL_MAX_SIZE,
+            )
+            _observe_pool(_pool)
+    return _pool
+
+
+def get_pool() -> asyncpg.Pool:
+    if _pool is None:
+        raise RuntimeError("PostgreSQL connection pool is not initialized.")
+    return _pool
+
+
+async def close_pool():
+    global _pool
+    async with _pool_lock:
+        if _pool is not None:
+            await _pool.close()
+            _pool = None
+
+
+@asynccontextmanager
+async def dedicated_connection(
+    idle_in_transaction_timeout: float,
+) -> AsyncIterator[asyncpg.Connection]:
+    """
+    Paylaşılan havuzun dışında, tek bir iş için açılan bağlantı. Uzun süre açık kalabilecek
+    (ör. pipeline backpressure'ı boyunca bekleyen cursor) okumalar havuzdaki bağlantıları tüketmez;
+    durum yazımları ve kira heartbeat'i her zaman bağlantı bulur.
+    """
+    conn = await asyncio.wait_for(
+        asyncpg.connect(
+            dsn=settings.POSTGRES_URL,
+            command_timeout=settings.POSTGRES_COMMAND_TIMEOUT_SECONDS,
+            server_settings={
+                "idle_in_transaction_session_timeout": str(
+                    int(idle_in_transaction_timeout * 1000)
+                )
+            },
+        ),
+        timeout=settings.POSTGRES_POOL_ACQUIRE_TIMEOUT_SECONDS,
+    )
+    try:
+        yield conn
+    finally:
+        await conn.close()
+
+
+@asynccontextmanager
+async def acquire() -> AsyncIterator[asyncpg.Connection]:
+    """
+    Havuzdan bağlantı alır; bekleme süresini ve havuz doluluğunu metrik olarak kaydeder.
+    """
+    pool = get_pool()
+    started = time.perf_counter()
+    async with pool.acquire(
+        timeout=settings.POSTGRES_POOL_ACQUIRE_TIMEOUT_SECONDS
+    ) as conn:
+        metrics.DB_POOL_ACQUIRE_SECONDS.observe(time.perf_counter() - started)
+        _observe_pool(pool)
+        yield conn
+    _observe_pool(pool)
+
+
+def _observe_pool(pool: asyncpg.Pool):
+    metrics.DB_POOL_SIZE.set(pool.get_size())
+    metrics.DB_POOL_IDLE.set(pool.get_idle_size())
@@ -0,0 +1,232 @@
+# app/core/dedup.py
+"""
+Kiracı genelinde yakın-kopya (near-duplicate) chunk tespiti. Her chunk için 64 bitlik SimHash
+parmak izi hesaplanır; Hamming mesafesi KNOWLEDGE_INDEXING_DEDUP_MAX_DISTANCE'ı aşmayan ve başka
+bir dokümana ait bir chunk varsa yeni chunk embed edilmeden atlanır ('skip') veya mevcut noktanın
+vektörü kopyalanarak ona bağlanır ('link'). İndeks pod'a özeldir ve Qdrant'ta silinmiş noktaları
+içerebilir; kanonik noktanın varlığı kullanılmadan önce Qdrant'tan doğrulanır.
+"""
+
+import hashlib
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+import structlog
+
+from app.core import state_store
+
+logger = structlog.get_logger()
+
+DEDUP_MODES = ("off", "skip", "link")
+# Bağlanan (link) chunk'ın payload'ında kanonik noktanın ID'sini tutan alan.
+DUPLICATE_OF_FIELD = "duplicate_of"
+
+_STATE_NAMESPACE = "dedup"
+_WORD_PATTERN = re.compile(r"\w+")
+_SHINGLE_WORDS = 3
+_BITS = 64
+
+
+class DedupEntry(NamedTuple):
+    fingerprint: int
+    source_uri: str
+    document_key: str
+    # Henüz Qdrant'a yazılmamış chunk'lar için işin span_id'si; kalıcı kayıtlarda None.
+    owner: Optional[str]
+
+
+def simhash(text: str, min_words: int) -> Optional[int]:
+    """
+    Küçük harfe çevrilmiş 3 kelimelik shingle'lar üzerinden 64 bitlik SimHash. Çok kısa metinlerde
+    (başlık, tek satır) parmak izi anlamsız olduğu için None döner.
+    """
+    words = _WORD_PATTERN.findall(text.casefold())
+    if len(words) < max(min_words, _SHINGLE_WORDS):
+        return None
+
+    digests = b"".join(
+        hashlib.blake2b(
+            " ".join(words[i : i + _SHINGLE_WORDS]).encode("utf-8"), digest_size=8
+        ).digest()
+        for i in range(len(words) - _SHINGLE_WORDS + 1)
+    )
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8).reshape(-1, 8), axis=1)
+    # Her bit için çoğunluk oyu: shingle'ların yarısından fazlasında 1 ise parmak izinde de 1.
+    majority = bits.sum(axis=0, dtype=np.int64) * 2 > bits.shape[0]
+    return int.from_bytes(np.packbits(majority).tobytes(), "big")
+
+
+def simhash_many(texts: List[str], min_words: int) -> List[Optional[int]]:
+    return [simhash(text, min_words) for text in texts]
+
+
+class SimHashIndex:
+    """
+    Parmak izlerini max_distance + 1 banda bölerek tutan bellek içi indeks. Güvercin yuvası ilkesi
+    gereği mesafesi max_distance'ı aşmayan iki parmak izinin en az bir bandı birebir aynıdır; bu
+    yüzden sadece ortak bandı olan adaylar karşılaştırılır.
+    """
+
+    def __init__(self, max_distance: int):
+        self.max_distance = max_distance
+        band_count = max_distance + 1
+        width = _BITS // band_count
+        self._bands: List[Tuple[int, int]] = [
+            (i * width, (_BITS - i * width) if i == band_count - 1 else width)
+            for i in range(band_count)
+        ]
+        self._tables: List[Dict[int, Set[str]]] = [{} for _ in self._bands]
+        self._entries: Dict[str, DedupEntry] = {}
+        self._by_document: Dict[Tuple[str, str], Set[str]] = {}
+        self._pending: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _band_values(self, fingerprint: int) -> List[int]:
+        return [
+            (fingerprint >> shift) & ((1 << width) - 1) for shift, width in self._bands
+        ]
+
+    def find(
+        self,
+        fingerprint: int,
+        source_uri: str,
+        document_key: str,
+        owner: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        En yakın kanonik chunk'ın point ID'sini döndürür. Aynı dokümanın chunk'ları (eski sürümü
+        dahil) aday sayılmaz; bekleyen kayıtlar sadece aynı işin (owner) kendi kayıtlarıysa sayılır.
+        """
+        best: Optional[Tuple[int, str]] = None
+        for table, value in zip(self._tables, self._band_values(fingerprint)):
+            for point_id in table.get(value, ()):
+                entry = self._entries[point_id]
+                if entry.owner is not None and entry.owner != owner:
+                    continue
+                if (
+                    entry.source_uri == source_uri
+                    and entry.document_key == document_key
+                ):
+                    continue
+                distance = (entry.fingerprint ^ fingerprint).bit_count()
+                if distance <= self.max_distance and (
+                    best is None or distance < best[0]
+                ):
+                    best = (distance, point_id)
+        return best[1] if best else None
+
+    def committed(self, point_ids: Iterable[str]) -> List[str]:
+        """Verilen ID'lerden kalıcı (Qdrant'a yazılmış olması beklenen) kayıtları döndürür."""
+        return [
+            point_id
+            for point_id in point_ids
+            if point_id in self._entries and self._entries[point_id].owner is None
+        ]
+
+    def add(self, point_id: str, entry: DedupEntry):
+        self.remove([point_id])
+        self._entries[point_id] = entry
+        for table, value in zip(self._tables, self._band_values(entry.fingerprint)):
+            table.setdefault(value, set()).add(point_id)
+        self._by_document.setdefault((entry.source_uri, entry.document_key), set()).add(
+            point_id
+        )
+        if entry.owner is not None:
+            self._pending.setdefault(entry.owner, set()).add(point_id)
+
+    def remove(self, point_ids: Iterable[str]) -> List[str]:
+        removed = []
+        for point_id in point_ids:
+            entry = self._entries.pop(point_id, None)
+            if entry is None:
+                continue
+            for table, value in zip(self._tables, self._band_values(entry.fingerprint)):
+                bucket = table.get(value)
+                if bucket is not None:
+                    bucket.discard(point_id)
+                    if not bucket:
+                        del table[value]
+            document = (entry.source_uri, entry.document_key)
+            self._by_document.get(document, set()).discard(point_id)
+            if not self._by_document.get(document):
+                self._by_document.pop(document, None)
+            if entry.owner is not None:
+                self._pending.get(entry.owner, set()).discard(point_id)
+            removed.append(point_id)
+        return removed
+
+    def remove_documents(
+        self, source_uri: str, document_keys: Optional[Iterable[str]] = None
+    ) -> List[str]:
+        """Dokümanların (None ise kaynağın tüm dokümanlarının) kayıtlarını siler."""
+        if document_keys is None:
+            documents = [doc for doc in self._by_document if doc[0] == source_uri]
+        else:
+            documents = [(source_uri, str(key)) for key in document_keys]
+        point_ids = [
+            point_id
+            for document in documents
+            for point_id in self._by_document.get(document, ())
+        ]
+        return self.remove(point_ids)
+
+    def commit(self, owner: str) -> Dict[str, DedupEntry]:
+        """İşin bekleyen kayıtlarını kalıcı (kanonik) yapar ve depoya yazılmak üzere döndürür."""
+        committed = {}
+        for point_id in self._pending.pop(owner, set()):
+            entry = self._entries[point_id]._replace(owner=None)
+            self._entries[point_id] = entry
+            committed[point_id] = entry
+        return committed
+
+    def discard(self, owner: str):
+        """Başarısız işin bekleyen kayıtlarını atar; noktaları Qdrant'a yazılmamış olabilir."""
+        self.remove(list(self._pending.pop(owner, set())))
+
+
+def _state_key(tenant_id: str, point_id: str) -> str:
+    return f"{tenant_id}|{point_id}"
+
+
+def load_index(tenant_id: str, max_distance: int) -> SimHashIndex:
+    index = SimHashIndex(max_distance)
+    prefix = _state_key(tenant_id, "")
+    for key, (fingerprint, source_uri, document_key) in (
+        state_store.get_store().scan(_STATE_NAMESPACE, prefix).items()
+    ):
+        index.add(
+            key[len(prefix) :], DedupEntry(fingerprint, source_uri, document_key, None)
+        )
+    logger.info(
+        "Near-duplicate index loaded.",
+        event_name="DEDUP_INDEX_LOADED",
+        tenant_id=tenant_id,
+        entry_count=len(index),
+    )
+    return index
+
+
+def persist_entries(tenant_id: str, entries: Dict[str, DedupEntry]):
+    if entries:
+        state_store.get_store().put_many(
+            _STATE_NAMESPACE,
+            {
+                _state_key(tenant_id, point_id): [
+                    entry.fingerprint,
+                    entry.source_uri,
+                    entry.document_key,
+                ]
+                for point_id, entry in entries.items()
+            },
+        )
+
+
+def forget_entries(tenant_id: str, point_ids: List[str]):
+    if point_ids:
+        state_store.get_store().delete_many(
+            _STATE_NAMESPACE,
+            [_state_key(tenant_id, point_id) for point_id in point_ids],
+        )
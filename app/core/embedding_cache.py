@@ -0,0 +1,143 @@
+# app/core/embedding_cache.py
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import structlog
+
+from app.core import metrics
+
+logger = structlog.get_logger()
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# SQLite'ın tek sorguda izin verdiği parametre sınırının altında kalınır.
+_SQLITE_IN_BATCH = 500
+
+
+class EmbeddingCache:
+    """
+    (model adı, normalize edilmiş chunk özeti) anahtarlı, disk üzerinde kalıcı embedding önbelleği.
+    Vektörler float32 BLOB olarak SQLite'ta tutulur; kapasite aşılınca en eski kullanılanlar (LRU) silinir.
+    Model adı değişirse önbellek otomatik olarak boşaltılır.
+    """
+
+    def __init__(self, path: str, model_name: str, max_entries: int):
+        self.path = Path(path)
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key BLOB PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used)"
+        )
+        self._invalidate_on_model_change()
+        self._size = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        self._conn.commit()
+        metrics.EMBEDDING_CACHE_ENTRIES.set(self._size)
+
+    @staticmethod
+    def key_for(text: str) -> bytes:
+        normalized = _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+        return hashlib.sha256(normalized.encode("utf-8")).digest()
+
+    def _invalidate_on_model_change(self):
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'model_name'"
+        ).fetchone()
+        if row and row[0] == self.model_name:
+            return
+
+        if row:
+            logger.info(
+                "Embedding model changed, clearing embedding cache.",
+                event_name="EMBEDDING_CACHE_INVALIDATED",
+                previous_model=row[0],
+                model=self.model_name,
+            )
+        self._conn.execute("DELETE FROM embeddings")
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('model_name', ?)",
+            (self.model_name,),
+        )
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, np.ndarray]:
+        found: Dict[bytes, np.ndarray] = {}
+        unique_keys = list(dict.fromkeys(keys))
+
+        with self._lock:
+            for i in range(0, len(unique_keys), _SQLITE_IN_BATCH):
+                batch = unique_keys[i : i + _SQLITE_IN_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                self._conn.commit()
+
+        metrics.EMBEDDING_CACHE_HITS_TOTAL.inc(len(found))
+        metrics.EMBEDDING_CACHE_MISSES_TOTAL.inc(len(unique_keys) - len(found))
+        return found
+
+    def put_many(self, items: Dict[bytes, np.ndarray]):
+        if not items:
+            return
+
+        now = time.time()
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                [
+                    (key, np.asarray(vector, dtype=np.float32).tobytes(), now)
+                    for key, vector in items.items()
+                ],
+            )
+            self._size += self._conn.total_changes - before
+            self._evict_if_needed()
+            self._conn.commit()
+
+        metrics.EMBEDDING_CACHE_ENTRIES.set(self._size)
+
+    def _evict_if_needed(self):
+        overflow = self._size - self.max_entries
+        if overflow <= 0:
+            return
+
+        self._conn.execute(
+            "DELETE FROM embeddings WHERE key IN "
+            "(SELECT key FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+            (overflow,),
+        )
+        self._size -= overflow
+        metrics.EMBEDDING_CACHE_EVICTIONS_TOTAL.inc(overflow)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
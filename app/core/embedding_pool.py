@@ -0,0 +1,153 @@
+# app/core/embedding_pool.py
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, List, Sequence, Tuple
+
+import numpy as np
+import structlog
+
+from app.embedders.base import BaseEmbedder
+
+logger = structlog.get_logger()
+
+# Havuz, asyncio döngüsü ve thread'leri (HTTP istemcisi, to_thread havuzu, torch) çalışırken tembel
+# oluşturulur; 'fork' bu durumda kilitli bir mutex'i alt sürece kopyalayıp kilitlenmeye yol açabilir.
+START_METHODS = ("spawn", "forkserver")
+
+# Alt süreçte (initializer ile) yüklenen embedding arka ucu.
+_worker_embedder: Any = None
+
+
+def _init_worker(threads: int):
+    global _worker_embedder
+
+    if _worker_embedder is None:
+        from app.embedders import embedder_factory
+
+        _worker_embedder = embedder_factory(threads=threads)
+
+
+def _describe_worker() -> Tuple[str, int, int, Any]:
+    return (
+        _worker_embedder.identity,
+        _worker_embedder.dimension,
+        _worker_embedder.max_seq_length,
+        _worker_embedder.tokenizer,
+    )
+
+
+def _encode_into_shared(
+    shm_name: str, shape: Tuple[int, int], indices: List[int], texts: List[str]
+) -> int:
+    """
+    Bir partiyi encode eder ve sonucu doğrudan paylaşılan bellekteki ilgili satırlara yazar.
+    Vektörler süreçler arasında pickle edilmez ve Python float nesnesine dönüştürülmez.
+    """
+    shm = SharedMemory(name=shm_name)
+    try:
+        out = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+        out[indices] = _worker_embedder.encode(texts)
+        del out
+    finally:
+        shm.close()
+    return len(texts)
+
+
+class PooledEmbedder(BaseEmbedder):
+    """
+    Süreç havuzu açıkken ana süreçteki embedder: sadece tokenizer (token bütçeli partiler) ve
+    model bilgileri tutulur. Model ağırlıkları yalnızca havuzdaki süreçlerde yüklüdür.
+    """
+
+    def __init__(
+        self, identity: str, dimension: int, max_seq_length: int, tokenizer: Any
+    ):
+        self.identity = identity
+        self.dimension = dimension
+        self.max_seq_length = max_seq_length
+        self.tokenizer = tokenizer
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        raise RuntimeError("Embeddings are computed in the embedding process pool.")
+
+
+class EmbeddingProcessPool:
+    """
+    Her süreçte modeli bir kez yükleyen çok süreçli embedding motoru.
+    Partiler süreçlere dağıtılır; sonuçlar tek bir paylaşılan float32 matrise yazılır.
+    asyncio döngüsü sadece sonuçları bekler, GIL'e bağlı encode işi döngüyü bloklamaz.
+    """
+
+    def __init__(
+        self,
+        processes: int,
+        start_method: str = "spawn",
+        threads: int = 0,
+    ):
+        if start_method not in START_METHODS:
+            raise ValueError(
+                f"Unsupported embedding worker start method: {start_method}. "
+                f"Expected one of {START_METHODS}."
+            )
+        if threads <= 0:
+            threads = max(1, (os.cpu_count() or 1) // processes)
+
+        self.processes = processes
+        self._executor = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_worker,
+            initargs=(threads,),
+        )
+        logger.info(
+            f"Embedding process pool started with {processes} workers.",
+            event_name="EMBEDDING_POOL_STARTED",
+            processes=processes,
+            start_method=start_method,
+            threads=threads,
+        )
+
+    async def describe(self) -> PooledEmbedder:
+        """Modelin kimliğini, boyutunu ve tokenizer'ını havuzdaki bir süreçten alır."""
+        loop = asyncio.get_running_loop()
+        identity, dimension, max_seq_length, tokenizer = await loop.run_in_executor(
+            self._executor, _describe_worker
+        )
+        return PooledEmbedder(identity, dimension, max_seq_length, tokenizer)
+
+    async def encode(
+        self, texts: Sequence[str], batches: List[List[int]], dimension: int
+    ) -> np.ndarray:
+        shape = (len(texts), dimension)
+        if not texts:
+            return np.empty(shape, dtype=np.float32)
+
+        shm = SharedMemory(create=True, size=len(texts) * dimension * 4)
+        try:
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        self._executor,
+                        _encode_into_shared,
+                        shm.name,
+                        shape,
+                        batch,
+                        [texts[i] for i in batch],
+                    )
+                    for batch in batches
+                )
+            )
+            view = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+            vectors = view.copy()
+            del view
+            return vectors
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,164 @@
+# app/core/html_extract.py
+"""
+HTML'den temiz metin, başlık ve (istenirse) bağlantı çıkarımı. Ayrıştırma CPU'ya bağlıdır ve
+büyük sayfalarda yüzlerce ms sürer; bu yüzden asyncio döngüsünde değil, thread'de veya
+HTML_EXTRACT_PROCESSES > 0 ise ayrı süreçlerde çalıştırılır.
+"""
+
+import asyncio
+import multiprocessing
+import re
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, NamedTuple, Optional
+
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+PARSERS = ("html.parser", "lxml", "selectolax")
+
+# Metin çıkarılırken atılan, içerik dışı (gezinme, kod, gömülü) elementler.
+BOILERPLATE_TAGS = [
+    "script",
+    "style",
+    "nav",
+    "footer",
+    "header",
+    "aside",
+    "iframe",
+    "noscript",
+    "svg",
+    "meta",
+    "link",
+]
+
+# Satır sonu olmayan boşluklar ve görünmez karakterler (yumuşak tire, sıfır genişlikli boşluklar, BOM).
+_HORIZONTAL_SPACE = re.compile(r"[^\S\n\r\v\f\x1c-\x1e\x85\u2028\u2029]+")
+_INVISIBLE = re.compile("[\u00ad\u200b-\u200d\u2060\ufeff]")
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+class ExtractedPage(NamedTuple):
+    text: str
+    title: Optional[str]
+    # Ham href değerleri (normalize edilmemiş); sadece collect_links=True ise doldurulur.
+    links: List[str]
+
+
+def normalize_text(text: str) -> str:
+    """
+    NFKC normalizasyonu (tam genişlikli karakterler, ligatürler, bölünemez boşluk), görünmez
+    karakterlerin atılması, satır içi boşlukların tek boşluğa indirilmesi ve boş satırların atılması.
+    """
+    text = unicodedata.normalize("NFKC", text)
+    text = _INVISIBLE.sub("", text)
+    text = _HORIZONTAL_SPACE.sub(" ", text)
+    return "\n".join(line for line in map(str.strip, text.splitlines()) if line)
+
+
+def _extract_with_soup(
+    html: str, default_title: str, parser: str, collect_links: bool
+) -> ExtractedPage:
+    from bs4 import BeautifulSoup, Comment
+
+    soup = BeautifulSoup(html, parser)
+    # Bağlantılar gezinme elementleri atılmadan önce okunur.
+    links = (
+        [anchor["href"] for anchor in soup.find_all("a", href=True)]
+        if collect_links
+        else []
+    )
+
+    for element in soup(BOILERPLATE_TAGS):
+        element.decompose()
+
+    for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
+        comment.extract()
+
+    title = soup.title.string if soup.title else default_title
+    # NavigableString tüm ağaca referans tutar; süreçler arası taşınmadan önce str'ye çevrilir.
+    title = str(title) if title is not None else None
+    return ExtractedPage(normalize_text(soup.get_text(separator="\n")), title, links)
+
+
+def _extract_with_selectolax(
+    html: str, default_title: str, collect_links: bool
+) -> ExtractedPage:
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(html)
+    links = (
+        [node.attributes.get("href") or "" for node in tree.css("a[href]")]
+        if collect_links
+        else []
+    )
+
+    # Lexbor yorum düğümlerini metne katmaz; ayrıca atılmaları gerekmez.
+    tree.strip_tags(BOILERPLATE_TAGS)
+    title_node = tree.css_first("title")
+    title = title_node.text() if title_node is not None else default_title
+    text = tree.root.text(separator="\n") if tree.root is not None else ""
+    return ExtractedPage(normalize_text(text), title, links)
+
+
+def extract_html(
+    html: str,
+    default_title: str,
+    parser: str = "html.parser",
+    collect_links: bool = False,
+) -> ExtractedPage:
+    """Senkron çıkarım; thread / süreç havuzunda ve benchmark'ta doğrudan çağrılır."""
+    if parser == "selectolax":
+        return _extract_with_selectolax(html, default_title, collect_links)
+    if parser in ("html.parser", "lxml"):
+        return _extract_with_soup(html, default_title, parser, collect_links)
+    raise ValueError(f"Unsupported HTML parser: {parser}. Expected one of {PARSERS}.")
+
+
+def _get_executor() -> Optional[ProcessPoolExecutor]:
+    global _executor
+
+    if settings.HTML_EXTRACT_PROCESSES <= 0:
+        return None
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.HTML_EXTRACT_PROCESSES,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        logger.info(
+            f"HTML extraction process pool started with {settings.HTML_EXTRACT_PROCESSES} workers.",
+            event_name="HTML_EXTRACT_POOL_STARTED",
+            processes=settings.HTML_EXTRACT_PROCESSES,
+            parser=settings.HTML_PARSER,
+        )
+    return _executor
+
+
+async def extract_page(
+    html: str, default_title: str, collect_links: bool = False
+) -> ExtractedPage:
+    executor = _get_executor()
+    if executor is None:
+        return await asyncio.to_thread(
+            extract_html, html, default_title, settings.HTML_PARSER, collect_links
+        )
+    return await asyncio.get_running_loop().run_in_executor(
+        executor,
+        extract_html,
+        html,
+        default_title,
+        settings.HTML_PARSER,
+        collect_links,
+    )
+
+
+def close_extract_pool():
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
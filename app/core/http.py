@@ -0,0 +1,36 @@
+# app/core/http.py
+from typing import Optional
+
+import httpx
+
+from app.core.config import settings
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Web ingester'larının paylaştığı uzun ömürlü HTTP istemcisi. Bağlantılar (keep-alive) ve
+    HTTP/2 oturumları istekler arasında yeniden kullanılır; yanıtlar sıkıştırılmış (gzip/deflate) alınır.
+    """
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            http2=settings.WEB_HTTP2_ENABLED,
+            verify=False,
+            follow_redirects=True,
+            timeout=settings.WEB_REQUEST_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=settings.WEB_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.WEB_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+            headers={"User-Agent": settings.WEB_USER_AGENT},
+        )
+    return _client
+
+
+async def close_http_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,72 @@
+# app/core/manifest.py
+import hashlib
+import json
+import uuid
+from typing import Dict, Iterable, Set
+
+# Artımlı kaynaklarda bir dokümanın (satır, dosya, sayfa) noktalarını gruplayan payload alanı.
+DOCUMENT_KEY_FIELD = "document_key"
+
+# Point ID'leri için sabit isim alanı. Değiştirilirse tüm koleksiyonlar yeniden yazılır!
+POINT_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "sentiric-knowledge-indexing")
+
+
+def chunk_content_hash(content: str, metadata: dict) -> str:
+    """
+    Chunk metni ve payload metadatası üzerinden deterministik bir SHA-256 özeti üretir.
+    Metadata da özete dahildir; içerik aynı kalsa bile metadata değişirse nokta yenilenir.
+    """
+    hasher = hashlib.sha256()
+    hasher.update(content.encode("utf-8"))
+    hasher.update(b"\x00")
+    hasher.update(
+        json.dumps(metadata, sort_keys=True, default=str, ensure_ascii=False).encode(
+            "utf-8"
+        )
+    )
+    return hasher.hexdigest()
+
+
+def chunk_point_id(
+    tenant_id: str, source_uri: str, content_hash: str, occurrence: int
+) -> str:
+    """
+    (tenant, source_uri, chunk özeti, tekrar sırası) dörtlüsünden içerik adresli bir UUID üretir.
+    Pozisyon yerine tekrar sırası kullanıldığı için araya eklenen bir paragraf diğer ID'leri kaydırmaz.
+    """
+    name = f"{tenant_id}\x1f{source_uri}\x1f{content_hash}\x1f{occurrence}"
+    return str(uuid.uuid5(POINT_ID_NAMESPACE, name))
+
+
+class ChunkManifest:
+    """
+    Bir veri kaynağının bu döngüde ürettiği chunk -> point ID kümesi.
+    Qdrant'taki mevcut ID kümesiyle karşılaştırılarak fark (diff) çıkarılır.
+    Partiler halinde doldurulabilir; tekrar sayaçları kaynak genelinde tutulur.
+    """
+
+    def __init__(self, tenant_id: str, source_uri: str):
+        self.tenant_id = tenant_id
+        self.source_uri = source_uri
+        self.point_ids: Set[str] = set()
+        self._occurrences: Dict[str, int] = {}
+
+    def add(self, content: str, metadata: dict) -> str:
+        return self.add_hashed(chunk_content_hash(content, metadata))
+
+    def add_hashed(self, content_hash: str) -> str:
+        """Özeti önceden (ör. chunk havuzunda) hesaplanmış bir chunk'ı ekler."""
+        occurrence = self._occurrences.get(content_hash, 0)
+        self._occurrences[content_hash] = occurrence + 1
+
+        point_id = chunk_point_id(
+            self.tenant_id, self.source_uri, content_hash, occurrence
+        )
+        self.point_ids.add(point_id)
+        return point_id
+
+    def vanished(self, existing_ids: Iterable[str]) -> Set[str]:
+        """
+        Qdrant'ta bulunan ama bu döngüde artık üretilmeyen (silinecek) ID'leri döndürür.
+        """
+        return set(existing_ids).difference(self.point_ids)
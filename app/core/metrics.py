@@ -34,12 +34,103 @@ VECTORS_UPSERTED_TOTAL = Counter(
     "Total number of vectors upserted to the vector database.",
     ["tenant_id", "collection"],
 )
+VECTORS_DELETED_TOTAL = Counter(
+    "vectors_deleted_total",
+    "Total number of stale vectors deleted from the vector database.",
+    ["tenant_id", "collection"],
+)
+CHUNKS_UNCHANGED_TOTAL = Counter(
+    "chunks_unchanged_total",
+    "Total number of chunks skipped because they were already indexed.",
+    ["tenant_id", "source_type"],
+)
+CHUNKS_DEDUPLICATED_TOTAL = Counter(
+    "chunks_deduplicated_total",
+    "Total number of near-duplicate chunks skipped or linked instead of embedded.",
+    ["tenant_id", "source_type", "mode"],
+)
+DATASOURCES_CLAIMED_TOTAL = Counter(
+    "datasources_claimed_total",
+    "Total number of datasources leased by this worker for indexing.",
+)
+PIPELINE_STAGE_DURATION_SECONDS = Histogram(
+    "pipeline_stage_duration_seconds",
+    "Time spent by a pipeline stage worker on a single item.",
+    ["stage"],
+)
+QDRANT_UPSERT_BATCH_SECONDS = Histogram(
+    "qdrant_upsert_batch_seconds",
+    "Round-trip latency of a single Qdrant upsert batch.",
+    ["wait"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+QDRANT_UPSERTS_IN_FLIGHT = Gauge(
+    "qdrant_upserts_in_flight",
+    "Current number of Qdrant upsert batches in flight.",
+)
+DB_POOL_ACQUIRE_SECONDS = Histogram(
+    "db_pool_acquire_seconds",
+    "Time spent waiting to acquire a PostgreSQL connection from the pool.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 15.0),
+)
+DB_POOL_SIZE = Gauge(
+    "db_pool_size", "Current number of connections in the PostgreSQL pool."
+)
+DB_POOL_IDLE = Gauge(
+    "db_pool_idle", "Current number of idle connections in the PostgreSQL pool."
+)
+DATASOURCE_STATUS_FLUSH_SIZE = Histogram(
+    "datasource_status_flush_size",
+    "Number of datasource status updates written per write-behind flush.",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250),
+)
+EMBEDDING_CACHE_HITS_TOTAL = Counter(
+    "embedding_cache_hits_total",
+    "Total number of chunk embeddings served from the embedding cache.",
+)
+EMBEDDING_CACHE_MISSES_TOTAL = Counter(
+    "embedding_cache_misses_total",
+    "Total number of chunk embeddings not found in the embedding cache.",
+)
+EMBEDDING_CACHE_EVICTIONS_TOTAL = Counter(
+    "embedding_cache_evictions_total",
+    "Total number of embeddings evicted from the embedding cache (LRU).",
+)
+EMBEDDING_CACHE_ENTRIES = Gauge(
+    "embedding_cache_entries",
+    "Current number of embeddings stored in the embedding cache.",
+)
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between when the event loop lag probe was due and when it actually ran.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
 LAST_INDEXING_TIMESTAMP = Gauge(
     "last_indexing_timestamp_seconds",
     "Timestamp of the last successful indexing cycle completion.",
 )
 
 
+async def monitor_event_loop_lag():
+    """
+    Periyodik olarak uyur ve planlanandan ne kadar geç uyandığını ölçer. Gecikme, döngüyü
+    bloklayan (CPU'ya bağlı) işi gösterir; health / gRPC istekleri de aynı süre bekler.
+    """
+    loop = asyncio.get_running_loop()
+    interval = settings.EVENT_LOOP_LAG_INTERVAL_SECONDS
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - started - interval)
+        EVENT_LOOP_LAG_SECONDS.observe(lag)
+        if lag >= settings.EVENT_LOOP_LAG_WARN_SECONDS:
+            logger.warn(
+                f"Event loop was blocked for {lag:.2f}s.",
+                event_name="EVENT_LOOP_STALL",
+                lag_seconds=round(lag, 3),
+            )
+
+
 class MetricsHandler(BaseHTTPRequestHandler):
     def do_GET(self):
         if self.path == "/metrics":
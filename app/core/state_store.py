@@ -0,0 +1,147 @@
+# app/core/state_store.py
+import asyncio
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from app.core.collections import collection_name_for
+from app.core.config import settings
+from app.core.models import DataSource
+
+# Kaynağın bu pod'da en son başarıyla indekslendiği 'last_indexed_at' değeri ve hedef koleksiyonu
+# (durum geçerlilik işareti).
+SOURCE_NAMESPACE = "source"
+
+_store: Optional["StateStore"] = None
+_store_lock = threading.Lock()
+
+
+class StateStore:
+    """
+    Ingester'ların kaynak bazlı optimizasyon durumunu (ETag, içerik özeti vb.) tutan, SQLite üzerinde
+    (namespace, anahtar) -> JSON deposu. Pod'a özeldir: kiralama kaynakları pod'lar arasında
+    taşıdığı için başka bir pod'un sonradan yaptığı indekslemeyi görmez. Bu yüzden kaynak durumu
+    sadece is_current() doğrularsa kullanılır; aksi halde eski bir özet değişiklikleri gizleyebilir.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS state ("
+            "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+            "PRIMARY KEY (namespace, key))"
+        )
+        self._conn.commit()
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM state WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def scan(self, namespace: str, prefix: str) -> Dict[str, Any]:
+        """Anahtarı verilen önekle başlayan tüm kayıtları tek sorguda döndürür."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value FROM state WHERE namespace = ? AND key >= ? AND key < ?",
+                (namespace, prefix, prefix + "\U0010ffff"),
+            ).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def put(self, namespace: str, key: str, value: Any):
+        self.put_many(namespace, {key: value})
+
+    def put_many(self, namespace: str, values: Dict[str, Any]):
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO state (namespace, key, value) VALUES (?, ?, ?)",
+                [(namespace, key, json.dumps(value)) for key, value in values.items()],
+            )
+            self._conn.commit()
+
+    def delete_many(self, namespace: str, keys: Iterable[str]):
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM state WHERE namespace = ? AND key = ?",
+                [(namespace, key) for key in keys],
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def get_store() -> StateStore:
+    """Servis genelinde paylaşılan durum deposunu (ilk kullanımda açarak) döndürür."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = StateStore(
+                str(
+                    Path(settings.KNOWLEDGE_INDEXING_STATE_DIR) / "ingest-state.sqlite3"
+                )
+            )
+        return _store
+
+
+def close_store():
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+            _store = None
+
+
+def _source_key(source: DataSource) -> str:
+    return f"{source.tenant_id}|{source.source_uri}"
+
+
+def _stamp(value: datetime) -> str:
+    # Postgres'ten saat dilimsiz dönen değerler UTC kabul edilir.
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+
+async def is_current(source: DataSource) -> bool:
+    """
+    Pod'daki kaynak durumunun Postgres'teki satırla uyumlu olup olmadığı. Kaynağın 'last_indexed_at'
+    değerini en son bu pod yazdıysa ve hedef koleksiyon değişmediyse durum geçerlidir; hiç
+    indekslenmemiş, sıfırlanmış, son olarak başka bir pod'da indekslenmiş veya yeni bir koleksiyona
+    (ör. QDRANT_MULTITENANT_COLLECTION'a geçiş) yazılacak kaynaklarda False döner ve ingester
+    baştan çalışır.
+    """
+    if source.last_indexed_at is None:
+        return False
+    marker = await asyncio.to_thread(
+        get_store().get, SOURCE_NAMESPACE, _source_key(source)
+    )
+    return marker == {
+        "indexed_at": _stamp(source.last_indexed_at),
+        "collection": collection_name_for(source.tenant_id),
+    }
+
+
+async def mark_indexed(source: DataSource, indexed_at: datetime):
+    """Başarılı indekslemenin Postgres'e yazılan zamanını kaynak durumunun işareti olarak saklar."""
+    await asyncio.to_thread(
+        get_store().put,
+        SOURCE_NAMESPACE,
+        _source_key(source),
+        {
+            "indexed_at": _stamp(indexed_at),
+            "collection": collection_name_for(source.tenant_id),
+        },
+    )
@@ -0,0 +1,47 @@
+from .base import BaseEmbedder
+from app.core.config import settings
+
+MODEL_CACHE_DIR = "/app/model-cache"
+
+
+def embedder_factory(threads: int = 0) -> BaseEmbedder:
+    """
+    EMBEDDING_BACKEND ayarına göre uygun embedding arka ucunu oluşturur.
+    Arka uçlar ağır bağımlılıklar (torch / onnxruntime) içerdiği için sadece seçilen yüklenir.
+    """
+    model_name = settings.QDRANT_DB_EMBEDDING_MODEL_NAME
+    if settings.EMBEDDING_BACKEND == "sentence_transformers":
+        from .sentence_transformer_embedder import SentenceTransformerEmbedder
+
+        return SentenceTransformerEmbedder(model_name, MODEL_CACHE_DIR, threads=threads)
+    elif settings.EMBEDDING_BACKEND == "onnx":
+        from .onnx_embedder import OnnxEmbedder
+
+        return OnnxEmbedder(
+            model_name,
+            MODEL_CACHE_DIR,
+            export_root=f"{settings.KNOWLEDGE_INDEXING_STATE_DIR}/onnx",
+            quantize=settings.EMBEDDING_ONNX_QUANTIZE,
+            threads=threads,
+        )
+    else:
+        raise ValueError(
+            f"Desteklenmeyen embedding arka ucu: {settings.EMBEDDING_BACKEND}"
+        )
+
+
+def prepare_embedder():
+    """
+    Modeli belleğe almadan, arka ucun ilk açılışta ürettiği dosyaları hazırlar (ONNX aktarımı).
+    Süreç havuzundaki süreçler modeli aynı anda yüklerken aktarımı yarıştırmasın diye havuzdan
+    önce ana süreçte çağrılır.
+    """
+    if settings.EMBEDDING_BACKEND == "onnx":
+        from .onnx_embedder import ensure_onnx_export
+
+        ensure_onnx_export(
+            settings.QDRANT_DB_EMBEDDING_MODEL_NAME,
+            MODEL_CACHE_DIR,
+            f"{settings.KNOWLEDGE_INDEXING_STATE_DIR}/onnx",
+            settings.EMBEDDING_ONNX_QUANTIZE,
+        )
@@ -0,0 +1,35 @@
+# app/embedders/base.py
+from abc import ABC, abstractmethod
+from typing import Any, List
+
+import numpy as np
+
+
+class BaseEmbedder(ABC):
+    """Tüm embedding arka uçları (backend) için soyut temel sınıf."""
+
+    # Embedding önbelleğinin kimliği. Farklı vektör üreten arka uçlar (ör. int8) farklı kimlik taşır.
+    identity: str
+    dimension: int
+    max_seq_length: int
+    # HuggingFace tokenizer'ı; token uzunlukları (parti bütçesi) için kullanılır.
+    tokenizer: Any
+
+    @abstractmethod
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Verilen metinleri tek bir parti olarak encode eder ve (len(texts), dimension)
+        boyutlu float32 matris döndürür.
+        """
+        pass
+
+    def token_lengths(self, texts: List[str]) -> List[int]:
+        encoded = self.tokenizer(
+            texts,
+            add_special_tokens=True,
+            truncation=True,
+            max_length=self.max_seq_length,
+            return_attention_mask=False,
+            return_token_type_ids=False,
+        )
+        return [len(ids) for ids in encoded["input_ids"]]
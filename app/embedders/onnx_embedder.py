@@ -0,0 +1,194 @@
+# app/embedders/onnx_embedder.py
+import gc
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import structlog
+
+from .base import BaseEmbedder
+
+logger = structlog.get_logger()
+
+MODEL_FILE = "model.onnx"
+CONFIG_FILE = "embedder.json"
+_INPUT_NAMES = ("input_ids", "attention_mask", "token_type_ids")
+
+
+def export_dir_for(export_root: str, model_name: str, quantize: bool) -> Path:
+    return (
+        Path(export_root)
+        / model_name.replace("/", "__")
+        / ("int8" if quantize else "fp32")
+    )
+
+
+def export_onnx_model(
+    model_name: str, cache_folder: str, export_dir: Path, quantize: bool
+):
+    """
+    SentenceTransformer modelinin transformer gövdesini ONNX'e aktarır; istenirse ağırlıkları
+    dinamik int8'e kuantize eder. Pooling ve normalizasyon ayarları ST modül zincirinden okunur
+    ve tokenizer ile birlikte 'embedder.json' olarak saklanır. Torch sadece bu adımda gereklidir.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+    from sentence_transformers import models as st_models
+
+    logger.info(
+        "Exporting embedding model to ONNX.",
+        event_name="EMBEDDING_ONNX_EXPORT_START",
+        model=model_name,
+        quantize=quantize,
+    )
+
+    st_model = SentenceTransformer(model_name, cache_folder=cache_folder, device="cpu")
+    modules = list(st_model)
+    if (
+        len(modules) < 2
+        or not isinstance(modules[0], st_models.Transformer)
+        or not isinstance(modules[1], st_models.Pooling)
+        or any(not isinstance(m, st_models.Normalize) for m in modules[2:])
+    ):
+        raise ValueError(
+            f"Unsupported SentenceTransformer module chain for ONNX export: "
+            f"{[type(m).__name__ for m in modules]}"
+        )
+
+    pooling_mode = modules[1].get_pooling_mode_str()
+    if pooling_mode not in ("mean", "cls"):
+        raise ValueError(f"Unsupported pooling mode for ONNX export: {pooling_mode}")
+
+    tokenizer = st_model.tokenizer
+    input_names = [name for name in _INPUT_NAMES if name in tokenizer.model_input_names]
+    sample = tokenizer(["onnx export"], return_tensors="pt")
+
+    work_dir = export_dir.with_name(export_dir.name + ".tmp")
+    shutil.rmtree(work_dir, ignore_errors=True)
+    work_dir.mkdir(parents=True)
+
+    auto_model = modules[0].auto_model.eval()
+    auto_model.config.return_dict = False
+    fp32_path = work_dir / ("model.fp32.onnx" if quantize else MODEL_FILE)
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["token_embeddings"] = {0: "batch", 1: "sequence"}
+    with torch.no_grad():
+        torch.onnx.export(
+            auto_model,
+            ({name: sample[name] for name in input_names},),
+            str(fp32_path),
+            input_names=input_names,
+            output_names=["token_embeddings"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+            do_constant_folding=True,
+        )
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantize_dynamic(
+            str(fp32_path), str(work_dir / MODEL_FILE), weight_type=QuantType.QInt8
+        )
+        fp32_path.unlink()
+
+    tokenizer.save_pretrained(str(work_dir))
+    config = {
+        "model_name": model_name,
+        "pooling_mode": pooling_mode,
+        "normalize": len(modules) > 2,
+        "max_seq_length": st_model.max_seq_length,
+        "dimension": st_model.get_sentence_embedding_dimension(),
+        "quantized": quantize,
+    }
+    (work_dir / CONFIG_FILE).write_text(json.dumps(config, indent=2))
+
+    shutil.rmtree(export_dir, ignore_errors=True)
+    os.replace(work_dir, export_dir)
+
+    del st_model, auto_model, modules
+    gc.collect()
+    logger.info(
+        "Embedding model exported to ONNX.",
+        event_name="EMBEDDING_ONNX_EXPORT_DONE",
+        model=model_name,
+        path=str(export_dir),
+        quantize=quantize,
+    )
+
+
+def ensure_onnx_export(
+    model_name: str, cache_folder: str, export_root: str, quantize: bool
+) -> Path:
+    """Model daha önce aktarılmadıysa ONNX'e aktarır ve aktarım dizinini döndürür."""
+    export_dir = export_dir_for(export_root, model_name, quantize)
+    if not (export_dir / CONFIG_FILE).exists():
+        export_onnx_model(model_name, cache_folder, export_dir, quantize)
+    return export_dir
+
+
+class OnnxEmbedder(BaseEmbedder):
+    """
+    ONNX Runtime (CPU) arka ucu. Model ilk açılışta ONNX'e aktarılır ve durum dizininde saklanır;
+    sonraki açılışlarda torch hiç yüklenmez. Pooling ve normalizasyon numpy ile yapılır.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        cache_folder: str,
+        export_root: str,
+        quantize: bool = False,
+        threads: int = 0,
+    ):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        export_dir = ensure_onnx_export(model_name, cache_folder, export_root, quantize)
+
+        config = json.loads((export_dir / CONFIG_FILE).read_text())
+        self.identity = f"{model_name}#onnx-{'int8' if quantize else 'fp32'}"
+        self.dimension = config["dimension"]
+        self.max_seq_length = config["max_seq_length"]
+        self.pooling_mode = config["pooling_mode"]
+        self.normalize = config["normalize"]
+        self.tokenizer = AutoTokenizer.from_pretrained(str(export_dir))
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads > 0:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(
+            str(export_dir / MODEL_FILE),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        self._input_names = [i.name for i in self.session.get_inputs()]
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        features = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self.max_seq_length,
+            return_tensors="np",
+        )
+        feeds = {name: features[name].astype(np.int64) for name in self._input_names}
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        if self.pooling_mode == "cls":
+            embeddings = token_embeddings[:, 0]
+        else:
+            mask = feeds["attention_mask"][..., None].astype(np.float32)
+            embeddings = (token_embeddings * mask).sum(axis=1) / np.clip(
+                mask.sum(axis=1), 1e-9, None
+            )
+
+        if self.normalize:
+            embeddings = embeddings / np.clip(
+                np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None
+            )
+        return embeddings.astype(np.float32, copy=False)
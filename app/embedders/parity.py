@@ -0,0 +1,90 @@
+# app/embedders/parity.py
+"""
+Bir embedding arka ucunun torch (SentenceTransformer) arka ucuna göre kosinüs sapmasını ve
+hızını ölçer. Arka uç değiştirilmeden önce çalıştırılmalıdır; sapma arama kalitesine doğrudan yansır.
+"""
+
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .base import BaseEmbedder
+
+SAMPLE_CORPUS = [
+    "Siparişimi iptal etmek istiyorum, ücret iadesi ne zaman yapılır?",
+    "Kargom üç gündür aynı şubede bekliyor, ne yapmalıyım?",
+    "Faturamdaki ek ücretin nedenini öğrenebilir miyim?",
+    "Şifremi unuttum ve doğrulama e-postası gelmiyor.",
+    "Ürün garanti kapsamında mı, servis kaydı nasıl açılır?",
+    "Randevumu gelecek haftaya ertelemek mümkün mü?",
+    "How do I change the delivery address of an order that has already shipped?",
+    "The payment was taken twice from my credit card.",
+    "Please explain the difference between the standard and premium support plans.",
+    "Our API requests return 429 errors after a few minutes of traffic.",
+    "Wie kann ich mein Abonnement kündigen?",
+    "Die Rechnung wurde an die falsche Adresse geschickt.",
+    "¿Cuál es el horario de atención al cliente durante los días festivos?",
+    "Je n'arrive pas à me connecter à mon compte depuis la mise à jour.",
+    "Müşteri temsilcisine bağlanmak için hangi tuşa basmalıyım?",
+    "Kampanya koşulları: 500 TL ve üzeri alışverişlerde kargo ücretsizdir. "
+    "İndirim kodları başka kampanyalarla birleştirilemez ve iade durumunda indirim tutarı düşülür.",
+]
+
+
+def load_corpus(path: Optional[str] = None) -> List[str]:
+    """Her satırı bir metin olan dosyayı okur; dosya verilmezse örnek derlemi döndürür."""
+    if not path:
+        return list(SAMPLE_CORPUS)
+    lines = Path(path).read_text(encoding="utf-8").splitlines()
+    return [line.strip() for line in lines if line.strip()]
+
+
+def _encode_all(
+    embedder: BaseEmbedder, texts: List[str], batch_size: int
+) -> np.ndarray:
+    return np.concatenate(
+        [
+            embedder.encode(texts[i : i + batch_size])
+            for i in range(0, len(texts), batch_size)
+        ]
+    )
+
+
+def measure_parity(
+    reference: BaseEmbedder,
+    candidate: BaseEmbedder,
+    texts: List[str],
+    batch_size: int = 32,
+) -> Dict[str, float]:
+    if reference.dimension != candidate.dimension:
+        raise ValueError(
+            f"Dimension mismatch: {reference.dimension} != {candidate.dimension}"
+        )
+
+    # Isınma: ilk çağrıdaki tek seferlik maliyetler (graf optimizasyonu vb.) ölçüme katılmaz.
+    reference.encode(texts[:1])
+    candidate.encode(texts[:1])
+
+    started = time.perf_counter()
+    expected = _encode_all(reference, texts, batch_size)
+    reference_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    actual = _encode_all(candidate, texts, batch_size)
+    candidate_seconds = time.perf_counter() - started
+
+    cosine = np.sum(expected * actual, axis=1) / np.clip(
+        np.linalg.norm(expected, axis=1) * np.linalg.norm(actual, axis=1), 1e-12, None
+    )
+    drift = 1.0 - cosine
+    return {
+        "samples": len(texts),
+        "mean_cosine": float(cosine.mean()),
+        "min_cosine": float(cosine.min()),
+        "p99_drift": float(np.percentile(drift, 99)),
+        "reference_seconds": reference_seconds,
+        "candidate_seconds": candidate_seconds,
+        "speedup": reference_seconds / max(candidate_seconds, 1e-9),
+    }
@@ -0,0 +1,38 @@
+# app/embedders/sentence_transformer_embedder.py
+from typing import Any, List, Optional
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+from .base import BaseEmbedder
+
+
+class SentenceTransformerEmbedder(BaseEmbedder):
+    """PyTorch üzerinde çalışan varsayılan SentenceTransformer arka ucu."""
+
+    def __init__(
+        self,
+        model_name: str,
+        cache_folder: str,
+        threads: int = 0,
+        model: Optional[Any] = None,
+    ):
+        if threads > 0:
+            import torch
+
+            torch.set_num_threads(threads)
+
+        self.model = model or SentenceTransformer(model_name, cache_folder=cache_folder)
+        # Mevcut embedding önbellekleri model adıyla oluşturulmuştur; torch arka ucu bu kimliği korur.
+        self.identity = model_name
+        self.dimension = self.model.get_sentence_embedding_dimension()
+        self.max_seq_length = self.model.max_seq_length
+        self.tokenizer = self.model.tokenizer
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        return self.model.encode(
+            texts,
+            batch_size=len(texts),
+            show_progress_bar=False,
+            convert_to_numpy=True,
+        )
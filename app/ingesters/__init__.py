@@ -1,6 +1,7 @@
 from .base import BaseIngester
 from .postgres_ingester import PostgresIngester
 from .web_ingester import WebIngester
+from .web_crawler import WebCrawlIngester, WebCrawlSpec
 from .file_ingester import FileIngester  # EKLENDİ
 from app.core.models import DataSource
 
@@ -12,6 +13,8 @@ def ingester_factory(source: DataSource) -> BaseIngester:
     if source.source_type == "postgres":
         return PostgresIngester()
     elif source.source_type == "web":
+        if WebCrawlSpec.is_crawl(source.source_uri):
+            return WebCrawlIngester()
         return WebIngester()
     elif source.source_type == "file":  # EKLENDİ
         return FileIngester()
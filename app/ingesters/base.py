@@ -1,15 +1,43 @@
 # sentiric-knowledge-indexing-service/app/ingesters/base.py
 from abc import ABC, abstractmethod
-from typing import List
+from datetime import datetime
+from typing import AsyncGenerator, List, Optional, Set
 from app.core.models import Document, DataSource
 
 
 class BaseIngester(ABC):
     """Tüm veri yükleyiciler için soyut temel sınıf."""
 
+    # Artımlı (incremental) mod: True ise sadece üretilen dokümanların 'document_key' değerine
+    # ait noktalar yenilenir; kaynağın geri kalanı olduğu gibi korunur.
+    incremental: bool = False
+    # Artımlı modda silindiği bilinen doküman anahtarları (ör. tombstone satırlar).
+    deleted_keys: Optional[Set[str]] = None
+    # Artımlı modda kaynakta halen var olan tüm anahtarlar (anti-join ile silme tespiti için).
+    current_keys: Optional[Set[str]] = None
+    # Başarılı indeksleme sonrası 'last_indexed_at' olarak yazılacak su seviyesi (watermark).
+    watermark: Optional[datetime] = None
+
     @abstractmethod
     async def load(self, source: DataSource) -> List[Document]:
         """
         Verilen veri kaynağından dokümanları yükler.
         """
         pass
+
+    async def commit(self, source: DataSource):
+        """
+        Kaynak başarıyla indekslendikten sonra çağrılır. Bir sonraki döngüde işi atlamak için
+        tutulan durum (ETag, içerik özeti vb.) sadece burada kalıcı hale getirilmelidir.
+        """
+        pass
+
+    async def stream(self, source: DataSource) -> AsyncGenerator[List[Document], None]:
+        """
+        Dokümanları partiler halinde üretir. Varsayılan olarak load() sonucu tek parti döner;
+        büyük kaynaklar bu metodu ezerek belleği parti boyutuyla sınırlı tutar.
+        Akış yarıda hata alırsa istisna fırlatılmalıdır (kısmi veri başarılı sayılmamalı).
+        """
+        documents = await self.load(source)
+        if documents:
+            yield documents
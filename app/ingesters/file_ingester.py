@@ -1,15 +1,409 @@
 # app/ingesters/file_ingester.py
 import asyncio
+import codecs
+import hashlib
+import itertools
+import mmap
+import os
+import re
 import structlog
 from pathlib import Path
-from typing import List
+from typing import AsyncGenerator, Dict, Generator, List, Optional, Pattern, Set, Tuple
 from .base import BaseIngester
+from app.core import state_store
+from app.core.chunking import iter_paragraph_segments
+from app.core.config import settings
+from app.core.manifest import DOCUMENT_KEY_FIELD
 from app.core.models import Document, DataSource
 
 logger = structlog.get_logger()
 
+STATE_NAMESPACE = "file"
+
+_GLOB_CHARS = re.compile(r"[*?\[]")
+
+# (yol, boyut, mtime_ns)
+FileEntry = Tuple[str, int, int]
+
+
+def is_glob(source_uri: str) -> bool:
+    return bool(_GLOB_CHARS.search(source_uri))
+
+
+def compile_glob(pattern: str) -> Pattern:
+    """
+    Göreli bir glob desenini ('/' ayraçlı) regex'e çevirir. '*' ve '?' dizin ayracını geçmez;
+    '**' ise sıfır veya daha fazla dizin seviyesini eşler.
+    """
+    regex = []
+    segments = pattern.split("/")
+    for i, segment in enumerate(segments):
+        last = i == len(segments) - 1
+        if segment == "**":
+            regex.append(".*" if last else "(?:.*/)?")
+            continue
+        j = 0
+        while j < len(segment):
+            char = segment[j]
+            if char == "*":
+                regex.append("[^/]*")
+            elif char == "?":
+                regex.append("[^/]")
+            elif char == "[" and "]" in segment[j + 2 :]:
+                end = segment.index("]", j + 2)
+                body = segment[j + 1 : end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                regex.append(f"[{body}]")
+                j = end
+            else:
+                regex.append(re.escape(char))
+            j += 1
+        if not last:
+            regex.append("/")
+    return re.compile("".join(regex) + r"\Z")
+
+
+def split_glob(source_uri: str) -> Tuple[Path, str]:
+    """Glob'u joker karakter içermeyen kök dizin ve köke göreli desen olarak ikiye ayırır."""
+    parts = Path(source_uri).parts
+    for i, part in enumerate(parts):
+        if _GLOB_CHARS.search(part):
+            return Path(*parts[:i]) if i else Path("."), "/".join(parts[i:])
+    return Path(source_uri), ""
+
+
+def scan_files(
+    root: Path,
+    matcher: Optional[Pattern],
+    max_depth: Optional[int],
+    extensions: Optional[Set[str]],
+) -> List[FileEntry]:
+    """
+    Dizini os.scandir ile dolaşır; dosya boyutu ve mtime scandir'in döndürdüğü stat'tan okunur,
+    dosyalar açılmaz. Gizli (nokta ile başlayan) girdiler ve sembolik bağlantılı dizinler atlanır.
+    """
+    entries: List[FileEntry] = []
+    stack = [(str(root), "", 0)]
+    while stack:
+        directory, relative_dir, depth = stack.pop()
+        try:
+            iterator = os.scandir(directory)
+        except OSError as e:
+            if depth == 0:
+                raise
+            logger.warn(
+                f"Cannot list directory: {directory}",
+                event_name="INGEST_FILE_DIR_UNREADABLE",
+                path=directory,
+                error=str(e),
+            )
+            continue
+        with iterator:
+            for entry in iterator:
+                if entry.name.startswith("."):
+                    continue
+                relative = f"{relative_dir}{entry.name}"
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if max_depth is None or depth + 1 < max_depth:
+                            stack.append((entry.path, relative + "/", depth + 1))
+                        continue
+                    if not entry.is_file():
+                        continue
+                    if matcher is not None and not matcher.match(relative):
+                        continue
+                    if (
+                        extensions is not None
+                        and os.path.splitext(entry.name)[1].lower() not in extensions
+                    ):
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((entry.path, stat.st_size, stat.st_mtime_ns))
+    entries.sort()
+    return entries
+
+
+def probe_large_file(path: Path, block_bytes: int) -> Tuple[str, str]:
+    """
+    Büyük dosyayı belleğe almadan (mmap, blok blok) özetler ve UTF-8 olup olmadığını artımlı
+    decoder ile doğrular. (SHA-256 özeti, kodlama) döndürür.
+    """
+    hasher = hashlib.sha256()
+    decoder: Optional[codecs.IncrementalDecoder] = codecs.getincrementaldecoder(
+        "utf-8"
+    )()
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if hasattr(mm, "madvise"):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        for offset in range(0, len(mm), block_bytes):
+            block = mm[offset : offset + block_bytes]
+            hasher.update(block)
+            if decoder is not None:
+                try:
+                    decoder.decode(block)
+                except UnicodeDecodeError:
+                    decoder = None
+    if decoder is not None:
+        try:
+            decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            decoder = None
+    return hasher.hexdigest(), "utf-8" if decoder is not None else "latin-1"
+
+
+def iter_decoded_blocks(
+    path: Path, encoding: str, block_bytes: int
+) -> Generator[str, None, None]:
+    """Dosyayı mmap üzerinden bloklar halinde okur; çok baytlı karakterler blok sınırında bölünmez."""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if hasattr(mm, "madvise"):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        for offset in range(0, len(mm), block_bytes):
+            yield decoder.decode(mm[offset : offset + block_bytes])
+    yield decoder.decode(b"", final=True)
+
 
 class FileIngester(BaseIngester):
+    """
+    Tek bir dosyayı, bir dizini (alt dizinlerle) veya bir glob desenini (ör. '/data/kb/**/*.md')
+    indeksler. Dizin ve glob kaynaklarında her dosya ayrı bir dokümandır (document_key = yol) ve
+    (boyut, mtime, içerik özeti) manifesti tutulur: stat'ı değişmeyen dosyalar okunmaz, içeriği
+    değişmeyenler embed edilmez, silinen dosyaların noktaları manifestten bulunarak kaldırılır
+    (manifest güvenilir değilse anti-join ile).
+    """
+
+    def __init__(self):
+        self._pending_state: Dict[str, dict] = {}
+        self._stale_keys: List[str] = []
+
+    async def stream(self, source: DataSource) -> AsyncGenerator[List[Document], None]:
+        if not is_glob(source.source_uri) and not await asyncio.to_thread(
+            Path(source.source_uri).is_dir
+        ):
+            async for documents in self._stream_single_file(source):
+                yield documents
+            return
+
+        self.incremental = True
+        self.deleted_keys = set()
+        if is_glob(source.source_uri):
+            root, pattern = split_glob(source.source_uri)
+            matcher: Optional[Pattern] = compile_glob(pattern)
+            max_depth = None if "**" in pattern else len(pattern.split("/"))
+            extensions = None
+        else:
+            root, matcher, max_depth = Path(source.source_uri), None, None
+            extensions = {
+                ext.strip().lower()
+                for ext in settings.FILE_DIRECTORY_EXTENSIONS.split(",")
+                if ext.strip()
+            }
+
+        logger.info(
+            f"Scanning files: {source.source_uri}",
+            event_name="INGEST_FILE_SCAN_START",
+            root=str(root),
+        )
+        store = state_store.get_store()
+        prefix = f"{source.tenant_id}|{source.source_uri}|"
+        manifest = await asyncio.to_thread(store.scan, STATE_NAMESPACE, prefix)
+        # Kaynak hiç indekslenmediyse, sıfırlandıysa veya son olarak başka bir pod'da indekslendiyse
+        # manifest karşılaştırmada kullanılmaz.
+        trusted = await state_store.is_current(source)
+        previous = manifest if trusted else {}
+
+        # Kök dizin okunamazsa (ör. bağlanmamış volume) istisna fırlar ve kaynak başarısız olur;
+        # aksi halde tüm dosyaların noktaları silinirdi.
+        entries = await asyncio.to_thread(
+            scan_files, root, matcher, max_depth, extensions
+        )
+        paths = {path for path, _, _ in entries}
+        self._stale_keys = [key for key in manifest if key[len(prefix) :] not in paths]
+        if trusted:
+            # Manifest güvenilirse silinen dosyalar doğrudan ondan bulunur; Qdrant'taki tüm noktalar
+            # taranmaz (anti-join maliyeti indekslenen nokta sayısıyla büyür).
+            self.deleted_keys.update(key[len(prefix) :] for key in self._stale_keys)
+        else:
+            self.current_keys = paths
+
+        changed = []
+        large = []
+        for path, size, mtime_ns in entries:
+            state = previous.get(prefix + path)
+            if state and state["size"] == size and state["mtime_ns"] == mtime_ns:
+                continue
+            if size >= settings.FILE_STREAM_THRESHOLD_BYTES:
+                large.append((path, size, mtime_ns))
+            else:
+                changed.append((path, size, mtime_ns))
+
+        read_count = 0
+        unchanged_count = 0
+        for i in range(0, len(changed), settings.FILE_BATCH_FILES):
+            part = changed[i : i + settings.FILE_BATCH_FILES]
+            contents = await asyncio.gather(
+                *(asyncio.to_thread(self._read_file, Path(path)) for path, _, _ in part)
+            )
+            documents = []
+            for (path, size, mtime_ns), result in zip(part, contents):
+                if result is None:
+                    # Okunamayan dosya: noktaları korunur, manifest güncellenmez (sonraki döngüde tekrar denenir).
+                    continue
+                read_count += 1
+                content, content_hash = result
+                key = prefix + path
+                self._pending_state[key] = {
+                    "size": size,
+                    "mtime_ns": mtime_ns,
+                    "hash": content_hash,
+                }
+                if previous.get(key, {}).get("hash") == content_hash:
+                    unchanged_count += 1
+                    continue
+                if not content.strip():
+                    self.deleted_keys.add(path)
+                    continue
+                documents.append(self._to_document(source, Path(path), content, path))
+            if documents:
+                yield documents
+
+        for path, size, mtime_ns in large:
+            read_count += 1
+            async for documents in self._stream_large_file(
+                source, Path(path), prefix + path, size, mtime_ns, previous, path
+            ):
+                yield documents
+
+        logger.info(
+            "File scan finished.",
+            event_name="INGEST_FILE_SCAN_SUCCESS",
+            files=len(entries),
+            stat_changed=len(changed) + len(large),
+            read=read_count,
+            content_unchanged=unchanged_count,
+            removed=len(self._stale_keys),
+        )
+
+    async def _stream_single_file(
+        self, source: DataSource
+    ) -> AsyncGenerator[List[Document], None]:
+        file_path = Path(source.source_uri)
+        try:
+            stat = await asyncio.to_thread(file_path.stat)
+        except OSError:
+            stat = None
+        if stat is None or stat.st_size < settings.FILE_STREAM_THRESHOLD_BYTES:
+            documents = await self.load(source)
+            if documents:
+                yield documents
+            return
+
+        key = f"{source.tenant_id}|{source.source_uri}"
+        previous = (
+            await asyncio.to_thread(state_store.get_store().get, STATE_NAMESPACE, key)
+            if await state_store.is_current(source)
+            else None
+        )
+        if (
+            previous
+            and previous["size"] == stat.st_size
+            and previous["mtime_ns"] == stat.st_mtime_ns
+        ):
+            logger.info(
+                "File not modified since last indexing.",
+                event_name="INGEST_FILE_NOT_MODIFIED",
+                path=str(file_path),
+            )
+            self.incremental = True
+            return
+
+        async for documents in self._stream_large_file(
+            source,
+            file_path,
+            key,
+            stat.st_size,
+            stat.st_mtime_ns,
+            {key: previous} if previous else {},
+            None,
+        ):
+            yield documents
+
+    async def _stream_large_file(
+        self,
+        source: DataSource,
+        file_path: Path,
+        key: str,
+        size: int,
+        mtime_ns: int,
+        previous: Dict[str, dict],
+        document_key: Optional[str],
+    ) -> AsyncGenerator[List[Document], None]:
+        """
+        Büyük dosyayı tamamı belleğe alınmadan işler: önce mmap ile özetlenir, içerik değiştiyse
+        bloklar artımlı decode edilip paragraf sınırlarında segmentlere bölünür ve her segment ayrı
+        doküman olarak parti parti pipeline'a verilir. Bellek kullanımı dosya boyutuyla değil
+        parti boyutuyla (FILE_STREAM_BATCH_SEGMENTS x FILE_STREAM_SEGMENT_CHARS) orantılıdır.
+        """
+        block_bytes = settings.FILE_STREAM_BLOCK_BYTES
+        content_hash, encoding = await asyncio.to_thread(
+            probe_large_file, file_path, block_bytes
+        )
+        self._pending_state[key] = {
+            "size": size,
+            "mtime_ns": mtime_ns,
+            "hash": content_hash,
+        }
+        if previous.get(key, {}).get("hash") == content_hash:
+            # Tek dosya kaynağında değişmeyen içerik için kaynak "değişiklik yok" olarak tamamlanır.
+            self.incremental = True
+            return
+
+        logger.info(
+            f"Streaming large file: {file_path}",
+            event_name="INGEST_FILE_STREAM_START",
+            path=str(file_path),
+            size=size,
+            encoding=encoding,
+        )
+        segments = iter_paragraph_segments(
+            iter_decoded_blocks(file_path, encoding, block_bytes),
+            settings.FILE_STREAM_SEGMENT_CHARS,
+        )
+        batch_size = settings.FILE_STREAM_BATCH_SEGMENTS
+        segment_count = 0
+        produced = False
+        try:
+            while True:
+                # Segmentler (okuma + decode) thread'de üretilir; döngü bloklanmaz.
+                part = await asyncio.to_thread(
+                    lambda: list(itertools.islice(segments, batch_size))
+                )
+                if not part:
+                    break
+                segment_count += len(part)
+                produced = True
+                # Segment sırası metadata'ya yazılmaz; sınır kayması değişmeyen chunk'ların ID'lerini bozmaz.
+                yield [
+                    self._to_document(source, file_path, segment, document_key)
+                    for segment in part
+                ]
+        finally:
+            segments.close()
+
+        if not produced and document_key is not None:
+            assert self.deleted_keys is not None
+            self.deleted_keys.add(document_key)
+        logger.info(
+            "Large file streamed.",
+            event_name="INGEST_FILE_STREAM_SUCCESS",
+            path=str(file_path),
+            segments=segment_count,
+        )
+
     async def load(self, source: DataSource) -> List[Document]:
         file_path = Path(source.source_uri)
 
@@ -32,7 +426,39 @@ class FileIngester(BaseIngester):
             return []
 
         try:
-            content = await asyncio.to_thread(self._read_file_safe, file_path)
+            key = f"{source.tenant_id}|{source.source_uri}"
+            previous = (
+                await asyncio.to_thread(
+                    state_store.get_store().get, STATE_NAMESPACE, key
+                )
+                if await state_store.is_current(source)
+                else None
+            )
+            stat = file_path.stat()
+            if (
+                previous
+                and previous["size"] == stat.st_size
+                and previous["mtime_ns"] == stat.st_mtime_ns
+            ):
+                logger.info(
+                    "File not modified since last indexing.",
+                    event_name="INGEST_FILE_NOT_MODIFIED",
+                    path=str(file_path),
+                )
+                self.incremental = True
+                return []
+
+            result = await asyncio.to_thread(self._read_file, file_path)
+            content = result[0] if result else ""
+            if result:
+                self._pending_state[key] = {
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "hash": result[1],
+                }
+                if previous and previous.get("hash") == result[1]:
+                    self.incremental = True
+                    return []
 
             if not content:
                 logger.warn(
@@ -48,18 +474,7 @@ class FileIngester(BaseIngester):
                 size=len(content),
             )
 
-            return [
-                Document(
-                    page_content=content,
-                    metadata={
-                        "source_uri": str(file_path),
-                        "source_type": source.source_type,
-                        "tenant_id": source.tenant_id,
-                        "filename": file_path.name,
-                        "extension": file_path.suffix,
-                    },
-                )
-            ]
+            return [self._to_document(source, file_path, content)]
         except Exception as e:
             logger.error(
                 f"Unexpected error processing file: {e}",
@@ -68,16 +483,57 @@ class FileIngester(BaseIngester):
             )
             return []
 
-    def _read_file_safe(self, path: Path) -> str:
+    async def commit(self, source: DataSource):
+        store = state_store.get_store()
+        if self._pending_state:
+            await asyncio.to_thread(
+                store.put_many, STATE_NAMESPACE, self._pending_state
+            )
+        if self._stale_keys:
+            await asyncio.to_thread(
+                store.delete_many, STATE_NAMESPACE, self._stale_keys
+            )
+
+    def _to_document(
+        self,
+        source: DataSource,
+        file_path: Path,
+        content: str,
+        document_key: Optional[str] = None,
+    ) -> Document:
+        metadata = {
+            "source_uri": str(file_path),
+            "source_type": source.source_type,
+            "tenant_id": source.tenant_id,
+            "filename": file_path.name,
+            "extension": file_path.suffix,
+        }
+        if document_key is not None:
+            # Dizin / glob kaynağında noktalar kaynağa, dosya yolu ise doküman anahtarına bağlanır.
+            metadata["source_uri"] = source.source_uri
+            metadata["path"] = document_key
+            metadata[DOCUMENT_KEY_FIELD] = document_key
+        return Document(page_content=content, metadata=metadata)
+
+    def _read_file(self, path: Path) -> Optional[Tuple[str, str]]:
+        """Dosyayı okur; (metin, ham içeriğin SHA-256 özeti) döndürür. Okunamazsa None."""
+        try:
+            raw = path.read_bytes()
+        except OSError as e:
+            logger.warn(
+                f"Cannot read file: {path}",
+                event_name="INGEST_FILE_UNREADABLE",
+                path=str(path),
+                error=str(e),
+            )
+            return None
+        content_hash = hashlib.sha256(raw).hexdigest()
         try:
-            return path.read_text(encoding="utf-8")
+            return raw.decode("utf-8"), content_hash
         except UnicodeDecodeError:
             logger.warn(
                 "UTF-8 decode failed, trying latin-1...",
                 event_name="INGEST_FILE_ENCODING_RETRY",
                 path=str(path),
             )
-            try:
-                return path.read_text(encoding="latin-1")
-            except Exception:
-                return ""
+            return raw.decode("latin-1"), content_hash
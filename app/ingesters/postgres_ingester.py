@@ -1,87 +1,223 @@
 # app/ingesters/postgres_ingester.py
-import asyncpg
 import structlog
-from typing import List
+from datetime import timedelta
+from typing import AsyncGenerator, List, Optional
+from urllib.parse import parse_qs
 import asyncio
 from .base import BaseIngester
+from app.core import database
 from app.core.config import settings
+from app.core.manifest import DOCUMENT_KEY_FIELD
 from app.core.models import Document, DataSource
 
 logger = structlog.get_logger()
 
 
+class PostgresSourceSpec:
+    """
+    'tablo(icerik, meta1, meta2)?pk=id&updated_at=updated_at&deleted=is_deleted' biçimindeki
+    source_uri'nin ayrıştırılmış hali. Sorgu parametreleri opsiyoneldir:
+    * pk: Satır anahtarı; noktalar 'document_key' payload'ı ile satıra bağlanır.
+    * updated_at: Su seviyesi (watermark) kolonu; sadece son başarılı indekslemeden sonra değişen satırlar okunur.
+    * deleted: Tombstone kolonu; true olan satırların noktaları silinir. Verilmezse silinen satırlar
+      anahtar kümesi üzerinden anti-join ile bulunur.
+    """
+
+    def __init__(
+        self,
+        table: str,
+        columns: List[str],
+        pk: Optional[str] = None,
+        updated_at: Optional[str] = None,
+        deleted: Optional[str] = None,
+    ):
+        self.table = table
+        self.content_column = columns[0]
+        self.metadata_columns = columns[1:]
+        self.pk = pk
+        self.updated_at = updated_at
+        self.deleted = deleted
+
+    @classmethod
+    def parse(cls, source_uri: str) -> "PostgresSourceSpec":
+        spec, _, query = source_uri.partition("?")
+        table_full, columns_str = spec.split("(")
+        columns_str = columns_str.rstrip(")")
+        columns = [c.strip() for c in columns_str.split(",")]
+
+        options = {key: values[-1] for key, values in parse_qs(query).items()}
+        unknown = set(options) - {"pk", "updated_at", "deleted"}
+        if unknown:
+            raise ValueError(f"Unknown source_uri options: {sorted(unknown)}")
+        if (options.get("updated_at") or options.get("deleted")) and not options.get(
+            "pk"
+        ):
+            raise ValueError("'updated_at' and 'deleted' options require 'pk'.")
+        if options.get("deleted") and not options.get("updated_at"):
+            raise ValueError("'deleted' option requires 'updated_at'.")
+
+        return cls(
+            table_full.strip(),
+            columns,
+            pk=options.get("pk"),
+            updated_at=options.get("updated_at"),
+            deleted=options.get("deleted"),
+        )
+
+    @property
+    def select_columns(self) -> List[str]:
+        columns = [self.content_column, *self.metadata_columns]
+        for extra in (self.pk, self.updated_at, self.deleted):
+            if extra and extra not in columns:
+                columns.append(extra)
+        return columns
+
+
 class PostgresIngester(BaseIngester):
     async def load(self, source: DataSource) -> List[Document]:
+        documents: List[Document] = []
+        try:
+            async for batch in self.stream(source):
+                documents.extend(batch)
+        except Exception:
+            return []
+        return documents
+
+    async def stream(self, source: DataSource) -> AsyncGenerator[List[Document], None]:
+        """
+        Satırları sunucu taraflı cursor ile POSTGRES_INGEST_BATCH_SIZE'lık partiler halinde akıtır.
+        Tablonun tamamı hiçbir zaman belleğe alınmaz. Watermark tanımlıysa ve kaynak daha önce
+        başarıyla indekslendiyse sadece değişen satırlar okunur (artımlı mod).
+        """
         if not settings.POSTGRES_URL:
             logger.error(
                 "PostgreSQL URL is not defined.", event_name="INGEST_POSTGRES_NO_CONFIG"
             )
-            return []
+            return
 
         try:
-            table_full, columns_str = source.source_uri.split("(")
-            columns_str = columns_str.rstrip(")")
-            columns = [c.strip() for c in columns_str.split(",")]
-            content_column = columns[0]
-            metadata_columns = columns[1:]
-
-            query = (
-                f"SELECT {', '.join(columns)} FROM {table_full} WHERE tenant_id = $1"
-            )
-            logger.info(
-                "Fetching data from postgres...",
-                event_name="INGEST_POSTGRES_FETCH",
-                query=query,
-            )
-
-        except ValueError:
+            spec = PostgresSourceSpec.parse(source.source_uri)
+        except ValueError as e:
             logger.error(
                 f"Invalid source_uri format: {source.source_uri}",
                 event_name="INGEST_POSTGRES_INVALID_URI",
+                error=str(e),
             )
-            return []
+            return
 
-        conn = None
-        try:
-            conn = await asyncio.wait_for(
-                asyncpg.connect(settings.POSTGRES_URL), timeout=15
-            )
-            records = await asyncio.wait_for(
-                conn.fetch(query, source.tenant_id), timeout=60
-            )
+        query = f"SELECT {', '.join(spec.select_columns)} FROM {spec.table} WHERE tenant_id = $1"
+        args: list = [source.tenant_id]
 
-            documents = []
-            for record in records:
-                content = record[content_column]
-                metadata = {
-                    "source_uri": source.source_uri,
-                    "source_type": source.source_type,
-                    "tenant_id": source.tenant_id,
-                }
-                for col in metadata_columns:
-                    metadata[col] = record[col]
-
-                documents.append(Document(page_content=str(content), metadata=metadata))
-
-            logger.info(
-                f"Loaded {len(documents)} documents from database.",
-                event_name="INGEST_POSTGRES_SUCCESS",
-                count=len(documents),
-                table=table_full,
+        self.incremental = bool(spec.updated_at and source.last_indexed_at)
+        if self.incremental:
+            # Uzun süren yazma transaction'larının kaçırılmaması için watermark geriye kaydırılır.
+            # Tekrar okunan satırlar deterministik ID'ler sayesinde yeniden vektörleştirilmez.
+            assert source.last_indexed_at is not None
+            query += f" AND {spec.updated_at} > $2"
+            args.append(
+                source.last_indexed_at
+                - timedelta(seconds=settings.POSTGRES_INGEST_WATERMARK_OVERLAP_SECONDS)
             )
-            return documents
+            self.deleted_keys = set()
+
+        logger.info(
+            "Fetching data from postgres...",
+            event_name="INGEST_POSTGRES_FETCH",
+            query=query,
+            incremental=self.incremental,
+        )
+
+        batch_size = settings.POSTGRES_INGEST_BATCH_SIZE
+        total = 0
+        try:
+            # Cursor ve transaction her 'yield'de (pipeline backpressure'ı boyunca) açık kalır; bu
+            # yüzden bağlantı paylaşılan havuzdan alınmaz.
+            async with database.dedicated_connection(
+                settings.POSTGRES_INGEST_IDLE_IN_TRANSACTION_TIMEOUT_SECONDS
+            ) as conn:
+                # Sunucu taraflı cursor'lar yalnızca bir transaction içinde yaşar. Repeatable read ile
+                # watermark, değişen satırlar ve anti-join anahtarları aynı snapshot'tan okunur.
+                async with conn.transaction(isolation="repeatable_read", readonly=True):
+                    if spec.updated_at:
+                        self.watermark = await conn.fetchval("SELECT now()")
+
+                    cursor = await conn.cursor(query, *args)
+                    while True:
+                        records = await cursor.fetch(
+                            batch_size,
+                            timeout=settings.POSTGRES_COMMAND_TIMEOUT_SECONDS,
+                        )
+                        if not records:
+                            break
+
+                        documents = []
+                        for record in records:
+                            if spec.deleted and record[spec.deleted]:
+                                if self.deleted_keys is not None:
+                                    self.deleted_keys.add(str(record[spec.pk]))
+                                continue
+
+                            content = record[spec.content_column]
+                            metadata = {
+                                "source_uri": source.source_uri,
+                                "source_type": source.source_type,
+                                "tenant_id": source.tenant_id,
+                            }
+                            for col in spec.metadata_columns:
+                                metadata[col] = record[col]
+                            if spec.pk:
+                                metadata[DOCUMENT_KEY_FIELD] = str(record[spec.pk])
+
+                            documents.append(
+                                Document(page_content=str(content), metadata=metadata)
+                            )
+
+                        total += len(documents)
+                        if documents:
+                            yield documents
+
+                    if self.incremental and not spec.deleted:
+                        self.current_keys = await self._fetch_current_keys(
+                            conn, spec, source
+                        )
         except asyncio.TimeoutError:
             logger.error(
                 "PostgreSQL query timed out.", event_name="INGEST_POSTGRES_TIMEOUT"
             )
-            return []
+            raise
         except Exception as e:
             logger.error(
                 f"Database error: {e}",
                 event_name="INGEST_POSTGRES_ERROR",
                 exc_info=True,
             )
-            return []
-        finally:
-            if conn:
-                await conn.close()
+            raise
+
+        logger.info(
+            f"Loaded {total} documents from database.",
+            event_name="INGEST_POSTGRES_SUCCESS",
+            count=total,
+            table=spec.table,
+            incremental=self.incremental,
+            deleted_count=len(self.deleted_keys or ()),
+        )
+
+    async def _fetch_current_keys(
+        self, conn, spec: PostgresSourceSpec, source: DataSource
+    ):
+        """
+        Anti-join için tablodaki tüm anahtarları (sadece pk kolonu) aynı snapshot içinden okur.
+        """
+        keys = set()
+        cursor = await conn.cursor(
+            f"SELECT {spec.pk} FROM {spec.table} WHERE tenant_id = $1",
+            source.tenant_id,
+        )
+        while True:
+            records = await cursor.fetch(
+                settings.POSTGRES_INGEST_BATCH_SIZE * 10,
+                timeout=settings.POSTGRES_COMMAND_TIMEOUT_SECONDS,
+            )
+            if not records:
+                return keys
+            keys.update(str(record[0]) for record in records)
@@ -0,0 +1,481 @@
+# app/ingesters/web_crawler.py
+import asyncio
+import gzip
+import time
+import xml.etree.ElementTree as ET
+from typing import AsyncGenerator, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urldefrag, urlencode, urljoin, urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
+
+import structlog
+
+from .base import BaseIngester
+from .web_ingester import text_fingerprint
+from app.core import state_store
+from app.core.boilerplate import save_boilerplate_models, strip_boilerplate
+from app.core.config import settings
+from app.core.html_extract import extract_page
+from app.core.http import get_http_client
+from app.core.manifest import DOCUMENT_KEY_FIELD
+from app.core.models import Document, DataSource
+
+logger = structlog.get_logger()
+
+STATE_NAMESPACE = "web-crawl"
+_MAX_SITEMAP_FILES = 50
+_TRACKING_PARAM_PREFIXES = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid")
+_NON_HTML_EXTENSIONS = tuple(
+    ".pdf .zip .gz .tar .png .jpg .jpeg .gif .svg .webp .ico .css .js .json .xml "
+    ".mp3 .mp4 .avi .mov .woff .woff2 .ttf .exe .dmg".split()
+)
+
+
+def normalize_url(url: str, base: Optional[str] = None) -> Optional[str]:
+    """
+    URL'yi tekilleştirme için kanonik hale getirir: göreli adres çözülür, fragment ve izleme
+    parametreleri atılır, şema/host küçük harfe çevrilir, varsayılan port ve sorgu sırası normalize edilir.
+    http(s) dışındaki adresler için None döner.
+    """
+    if base:
+        url = urljoin(base, url)
+    url, _ = urldefrag(url.strip())
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https") or not parts.hostname:
+        return None
+
+    host = parts.hostname.lower()
+    if parts.port and not (
+        (scheme == "http" and parts.port == 80)
+        or (scheme == "https" and parts.port == 443)
+    ):
+        host = f"{host}:{parts.port}"
+
+    query = urlencode(
+        sorted(
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not key.lower().startswith(_TRACKING_PARAM_PREFIXES)
+        )
+    )
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+class WebCrawlSpec:
+    """
+    Tarama (crawl) modundaki 'web' kaynağının ayrıştırılmış hali:
+    * 'https://site/sitemap.xml': Sitemap'teki (ve alt sitemap'lerdeki) tüm sayfalar.
+    * 'https://site/docs/#crawl?depth=2&prefix=/docs/&max_pages=500': Kökten başlayıp bağlantıları
+      izleyerek bulunan sayfalar. Fragment sunucuya gönderilmez; sadece ayarları taşır.
+    'prefix' verilmezse bağlantı izleme başlangıç sayfasının dizini ile sınırlanır.
+    """
+
+    def __init__(
+        self,
+        start_url: str,
+        sitemap: bool,
+        prefix: str,
+        depth: int,
+        max_pages: int,
+    ):
+        self.start_url = start_url
+        self.sitemap = sitemap
+        self.prefix = prefix
+        self.depth = depth
+        self.max_pages = max_pages
+
+    @staticmethod
+    def is_crawl(source_uri: str) -> bool:
+        url, fragment = urldefrag(source_uri)
+        path = urlsplit(url).path.lower()
+        return fragment.startswith("crawl") or path.endswith((".xml", ".xml.gz"))
+
+    @classmethod
+    def parse(cls, source_uri: str) -> "WebCrawlSpec":
+        url, fragment = urldefrag(source_uri)
+        options: Dict[str, str] = {}
+        if fragment.startswith("crawl"):
+            options = dict(parse_qsl(fragment.partition("?")[2]))
+        unknown = set(options) - {"depth", "prefix", "max_pages"}
+        if unknown:
+            raise ValueError(f"Unknown crawl options: {sorted(unknown)}")
+
+        start_url = normalize_url(url)
+        if start_url is None:
+            raise ValueError(f"Invalid crawl start URL: {url}")
+
+        parts = urlsplit(start_url)
+        sitemap = parts.path.lower().endswith((".xml", ".xml.gz"))
+        default_prefix = "/" if sitemap else parts.path[: parts.path.rfind("/") + 1]
+        prefix_path = options.get("prefix") or default_prefix
+        return cls(
+            start_url,
+            sitemap=sitemap,
+            prefix=f"{parts.scheme}://{parts.netloc}{prefix_path}",
+            depth=int(options.get("depth", settings.WEB_CRAWL_MAX_DEPTH)),
+            max_pages=min(
+                int(options.get("max_pages", settings.WEB_CRAWL_MAX_PAGES)),
+                settings.WEB_CRAWL_MAX_PAGES,
+            ),
+        )
+
+    def allows(self, url: str) -> bool:
+        return url.startswith(self.prefix) and not urlsplit(url).path.lower().endswith(
+            _NON_HTML_EXTENSIONS
+        )
+
+
+class _HostGate:
+    """Bir host'a eşzamanlı istek sayısını ve ardışık istekler arası bekleme süresini sınırlar."""
+
+    def __init__(self, concurrency: int, delay: float):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.delay = delay
+        self._lock = asyncio.Lock()
+        self._next_at = 0.0
+
+    async def wait_turn(self):
+        async with self._lock:
+            now = time.monotonic()
+            if self._next_at > now:
+                await asyncio.sleep(self._next_at - now)
+            self._next_at = max(now, self._next_at) + self.delay
+
+
+class WebCrawlIngester(BaseIngester):
+    """
+    Sitemap veya bağlantı izleme ile bir sitenin sayfalarını tarar; her sayfa bir Document olur.
+    Sayfalar global ve host başına sınırlı eşzamanlılıkla, robots.txt ve bekleme sürelerine uyularak
+    indirilir. Kaynak artımlı moddadır: document_key sayfa URL'sidir, değişmeyen sayfalar (ETag /
+    metin özeti) hiç üretilmez, artık bulunamayan sayfaların noktaları anti-join ile silinir.
+    """
+
+    incremental = True
+
+    def __init__(self):
+        self.current_keys = set()
+        self._pending_state: Dict[str, dict] = {}
+        self._robots: Dict[str, Optional[RobotFileParser]] = {}
+        self._robots_lock = asyncio.Lock()
+        self._gates: Dict[str, _HostGate] = {}
+        self._disallowed: Set[str] = set()
+        self._gone: Set[str] = set()
+        self._fetched = 0
+        self._failed = 0
+        self._unchanged = 0
+        # Alt sayfaları bulunamayan (indirilemeyen ve kayıtlı bağlantısı olmayan) sayfa sayısı.
+        self._unresolved = 0
+        # Sayfa durumları (ETag, özet, bağlantılar) sadece Postgres satırıyla uyumluysa kullanılır.
+        self._state_current = False
+
+    async def load(self, source: DataSource) -> List[Document]:
+        documents: List[Document] = []
+        try:
+            async for batch in self.stream(source):
+                documents.extend(batch)
+        except Exception:
+            return []
+        return documents
+
+    async def commit(self, source: DataSource):
+        await save_boilerplate_models(self._gates)
+        if self._pending_state:
+            await asyncio.to_thread(
+                state_store.get_store().put_many, STATE_NAMESPACE, self._pending_state
+            )
+
+    async def stream(self, source: DataSource) -> AsyncGenerator[List[Document], None]:
+        spec = WebCrawlSpec.parse(source.source_uri)
+        logger.info(
+            f"Crawling web site: {spec.start_url}",
+            event_name="INGEST_WEB_CRAWL_START",
+            sitemap=spec.sitemap,
+            prefix=spec.prefix,
+            depth=spec.depth,
+            max_pages=spec.max_pages,
+        )
+        started = time.perf_counter()
+        self._state_current = await state_store.is_current(source)
+
+        frontier: asyncio.Queue = asyncio.Queue()
+        results: asyncio.Queue = asyncio.Queue(
+            maxsize=settings.WEB_CRAWL_BATCH_PAGES * 2
+        )
+        seen: Set[str] = set()
+
+        def enqueue(url: str, depth: int):
+            if url in seen or len(seen) >= spec.max_pages or not spec.allows(url):
+                return
+            seen.add(url)
+            frontier.put_nowait((url, depth))
+
+        if spec.sitemap:
+            # Sitemap okunamazsa kaynak başarısız sayılır; aksi halde tüm sayfalar silinirdi.
+            for url in await self._read_sitemaps(spec):
+                enqueue(url, spec.depth)
+        else:
+            enqueue(spec.start_url, 0)
+
+        root_error: List[Exception] = []
+
+        async def worker():
+            while True:
+                url, depth = await frontier.get()
+                try:
+                    document, links = await self._fetch_page(source, spec, url)
+                    if depth < spec.depth:
+                        for link in links:
+                            enqueue(link, depth + 1)
+                    if document is not None:
+                        await results.put(document)
+                except Exception as e:
+                    self._failed += 1
+                    logger.warn(
+                        f"Failed to crawl page: {url}",
+                        event_name="INGEST_WEB_CRAWL_PAGE_FAILED",
+                        url=url,
+                        error=str(e),
+                    )
+                    if not spec.sitemap and depth == 0:
+                        root_error.append(e)
+                    elif not spec.sitemap and depth < spec.depth:
+                        # Sayfa geçici olarak indirilemediyse alt sayfaları önceki taramada
+                        # kaydedilen bağlantılardan bulunur; aksi halde anti-join onları silerdi.
+                        stored = await self._stored_links(source, url)
+                        if stored is None:
+                            self._unresolved += 1
+                        for link in stored or []:
+                            enqueue(link, depth + 1)
+                finally:
+                    frontier.task_done()
+
+        async def finish():
+            await frontier.join()
+            await results.put(None)
+
+        tasks = [
+            asyncio.create_task(worker()) for _ in range(settings.WEB_CRAWL_CONCURRENCY)
+        ]
+        tasks.append(asyncio.create_task(finish()))
+        try:
+            batch: List[Document] = []
+            while True:
+                document = await results.get()
+                if document is None:
+                    break
+                batch.append(document)
+                if len(batch) >= settings.WEB_CRAWL_BATCH_PAGES:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if root_error:
+            # Başlangıç sayfası indirilemezse hiçbir sayfa bulunamaz; kaynak başarısız sayılır ve
+            # anti-join ile silme yapılmaz.
+            raise root_error[0]
+
+        # Bulunan her sayfa (indirilemese bile) kaynakta var sayılır; indirilemeyen sayfaların alt
+        # sayfaları kayıtlı bağlantılarından bulunur. Bağlantıları bilinmeyen bir ara sayfa
+        # indirilemediyse alt sayfaları bu taramada görülemez; silme bir sonraki taramaya kalır.
+        # robots.txt'nin yasakladığı ve 404/410 dönen sayfaların noktaları ise silinir.
+        if self._unresolved:
+            logger.warn(
+                "Skipping removal of vanished pages; some pages could not be expanded.",
+                event_name="INGEST_WEB_CRAWL_REMOVAL_SKIPPED",
+                unresolved=self._unresolved,
+            )
+            self.current_keys = None
+        else:
+            self.current_keys = seen - self._disallowed - self._gone
+        logger.info(
+            "Web site crawl finished.",
+            event_name="INGEST_WEB_CRAWL_SUCCESS",
+            discovered=len(seen),
+            fetched=self._fetched,
+            gone=len(self._gone),
+            unchanged=self._unchanged,
+            failed=self._failed,
+            duration_seconds=round(time.perf_counter() - started, 2),
+        )
+
+    async def _fetch_page(
+        self, source: DataSource, spec: WebCrawlSpec, url: str
+    ) -> Tuple[Optional[Document], List[str]]:
+        if not await self._allowed_by_robots(url):
+            self._disallowed.add(url)
+            return None, []
+
+        key = f"{source.tenant_id}|{url}"
+        previous = None
+        if self._state_current:
+            previous = await asyncio.to_thread(
+                state_store.get_store().get, STATE_NAMESPACE, key
+            )
+
+        headers = {}
+        if previous and previous.get("etag"):
+            headers["If-None-Match"] = previous["etag"]
+        if previous and previous.get("last_modified"):
+            headers["If-Modified-Since"] = previous["last_modified"]
+
+        response = await self._get(url, headers)
+        if response.status_code == 304:
+            self._unchanged += 1
+            # 304'te sayfa indirilmez; bağlantı izleme modunda alt sayfalar önceki bağlantılardan bulunur.
+            return None, (previous or {}).get("links", [])
+        if response.status_code in (404, 410):
+            self._gone.add(url)
+            return None, []
+        response.raise_for_status()
+        if "html" not in response.headers.get("content-type", "text/html"):
+            return None, []
+        self._fetched += 1
+
+        final_url = normalize_url(str(response.url)) or url
+        page = await extract_page(response.text, url, collect_links=not spec.sitemap)
+        links: List[str] = []
+        for href in page.links:
+            link = normalize_url(href, base=final_url)
+            if link and spec.allows(link):
+                links.append(link)
+        links = list(dict.fromkeys(links))
+
+        title = page.title
+        # Özet şablon temizliğinden önceki metinden alınır (bkz. WebIngester).
+        state = {
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+            "text_hash": text_fingerprint(page.text, title),
+        }
+        text = await strip_boilerplate(url, page.text)
+        if not spec.sitemap:
+            state["links"] = links
+        self._pending_state[key] = state
+
+        if previous and previous.get("text_hash") == state["text_hash"]:
+            self._unchanged += 1
+            return None, links
+        if len(text) < 50:
+            return None, links
+
+        return (
+            Document(
+                page_content=text,
+                metadata={
+                    "source_uri": source.source_uri,
+                    "source_type": source.source_type,
+                    "tenant_id": source.tenant_id,
+                    "title": title,
+                    "url": url,
+                    DOCUMENT_KEY_FIELD: url,
+                },
+            ),
+            links,
+        )
+
+    async def _stored_links(self, source: DataSource, url: str) -> Optional[List[str]]:
+        """Sayfanın son başarılı taramada kaydedilen bağlantıları; durum yoksa veya geçersizse None."""
+        if not self._state_current:
+            return None
+        previous = await asyncio.to_thread(
+            state_store.get_store().get, STATE_NAMESPACE, f"{source.tenant_id}|{url}"
+        )
+        if not previous or "links" not in previous:
+            return None
+        return previous["links"]
+
+    async def _get(self, url: str, headers: Optional[Dict[str, str]] = None):
+        host = urlsplit(url).netloc
+        gate = self._gates.get(host)
+        if gate is None:
+            # Bekleme süresi robots.txt'nin Crawl-delay değerini de içerir; gate ondan sonra kurulur.
+            robots = await self._robots_for(url)
+            delay = max(
+                settings.WEB_CRAWL_DELAY_SECONDS,
+                float(
+                    (robots.crawl_delay(settings.WEB_USER_AGENT) if robots else None)
+                    or 0
+                ),
+            )
+            gate = self._gates.setdefault(
+                host, _HostGate(settings.WEB_CRAWL_PER_HOST_CONCURRENCY, delay)
+            )
+
+        async with gate.semaphore:
+            await gate.wait_turn()
+            return await get_http_client().get(url, headers=headers or {})
+
+    async def _robots_for(self, url: str) -> Optional[RobotFileParser]:
+        parts = urlsplit(url)
+        host = parts.netloc
+        if host not in self._robots:
+            async with self._robots_lock:
+                if host not in self._robots:
+                    self._robots[host] = await self._load_robots(parts.scheme, host)
+        return self._robots[host]
+
+    async def _allowed_by_robots(self, url: str) -> bool:
+        robots = await self._robots_for(url)
+        return robots is None or robots.can_fetch(settings.WEB_USER_AGENT, url)
+
+    async def _load_robots(self, scheme: str, host: str) -> Optional[RobotFileParser]:
+        robots_url = f"{scheme}://{host}/robots.txt"
+        try:
+            response = await get_http_client().get(robots_url)
+        except Exception as e:
+            logger.warn(
+                "robots.txt could not be fetched, crawling without it.",
+                event_name="INGEST_WEB_ROBOTS_UNAVAILABLE",
+                url=robots_url,
+                error=str(e),
+            )
+            return None
+        if response.status_code >= 400:
+            return None
+
+        parser = RobotFileParser(robots_url)
+        parser.parse(response.text.splitlines())
+        return parser
+
+    async def _read_sitemaps(self, spec: WebCrawlSpec) -> List[str]:
+        pages: List[str] = []
+        pending = [spec.start_url]
+        visited: Set[str] = set()
+        while pending and len(visited) < _MAX_SITEMAP_FILES:
+            sitemap_url = pending.pop(0)
+            if sitemap_url in visited:
+                continue
+            visited.add(sitemap_url)
+
+            # Sitemap dosyaları da sayfalar gibi robots.txt kontrolünden ve host bekleme süresinden
+            # geçer. Yasaklı bir sitemap'in sayfaları bilinemeyeceği için kaynak başarısız sayılır.
+            if not await self._allowed_by_robots(sitemap_url):
+                raise RuntimeError(
+                    f"Sitemap is disallowed by robots.txt: {sitemap_url}"
+                )
+            response = await self._get(sitemap_url)
+            response.raise_for_status()
+            content = response.content
+            if content[:2] == b"\x1f\x8b":
+                content = gzip.decompress(content)
+
+            root = ET.fromstring(content)
+            locations = [
+                (element.text or "").strip()
+                for element in root.iter()
+                if element.tag.endswith("loc")
+            ]
+            for location in locations:
+                url = normalize_url(location)
+                if url is None:
+                    continue
+                if root.tag.endswith("sitemapindex"):
+                    pending.append(url)
+                else:
+                    pages.append(url)
+        return pages
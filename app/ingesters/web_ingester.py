@@ -1,60 +1,95 @@
 # app/ingesters/web_ingester.py
+import asyncio
+import hashlib
 import httpx
 import structlog
-from bs4 import BeautifulSoup, Comment
-from typing import List
+from typing import List, Optional
+from urllib.parse import urlsplit
 from .base import BaseIngester
+from app.core import state_store
+from app.core.boilerplate import save_boilerplate_models, strip_boilerplate
+from app.core.html_extract import extract_page
+from app.core.http import get_http_client
 from app.core.models import Document, DataSource
 
 logger = structlog.get_logger()
 
+STATE_NAMESPACE = "web"
+
+
+def text_fingerprint(text: str, title: Optional[str]) -> str:
+    return hashlib.sha256(f"{title or ''}\x00{text}".encode("utf-8")).hexdigest()
+
+
+def _state_key(source: DataSource) -> str:
+    return f"{source.tenant_id}|{source.source_uri}"
+
 
 class WebIngester(BaseIngester):
+    """
+    Tek bir web sayfasını indeksler. ETag / Last-Modified ile koşullu istek atar ve temizlenmiş
+    metnin özetini saklar; sayfa değişmediyse (304 veya aynı metin) hiç doküman üretmez ve
+    kaynak artımlı modda "değişiklik yok" olarak tamamlanır (chunk / embed / upsert atlanır).
+    """
+
+    def __init__(self):
+        self._pending_state: Optional[dict] = None
+
     async def load(self, source: DataSource) -> List[Document]:
         logger.info(
             f"Scraping web page: {source.source_uri}", event_name="INGEST_WEB_FETCH"
         )
         try:
-            async with httpx.AsyncClient(verify=False) as client:
-                response = await client.get(
-                    source.source_uri,
-                    follow_redirects=True,
-                    timeout=30.0,
-                    headers={"User-Agent": "SentiricBot/1.0"},
-                )
-                response.raise_for_status()
-
-            soup = BeautifulSoup(response.text, "html.parser")
-
-            for element in soup(
-                [
-                    "script",
-                    "style",
-                    "nav",
-                    "footer",
-                    "header",
-                    "aside",
-                    "iframe",
-                    "noscript",
-                    "svg",
-                    "meta",
-                    "link",
-                ]
-            ):
-                element.decompose()
+            store = state_store.get_store()
+            key = _state_key(source)
+            # Kaynak hiç indekslenmediyse, sıfırlandıysa veya son olarak başka bir pod'da
+            # indekslendiyse önceki durum yok sayılır.
+            previous = (
+                await asyncio.to_thread(store.get, STATE_NAMESPACE, key)
+                if await state_store.is_current(source)
+                else None
+            )
 
-            for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
-                comment.extract()
+            headers = {}
+            if previous and previous.get("etag"):
+                headers["If-None-Match"] = previous["etag"]
+            if previous and previous.get("last_modified"):
+                headers["If-Modified-Since"] = previous["last_modified"]
 
-            text = soup.get_text(separator="\n")
+            response = await get_http_client().get(source.source_uri, headers=headers)
+            if response.status_code == 304:
+                logger.info(
+                    "Web page not modified since last indexing.",
+                    event_name="INGEST_WEB_NOT_MODIFIED",
+                    url=source.source_uri,
+                )
+                self.incremental = True
+                return []
+            response.raise_for_status()
 
-            cleaned_lines = []
-            for line in text.splitlines():
-                stripped = line.strip()
-                if stripped:
-                    cleaned_lines.append(stripped)
+            # Ayrıştırma döngü dışında (thread / süreç havuzu) yapılır.
+            clean_text, title, _ = await extract_page(response.text, source.source_uri)
+            # Özet, site şablonu atılmadan önceki metinden alınır; şablon modeli öğrendikçe sayfa
+            # değişmiş sayılıp yeniden embed edilmez. Sayfa değişmese de modele eklenir.
+            text_hash = text_fingerprint(clean_text, title)
+            clean_text = await strip_boilerplate(source.source_uri, clean_text)
+            self._pending_state = {
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified"),
+                "text_hash": text_hash,
+            }
 
-            clean_text = "\n".join(cleaned_lines)
+            if (
+                previous
+                and previous.get("text_hash") == self._pending_state["text_hash"]
+            ):
+                logger.info(
+                    "Web page content unchanged since last indexing.",
+                    event_name="INGEST_WEB_UNCHANGED",
+                    url=source.source_uri,
+                )
+                self.incremental = True
+                return []
 
             if not clean_text or len(clean_text) < 50:
                 logger.warn(
@@ -76,7 +111,7 @@ class WebIngester(BaseIngester):
                         "source_uri": source.source_uri,
                         "source_type": source.source_type,
                         "tenant_id": source.tenant_id,
-                        "title": soup.title.string if soup.title else source.source_uri,
+                        "title": title,
                     },
                 )
             ]
@@ -94,3 +129,14 @@ class WebIngester(BaseIngester):
                 exc_info=True,
             )
             return []
+
+    async def commit(self, source: DataSource):
+        await save_boilerplate_models([urlsplit(source.source_uri).netloc])
+        if self._pending_state is None:
+            return
+        await asyncio.to_thread(
+            state_store.get_store().put,
+            STATE_NAMESPACE,
+            _state_key(source),
+            self._pending_state,
+        )
@@ -30,6 +30,7 @@ class AppState:
         self.grpc_server: Optional[grpc.aio.Server] = None
         self.grpc_task: Optional[asyncio.Task] = None
         self.worker_task: Optional[asyncio.Task] = None
+        self.loop_monitor_task: Optional[asyncio.Task] = None
 
 
 app_state = AppState()
@@ -116,6 +117,8 @@ async def lifespan(app: FastAPI):
         event_name="SYSTEM_STARTUP",
     )
 
+    app_state.loop_monitor_task = asyncio.create_task(metrics.monitor_event_loop_lag())
+
     app_state.indexing_manager = IndexingManager(app_state)
 
     # [ARCH-COMPLIANCE FIX]: Arka plan görevleri sahipsiz bırakılamaz (Strong Reference)
@@ -135,10 +138,15 @@ async def lifespan(app: FastAPI):
         app_state.grpc_task.cancel()
     if app_state.worker_task:
         app_state.worker_task.cancel()
+    if app_state.loop_monitor_task:
+        app_state.loop_monitor_task.cancel()
 
     if app_state.grpc_server:
         await app_state.grpc_server.stop(grace=5)
 
+    if app_state.indexing_manager:
+        await app_state.indexing_manager.shutdown()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -1,35 +1,79 @@
 # app/workers/indexing_worker.py
 import asyncio
 import structlog
-import asyncpg
+import time
 import uuid
 from datetime import datetime, timezone
+from pathlib import Path
 
 # [ARCH-COMPLIANCE FIX]: 'Optional' importunun olduğundan emin olun
-from typing import List, Optional
+from typing import Dict, List, Optional, Set
 
-from qdrant_client import QdrantClient, models
-from sentence_transformers import SentenceTransformer
+import numpy as np
+from qdrant_client import AsyncQdrantClient, models
 
+from app.core.collections import CollectionManager, tenant_condition
 from app.core.config import settings
 from app.core.models import DataSource
-from app.core.chunking import split_text_into_chunks
-from app.core import metrics
-from app.ingesters import ingester_factory
+from app.core.batching import build_token_budget_batches
+from app.core.embedding_cache import EmbeddingCache
+from app.core.embedding_pool import EmbeddingProcessPool
+from app.embedders import BaseEmbedder, embedder_factory, prepare_embedder
+from app.core.manifest import DOCUMENT_KEY_FIELD
+from app.core import database, dedup, metrics, state_store
+from app.core.chunk_pool import close_chunk_pool
+from app.core.html_extract import close_extract_pool
+from app.core.http import close_http_client
+from app.workers.pipeline import IndexingPipeline
+from app.workers.scheduler import DatasourceScheduler
 
 logger = structlog.get_logger()
 
-EMBEDDING_BATCH_SIZE = 32
-UPSERT_BATCH_SIZE = 100
+DELETE_BATCH_SIZE = 100
+SCROLL_BATCH_SIZE = 1000
 
 
 class IndexingManager:
     def __init__(self, app_state):
         self.app_state = app_state
-        self.model = None
-        self.qdrant_client = None
+        self._embedder: Optional[BaseEmbedder] = None
+        self._qdrant_client: Optional[AsyncQdrantClient] = None
+        self._upsert_slots = asyncio.Semaphore(settings.QDRANT_UPSERT_CONCURRENCY)
+        self.collections = CollectionManager(self)
+        self.embedding_cache: Optional[EmbeddingCache] = None
+        self.embedding_pool: Optional[EmbeddingProcessPool] = None
+        # Kiracı bazlı yakın-kopya indeksleri; ilk kullanımda durum deposundan yüklenir.
+        self.dedup_indexes: Dict[str, dedup.SimHashIndex] = {}
         self.trigger_event = asyncio.Event()
         self._is_running = False
+        self.scheduler = DatasourceScheduler()
+
+    @property
+    def embedder(self) -> BaseEmbedder:
+        """Yüklü embedding arka ucu; initialize() tamamlanmadan kullanılamaz."""
+        if self._embedder is None:
+            raise RuntimeError("Embedding model is not loaded yet.")
+        return self._embedder
+
+    @embedder.setter
+    def embedder(self, embedder: BaseEmbedder):
+        self._embedder = embedder
+
+    @property
+    def qdrant_client(self) -> AsyncQdrantClient:
+        """Qdrant istemcisi; _check_qdrant() bağlantıyı kurmadan kullanılamaz."""
+        if self._qdrant_client is None:
+            raise RuntimeError("Qdrant client is not connected yet.")
+        return self._qdrant_client
+
+    @qdrant_client.setter
+    def qdrant_client(self, client: AsyncQdrantClient):
+        self._qdrant_client = client
+
+    async def close_qdrant(self):
+        if self._qdrant_client is not None:
+            await self._qdrant_client.close()
+            self._qdrant_client = None
 
     async def initialize(self):
         # [ARCH-COMPLIANCE] Initialization Trace Context
@@ -40,16 +84,27 @@ class IndexingManager:
             logger.info(
                 f"Loading embedding model: {settings.QDRANT_DB_EMBEDDING_MODEL_NAME}",
                 event_name="MODEL_LOADING_START",
+                backend=settings.EMBEDDING_BACKEND,
             )
 
-            self.model = await asyncio.to_thread(
-                SentenceTransformer,
-                settings.QDRANT_DB_EMBEDDING_MODEL_NAME,
-                cache_folder="/app/model-cache",
-            )
+            if settings.EMBEDDING_WORKER_PROCESSES > 0:
+                # Model sadece havuzdaki süreçlerde yüklenir; ana süreç tokenizer'ı ve boyutu
+                # havuzdan alır (N+1 model bellekte tutulmaz).
+                await asyncio.to_thread(prepare_embedder)
+                self.embedding_pool = EmbeddingProcessPool(
+                    settings.EMBEDDING_WORKER_PROCESSES,
+                    start_method=settings.EMBEDDING_WORKER_START_METHOD,
+                    threads=settings.EMBEDDING_WORKER_THREADS,
+                )
+                self.embedder = await self.embedding_pool.describe()
+            else:
+                self.embedder = await asyncio.to_thread(embedder_factory)
+
+            await self._open_embedding_cache()
 
             await self._wait_for_service("Qdrant", self._check_qdrant)
             await self._wait_for_service("PostgreSQL", self._check_postgres)
+            await self.scheduler.start()
 
             logger.info(
                 "All dependencies (Vector DB, Postgres, Model) are ready.",
@@ -91,57 +146,35 @@ class IndexingManager:
                 await asyncio.sleep(delay)
 
     async def _check_qdrant(self):
-        def _sync_check():
-            client = QdrantClient(
+        if self._qdrant_client is None:
+            self._qdrant_client = AsyncQdrantClient(
                 url=settings.QDRANT_HTTP_URL,
                 api_key=settings.QDRANT_API_KEY,
-                timeout=10,
+                prefer_grpc=settings.QDRANT_PREFER_GRPC,
+                grpc_port=settings.QDRANT_GRPC_PORT,
+                timeout=settings.QDRANT_TIMEOUT_SECONDS,
             )
-            client.get_collections()
-            return client
-
-        self.qdrant_client = await asyncio.wait_for(
-            asyncio.to_thread(_sync_check), timeout=15
-        )
+        await asyncio.wait_for(self._qdrant_client.get_collections(), timeout=15)
 
     async def _check_postgres(self):
-        conn = None
-        try:
-            conn = await asyncio.wait_for(
-                asyncpg.connect(dsn=settings.POSTGRES_URL), timeout=10
-            )
+        await database.init_pool()
+        async with database.acquire() as conn:
             await conn.execute("SELECT 1")
-        finally:
-            if conn:
-                await conn.close()
 
     # HATA VEREN 1. YER: Parametre 'str = None' yerine 'Optional[str] = None' yapıldı.
     async def _get_datasources_to_index(
-        self, tenant_id: Optional[str] = None
+        self, tenant_id: Optional[str] = None, due_only: bool = True
     ) -> list[DataSource]:
         datasources = []
-        conn = None
         try:
-            conn = await asyncio.wait_for(
-                asyncpg.connect(dsn=settings.POSTGRES_URL), timeout=15
-            )
-            query = "SELECT id, tenant_id, source_type, source_uri, last_indexed_at FROM datasources WHERE is_active = TRUE"
-            args = []
-
-            if tenant_id and tenant_id != "all":
-                query += " AND tenant_id = $1"
-                args.append(tenant_id)
-
-            query += " ORDER BY last_indexed_at NULLS FIRST, updated_at ASC LIMIT 50"
-
-            records = await conn.fetch(query, *args)
-            datasources = [DataSource(**record) for record in records]
+            datasources = await self.scheduler.claim(tenant_id, due_only=due_only)
 
             if datasources:
                 logger.info(
                     f"{len(datasources)} datasources queued for indexing.",
                     event_name="DATASOURCES_QUEUED",
                     count=len(datasources),
+                    worker_id=self.scheduler.worker_id,
                 )
         # [ARCH-COMPLIANCE FIX] Kullanılmayan 'e' değişkeni loga parametre olarak aktarıldı. (Satır 143 civarı)
         except Exception as e:
@@ -151,55 +184,139 @@ class IndexingManager:
                 error=str(e),
                 exc_info=True,
             )
-        finally:
-            if conn:
-                await conn.close()
         return datasources
 
     async def _update_datasource_status(
-        self, source_id: int, status: str, update_time: bool = False
+        self,
+        source_id: int,
+        status: str,
+        update_time: bool = False,
+        indexed_at: Optional[datetime] = None,
     ):
-        conn = None
+        """
+        Durum güncellemesini zamanlayıcının write-behind tamponuna yazar.
+        'indexed_at' verilirse (ör. ingester watermark'ı) 'last_indexed_at' olarak o yazılır.
+        """
+        if update_time and indexed_at is None:
+            indexed_at = datetime.now(timezone.utc)
+        elif not update_time:
+            indexed_at = None
+        self.scheduler.update_status(source_id, status, indexed_at)
+
+    async def shutdown(self):
+        await self.scheduler.stop()
+        await database.close_pool()
+        await self.close_qdrant()
+        await close_http_client()
+        close_extract_pool()
+        close_chunk_pool()
+        state_store.close_store()
+        if self.embedding_pool:
+            self.embedding_pool.shutdown()
+        if self.embedding_cache:
+            self.embedding_cache.close()
+
+    async def _open_embedding_cache(self):
+        if not settings.EMBEDDING_CACHE_ENABLED:
+            return
+        cache_path = Path(settings.KNOWLEDGE_INDEXING_STATE_DIR) / "embeddings.sqlite3"
         try:
-            conn = await asyncio.wait_for(
-                asyncpg.connect(dsn=settings.POSTGRES_URL), timeout=10
+            self.embedding_cache = await asyncio.to_thread(
+                EmbeddingCache,
+                str(cache_path),
+                self.embedder.identity,
+                settings.EMBEDDING_CACHE_MAX_ENTRIES,
             )
-            if update_time:
-                await conn.execute(
-                    "UPDATE datasources SET last_indexed_at = $1, last_status = $2 WHERE id = $3",
-                    datetime.now(timezone.utc),
-                    status,
-                    source_id,
-                )
-            else:
-                await conn.execute(
-                    "UPDATE datasources SET last_status = $1 WHERE id = $2",
-                    status,
-                    source_id,
-                )
         except Exception as e:
-            logger.error(
-                f"Failed to update datasource status for {source_id}",
-                event_name="DB_UPDATE_ERROR",
-                source_id=source_id,
+            # Önbellek bir optimizasyondur; açılamazsa servis önbelleksiz devam eder.
+            logger.warn(
+                "Embedding cache could not be opened, continuing without it.",
+                event_name="EMBEDDING_CACHE_DISABLED",
+                path=str(cache_path),
                 error=str(e),
             )
-        finally:
-            if conn:
-                await conn.close()
-
-    async def _compute_embeddings(self, texts: List[str]) -> List[List[float]]:
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(
-            None,
-            lambda: self.model.encode(
-                texts, batch_size=EMBEDDING_BATCH_SIZE, show_progress_bar=False
-            ).tolist(),
+
+    async def _compute_embeddings(
+        self, texts: List[str], token_lengths: Optional[List[int]] = None
+    ) -> np.ndarray:
+        if self.embedding_cache is None:
+            return await self._encode(texts, token_lengths)
+
+        keys = [EmbeddingCache.key_for(text) for text in texts]
+        cached = await asyncio.to_thread(self.embedding_cache.get_many, keys)
+
+        # Aynı metin bir partide birden fazla geçiyorsa sadece bir kez encode edilir.
+        missing: dict[bytes, int] = {}
+        for i, key in enumerate(keys):
+            if key not in cached and key not in missing:
+                missing[key] = i
+
+        if missing:
+            encoded = await self._encode(
+                [texts[i] for i in missing.values()],
+                [token_lengths[i] for i in missing.values()] if token_lengths else None,
+            )
+            fresh = dict(zip(missing.keys(), encoded))
+            await asyncio.to_thread(self.embedding_cache.put_many, fresh)
+            cached.update(fresh)
+
+        vectors = np.empty((len(texts), self.embedder.dimension), dtype=np.float32)
+        for i, key in enumerate(keys):
+            vectors[i] = cached[key]
+        return vectors
+
+    async def _encode(
+        self, texts: List[str], token_lengths: Optional[List[int]] = None
+    ) -> np.ndarray:
+        """
+        Metinleri token uzunluğuna göre gruplanmış, token bütçeli partilerle encode eder ve
+        sonuçları orijinal sıraya geri yerleştirir. Süreç havuzu varsa partiler süreçlere dağıtılır.
+        Token modunda chunk aşamasında ölçülen uzunluklar verilir; metinler tekrar tokenize edilmez.
+        """
+        dimension = self.embedder.dimension
+        if not texts:
+            return np.empty((0, dimension), dtype=np.float32)
+
+        lengths: List[int]
+        if token_lengths is None:
+            lengths = await asyncio.to_thread(self.embedder.token_lengths, texts)
+        else:
+            lengths = token_lengths
+        batches = build_token_budget_batches(
+            lengths,
+            settings.EMBEDDING_MAX_TOKENS_PER_BATCH,
+            settings.EMBEDDING_MAX_BATCH_SIZE,
         )
 
+        if self.embedding_pool is not None:
+            return await self.embedding_pool.encode(texts, batches, dimension)
+        return await asyncio.to_thread(self._encode_batches, texts, batches, dimension)
+
+    async def get_dedup_index(self, tenant_id: str) -> dedup.SimHashIndex:
+        index = self.dedup_indexes.get(tenant_id)
+        if index is None:
+            loaded = await asyncio.to_thread(
+                dedup.load_index,
+                tenant_id,
+                settings.KNOWLEDGE_INDEXING_DEDUP_MAX_DISTANCE,
+            )
+            # Aynı kiracının iki işi eşzamanlı yüklemiş olabilir; ilk yerleşen kullanılır.
+            index = self.dedup_indexes.setdefault(tenant_id, loaded)
+        return index
+
+    def _encode_batches(
+        self, texts: List[str], batches: List[List[int]], dimension: int
+    ) -> np.ndarray:
+        vectors = np.empty((len(texts), dimension), dtype=np.float32)
+        for batch in batches:
+            vectors[batch] = self.embedder.encode([texts[i] for i in batch])
+        return vectors
+
     # HATA VEREN 2. YER: Parametre 'str = None' yerine 'Optional[str] = None' yapıldı.
     @metrics.INDEXING_CYCLE_DURATION_SECONDS.time()
-    async def run_indexing_cycle(self, tenant_id: Optional[str] = None):
+    async def run_indexing_cycle(
+        self, tenant_id: Optional[str] = None, due_only: bool = True
+    ):
         # [ARCH-COMPLIANCE] Ensure Cycle Context
         cycle_trace_id = str(uuid.uuid4())
         structlog.contextvars.bind_contextvars(
@@ -220,19 +337,20 @@ class IndexingManager:
         )
 
         try:
-            datasources = await self._get_datasources_to_index(tenant_id)
+            datasources = await self._get_datasources_to_index(
+                tenant_id, due_only=due_only
+            )
             if not datasources:
                 logger.info(
                     "No active datasources found.", event_name="INDEXING_CYCLE_EMPTY"
                 )
                 return
 
-            for source in datasources:
-                # [ARCH-COMPLIANCE] Strict span isolation per document source
-                structlog.contextvars.bind_contextvars(
-                    span_id=str(uuid.uuid4()), tenant_id=source.tenant_id
-                )
-                await self._process_single_datasource(source)
+            # [ARCH-COMPLIANCE] Her veri kaynağı pipeline içinde kendi span_id'si ile izole edilir.
+            try:
+                await IndexingPipeline(self).run(datasources)
+            finally:
+                await self.collections.finish_bulk_loads()
 
             metrics.LAST_INDEXING_TIMESTAMP.set_to_current_time()
             logger.info(
@@ -247,155 +365,205 @@ class IndexingManager:
                 exc_info=True,
             )
         finally:
+            await self.scheduler.flush()
             structlog.contextvars.clear_contextvars()
             self._is_running = False
 
-    async def _process_single_datasource(self, source: DataSource):
-        log = logger.bind(source_uri=source.source_uri)
-
-        try:
-            await self._update_datasource_status(source.id, "in_progress")
-            log.info("Processing datasource.", event_name="DATASOURCE_PROCESS_START")
-
-            ingester = ingester_factory(source)
-            documents = await ingester.load(source)
-            metrics.DOCUMENTS_LOADED_TOTAL.labels(
-                tenant_id=source.tenant_id, source_type=source.source_type
-            ).inc(len(documents))
-
-            if not documents:
-                log.warn("Datasource returned empty.", event_name="DATASOURCE_EMPTY")
-                await self._update_datasource_status(source.id, "empty_or_failed")
-                return
-
-            all_chunks = []
-            all_payloads = []
-
-            for doc in documents:
-                chunks = split_text_into_chunks(doc.page_content)
-                for chunk in chunks:
-                    payload = doc.metadata.copy()
-                    payload["content"] = chunk
-
-                    all_chunks.append(chunk)
-                    all_payloads.append(payload)
-
-            if not all_chunks:
-                log.warn("No chunks created.", event_name="CHUNK_GENERATION_FAILED")
-                await self._update_datasource_status(source.id, "no_chunks")
-                return
+    async def _upsert_points(
+        self,
+        collection_name: str,
+        point_ids: List[str],
+        vectors: np.ndarray,
+        payloads: List[dict],
+    ):
+        """
+        Noktaları sütunsal (columnar) 'models.Batch' olarak yazar: her parti ID listesinin,
+        vektör matrisinin (kopyasız numpy görünümü) ve payload listesinin aynı aralığıdır.
+        Ara partiler 'wait=False' ile eşzamanlı gönderilir (en fazla QDRANT_UPSERT_CONCURRENCY);
+        hepsi kabul edildikten sonra son parti 'wait=True' ile yazılır. Qdrant güncellemeleri WAL
+        sırasıyla uyguladığı için bu bariyer döndüğünde önceki partiler de uygulanmış olur.
+        """
+        batch_size = settings.QDRANT_UPSERT_BATCH_SIZE
+        starts = list(range(0, len(point_ids), batch_size))
+        if not starts:
+            return
 
-            log.info(
-                f"Vectorizing {len(all_chunks)} chunks...",
-                event_name="VECTORIZATION_START",
-                chunk_count=len(all_chunks),
+        async def _upsert(start: int, wait: bool):
+            end = min(start + batch_size, len(point_ids))
+            # Vektörler zaten float32 matris olarak doğrulanmıştır; pydantic'in her float'ı tek tek
+            # doğrulaması atlanır. Python listesine dönüşüm sadece bu partinin dilimi için yapılır.
+            batch = models.Batch.model_construct(
+                ids=point_ids[start:end],
+                vectors=vectors[start:end].tolist(),
+                payloads=payloads[start:end],
             )
-            vectors = await self._compute_embeddings(all_chunks)
-
-            collection_name = (
-                f"{settings.QDRANT_DB_COLLECTION_PREFIX}{source.tenant_id}"
+            async with self._upsert_slots:
+                metrics.QDRANT_UPSERTS_IN_FLIGHT.inc()
+                started = time.perf_counter()
+                try:
+                    await asyncio.wait_for(
+                        self.qdrant_client.upsert(
+                            collection_name=collection_name, points=batch, wait=wait
+                        ),
+                        timeout=settings.QDRANT_TIMEOUT_SECONDS,
+                    )
+                finally:
+                    metrics.QDRANT_UPSERTS_IN_FLIGHT.dec()
+                    metrics.QDRANT_UPSERT_BATCH_SECONDS.labels(
+                        wait=str(wait).lower()
+                    ).observe(time.perf_counter() - started)
+
+        await asyncio.gather(*(_upsert(start, wait=False) for start in starts[:-1]))
+        await _upsert(starts[-1], wait=True)
+
+    async def _retrieve_vectors(
+        self, collection_name: str, point_ids: List[str]
+    ) -> Dict[str, np.ndarray]:
+        """Verilen noktaların vektörlerini okur; bulunamayan noktalar sonuçta yer almaz."""
+        records = await asyncio.wait_for(
+            self.qdrant_client.retrieve(
+                collection_name=collection_name,
+                ids=point_ids,
+                with_payload=False,
+                with_vectors=True,
+            ),
+            timeout=settings.QDRANT_TIMEOUT_SECONDS,
+        )
+        return {
+            str(record.id): np.asarray(record.vector, dtype=np.float32)
+            for record in records
+            if record.vector is not None
+        }
+
+    async def _retrieve_existing_ids(
+        self, collection_name: str, point_ids: List[str]
+    ) -> Set[str]:
+        """Verilen noktalardan koleksiyonda bulunanların ID'lerini (vektörsüz okuyarak) döndürür."""
+        records = await asyncio.wait_for(
+            self.qdrant_client.retrieve(
+                collection_name=collection_name,
+                ids=point_ids,
+                with_payload=False,
+                with_vectors=False,
+            ),
+            timeout=settings.QDRANT_TIMEOUT_SECONDS,
+        )
+        return {str(record.id) for record in records}
+
+    def _source_filter(
+        self, source: DataSource, document_keys: Optional[List[str]] = None
+    ) -> models.Filter:
+        conditions = [
+            models.FieldCondition(
+                key="source_uri",
+                match=models.MatchValue(value=source.source_uri),
             )
-            await self.ensure_collection_exists(collection_name)
-
-            def _sync_delete():
-                self.qdrant_client.delete(
+        ]
+        if settings.QDRANT_MULTITENANT_COLLECTION:
+            # Paylaşılan koleksiyonda farklı kiracılar aynı source_uri'ye sahip olabilir.
+            conditions.append(tenant_condition(source.tenant_id))
+        if document_keys is not None:
+            conditions.append(
+                models.FieldCondition(
+                    key=DOCUMENT_KEY_FIELD, match=models.MatchAny(any=document_keys)
+                )
+            )
+        return models.Filter(must=conditions)
+
+    async def _fetch_existing_point_ids(
+        self,
+        collection_name: str,
+        source: DataSource,
+        document_keys: Optional[List[str]] = None,
+    ) -> Set[str]:
+        """
+        Kaynağa (veya kaynağın belirli dokümanlarına) ait Qdrant'taki mevcut point ID'lerini
+        vektör ve payload olmadan toplar.
+        """
+
+        async def _scroll():
+            point_ids: Set[str] = set()
+            offset = None
+            while True:
+                records, offset = await self.qdrant_client.scroll(
                     collection_name=collection_name,
-                    points_selector=models.Filter(
-                        must=[
-                            models.FieldCondition(
-                                key="source_uri",
-                                match=models.MatchValue(value=source.source_uri),
-                            )
-                        ]
-                    ),
+                    scroll_filter=self._source_filter(source, document_keys),
+                    limit=SCROLL_BATCH_SIZE,
+                    offset=offset,
+                    with_payload=False,
+                    with_vectors=False,
                 )
-
-            await asyncio.wait_for(asyncio.to_thread(_sync_delete), timeout=15)
-
-            points = [
-                models.PointStruct(
-                    id=str(uuid.uuid4()), vector=v, payload=all_payloads[i]
+                point_ids.update(str(record.id) for record in records)
+                if offset is None:
+                    return point_ids
+
+        return await asyncio.wait_for(_scroll(), timeout=60)
+
+    async def _fetch_document_keys(
+        self, collection_name: str, source: DataSource
+    ) -> Set[str]:
+        """
+        Kaynağın Qdrant'taki tüm 'document_key' değerlerini toplar (anti-join silme tespiti için).
+        """
+
+        async def _scroll():
+            keys: Set[str] = set()
+            offset = None
+            while True:
+                records, offset = await self.qdrant_client.scroll(
+                    collection_name=collection_name,
+                    scroll_filter=self._source_filter(source),
+                    limit=SCROLL_BATCH_SIZE,
+                    offset=offset,
+                    with_payload=[DOCUMENT_KEY_FIELD],
+                    with_vectors=False,
                 )
-                for i, v in enumerate(vectors)
-            ]
-
-            total_upserted = 0
-            for i in range(0, len(points), UPSERT_BATCH_SIZE):
-                batch = points[i : i + UPSERT_BATCH_SIZE]
-
-                def _sync_upsert(b):
-                    self.qdrant_client.upsert(
-                        collection_name=collection_name, points=b, wait=True
-                    )
+                for record in records:
+                    key = (record.payload or {}).get(DOCUMENT_KEY_FIELD)
+                    if key is not None:
+                        keys.add(str(key))
+                if offset is None:
+                    return keys
 
-                await asyncio.wait_for(
-                    asyncio.to_thread(_sync_upsert, batch), timeout=30
-                )
-                total_upserted += len(batch)
-
-            metrics.VECTORS_UPSERTED_TOTAL.labels(
-                tenant_id=source.tenant_id, collection=collection_name
-            ).inc(total_upserted)
-
-            await self._update_datasource_status(source.id, "success", update_time=True)
-            metrics.DATASOURCES_PROCESSED_TOTAL.labels(
-                tenant_id=source.tenant_id,
-                source_type=source.source_type,
-                status="success",
-            ).inc()
-            log.info(
-                f"Indexing successful for {total_upserted} vectors.",
-                event_name="DATASOURCE_PROCESS_END",
-                vectors_count=total_upserted,
-            )
+        return await asyncio.wait_for(_scroll(), timeout=120)
 
-        except asyncio.TimeoutError:
-            log.error(
-                "Network timeout during indexing operation.",
-                event_name="DATASOURCE_PROCESS_TIMEOUT",
-            )
-            await self._update_datasource_status(source.id, "failed")
-        except Exception as e:
-            log.error(
-                f"Error processing datasource: {e}",
-                event_name="DATASOURCE_PROCESS_ERROR",
-                exc_info=True,
+    async def _delete_points_by_document_keys(
+        self, collection_name: str, source: DataSource, document_keys: List[str]
+    ):
+        for i in range(0, len(document_keys), DELETE_BATCH_SIZE):
+            await asyncio.wait_for(
+                self.qdrant_client.delete(
+                    collection_name=collection_name,
+                    points_selector=self._source_filter(
+                        source, document_keys[i : i + DELETE_BATCH_SIZE]
+                    ),
+                ),
+                timeout=15,
             )
-            await self._update_datasource_status(source.id, "failed")
-            metrics.DATASOURCES_PROCESSED_TOTAL.labels(
-                tenant_id=source.tenant_id,
-                source_type=source.source_type,
-                status="failed",
-            ).inc()
 
-    async def ensure_collection_exists(self, collection_name: str):
-        def _sync_ensure():
-            try:
-                self.qdrant_client.get_collection(collection_name=collection_name)
-            except Exception:
-                logger.info(
-                    f"Creating vector collection: {collection_name}",
-                    event_name="QDRANT_COLLECTION_CREATE",
-                )
-                self.qdrant_client.recreate_collection(
+    async def _delete_points_by_id(self, collection_name: str, point_ids: List[str]):
+        for i in range(0, len(point_ids), DELETE_BATCH_SIZE):
+            await asyncio.wait_for(
+                self.qdrant_client.delete(
                     collection_name=collection_name,
-                    vectors_config=models.VectorParams(
-                        size=self.model.get_sentence_embedding_dimension(),
-                        distance=models.Distance.COSINE,
+                    points_selector=models.PointIdsList(
+                        points=point_ids[i : i + DELETE_BATCH_SIZE]
                     ),
-                )
-                self.qdrant_client.create_payload_index(
-                    collection_name=collection_name,
-                    field_name="source_uri",
-                    field_schema=models.PayloadSchemaType.KEYWORD,
-                )
-                self.qdrant_client.create_payload_index(
-                    collection_name=collection_name,
-                    field_name="source_type",
-                    field_schema=models.PayloadSchemaType.KEYWORD,
-                )
+                ),
+                timeout=15,
+            )
 
-        await asyncio.wait_for(asyncio.to_thread(_sync_ensure), timeout=15)
+    async def _delete_source_points(self, collection_name: str, source: DataSource):
+        await asyncio.wait_for(
+            self.qdrant_client.delete(
+                collection_name=collection_name,
+                points_selector=self._source_filter(source),
+            ),
+            timeout=15,
+        )
+
+    async def ensure_collection_exists(self, collection_name: str):
+        await self.collections.ensure(collection_name)
 
     async def start_worker_loop(self):
         try:
@@ -415,7 +583,8 @@ class IndexingManager:
                     timeout=settings.KNOWLEDGE_INDEXING_INTERVAL_SECONDS,
                 )
                 self.trigger_event.clear()
-                await self.run_indexing_cycle()
+                # Manuel tetiklemede zamanı gelmemiş kaynaklar da (kiralanmamışsa) işlenir.
+                await self.run_indexing_cycle(due_only=False)
             except asyncio.TimeoutError:
                 await self.run_indexing_cycle()
             except Exception as e:
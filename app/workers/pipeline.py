@@ -0,0 +1,709 @@
+# app/workers/pipeline.py
+import asyncio
+import time
+import uuid
+from contextlib import aclosing
+from datetime import datetime, timezone
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import numpy as np
+import structlog
+
+from app.core import dedup, metrics, state_store
+from app.core.chunk_pool import chunk_documents
+from app.core.collections import TENANT_ID_FIELD, collection_name_for
+from app.core.config import settings
+from app.core.manifest import DOCUMENT_KEY_FIELD, ChunkManifest
+from app.core.models import DataSource, Document
+from app.ingesters import BaseIngester, ingester_factory
+
+if TYPE_CHECKING:
+    from app.workers.indexing_worker import IndexingManager
+
+logger = structlog.get_logger()
+
+# Aşama işçilerini durdurmak için kuyruğa konan işaret nesnesi.
+_STOP = object()
+
+
+def _build_payloads(
+    metadatas: List[dict], texts: List[str], tenant_id: str
+) -> List[dict]:
+    payloads = []
+    for metadata, text in zip(metadatas, texts):
+        payload = metadata.copy()
+        payload["content"] = text
+        # Paylaşılan (multi-tenant) koleksiyonda kiracı ayrımı bu alan üzerinden yapılır.
+        payload[TENANT_ID_FIELD] = tenant_id
+        payloads.append(payload)
+    return payloads
+
+
+class IndexingJob:
+    """
+    Tek bir veri kaynağının pipeline boyunca taşınan durumu.
+    Bir iş birden fazla ChunkBatch üretebilir; son parti tamamlandığında iş sonuçlandırılır.
+    """
+
+    def __init__(self, source: DataSource):
+        self.source = source
+        self.span_id = str(uuid.uuid4())
+        self.log = logger.bind(source_uri=source.source_uri)
+        self.manifest = ChunkManifest(source.tenant_id, source.source_uri)
+        self.collection_name: Optional[str] = None
+        self.existing_ids: Set[str] = set()
+        self.scanned_keys: Set[str] = set()
+        self.prepared = False
+        self.ingester: Optional[BaseIngester] = None
+
+        self.pending_batches = 0
+        self.fetch_done = False
+        self.failed = False
+        self.finalized = False
+
+        self.documents_loaded = 0
+        self.chunk_count = 0
+        self.unchanged_count = 0
+        self.upserted_count = 0
+        self.deleted_count = 0
+        self.duplicate_count = 0
+
+    @property
+    def incremental(self) -> bool:
+        return bool(self.ingester and self.ingester.incremental)
+
+    @property
+    def dedup_mode(self) -> str:
+        # Artımlı kaynaklarda atlanan kopya, doküman değişmedikçe yeniden okunmaz; kanonik nokta
+        # silinirse içerik kaybolurdu. Bu kaynaklarda 'skip' yerine 'link' uygulanır.
+        mode = settings.KNOWLEDGE_INDEXING_DEDUP_MODE
+        if mode == "skip" and self.incremental:
+            return "link"
+        return mode
+
+
+class ChunkBatch:
+    """
+    Aşamalar arasında taşınan sütunsal (columnar) chunk partisi: ID listesi, float32 vektör
+    matrisi ve payload listesi aynı sırayla tutulur ve Qdrant'a 'models.Batch' olarak yazılır.
+    """
+
+    def __init__(self, job: IndexingJob, documents: List[Document]):
+        self.job = job
+        self.documents = documents
+        self.point_ids: List[str] = []
+        self.texts: List[str] = []
+        # Token modunda chunk'ların (özel token'lar dahil) uzunlukları; embedding bütçesinde kullanılır.
+        self.token_lengths: List[int] = []
+        self.payloads: List[dict] = []
+        self.vectors: Optional[np.ndarray] = None
+        # 'link' modunda partideki konum -> vektörü kopyalanacak kanonik point ID.
+        self.linked: Dict[int, str] = {}
+
+
+class IndexingPipeline:
+    """
+    fetch -> chunk -> embed -> upsert aşamalarından oluşan, sınırlı eşzamanlılıklı indeksleme hattı.
+    Aşamalar sınırlı boyutlu asyncio kuyrukları ile bağlıdır; kuyruk dolunca üretici bekler (backpressure).
+    """
+
+    def __init__(self, manager: "IndexingManager"):
+        self.manager = manager
+        queue_size = settings.KNOWLEDGE_INDEXING_QUEUE_SIZE
+        self.fetch_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.chunk_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.embed_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.upsert_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.token_limits = self._token_chunk_limits()
+
+    def _token_chunk_limits(self) -> Optional[Tuple[int, int]]:
+        """
+        'tokens' modunda (chunk başına token, özel token sayısı) döndürür. Chunk boyu modelin
+        max_seq_length'inden özel token'lar çıkarılarak bulunur; böylece hiçbir chunk kırpılmaz.
+        """
+        if settings.KNOWLEDGE_INDEXING_CHUNK_UNIT != "tokens":
+            return None
+
+        tokenizer = self.manager.embedder.tokenizer
+        if not getattr(tokenizer, "is_fast", False):
+            logger.warn(
+                "Token chunking needs a fast tokenizer, falling back to character chunks.",
+                event_name="CHUNK_TOKENIZER_NOT_FAST",
+            )
+            return None
+
+        specials = tokenizer.num_special_tokens_to_add()
+        max_tokens = self.manager.embedder.max_seq_length - specials
+        if settings.KNOWLEDGE_INDEXING_CHUNK_TOKENS > 0:
+            max_tokens = min(max_tokens, settings.KNOWLEDGE_INDEXING_CHUNK_TOKENS)
+        return max_tokens, specials
+
+    async def run(self, sources: List[DataSource]):
+        stages: List[
+            Tuple[str, asyncio.Queue, int, Callable[[Any], Awaitable[None]]]
+        ] = [
+            (
+                "fetch",
+                self.fetch_queue,
+                settings.KNOWLEDGE_INDEXING_FETCH_WORKERS,
+                self._fetch,
+            ),
+            (
+                "chunk",
+                self.chunk_queue,
+                settings.KNOWLEDGE_INDEXING_CHUNK_WORKERS,
+                self._chunk,
+            ),
+            (
+                "embed",
+                self.embed_queue,
+                settings.KNOWLEDGE_INDEXING_EMBED_WORKERS,
+                self._embed,
+            ),
+            (
+                "upsert",
+                self.upsert_queue,
+                settings.KNOWLEDGE_INDEXING_UPSERT_WORKERS,
+                self._upsert,
+            ),
+        ]
+
+        workers = [
+            [
+                asyncio.create_task(self._stage_worker(name, queue, handler))
+                for _ in range(max(1, count))
+            ]
+            for name, queue, count, handler in stages
+        ]
+
+        try:
+            for source in sources:
+                await self.fetch_queue.put(IndexingJob(source))
+
+            # Aşamalar sırayla kapatılır; bir aşama bitmeden sonrakine STOP gönderilmez.
+            for (_, queue, _, _), stage_workers in zip(stages, workers):
+                for _ in stage_workers:
+                    await queue.put(_STOP)
+                await asyncio.gather(*stage_workers)
+        finally:
+            for stage_workers in workers:
+                for task in stage_workers:
+                    task.cancel()
+
+    async def _stage_worker(
+        self,
+        stage: str,
+        queue: asyncio.Queue,
+        handler: Callable[[Any], Awaitable[None]],
+    ):
+        while True:
+            item = await queue.get()
+            if item is _STOP:
+                return
+
+            job = item if isinstance(item, IndexingJob) else item.job
+            structlog.contextvars.bind_contextvars(
+                span_id=job.span_id, tenant_id=job.source.tenant_id
+            )
+
+            started = time.perf_counter()
+            try:
+                await handler(item)
+            except Exception as e:
+                self._fail(job, e)
+                if isinstance(item, ChunkBatch):
+                    await self._complete_batch(item)
+                else:
+                    job.fetch_done = True
+                    await self._maybe_finalize(job)
+            finally:
+                metrics.PIPELINE_STAGE_DURATION_SECONDS.labels(stage=stage).observe(
+                    time.perf_counter() - started
+                )
+
+    # --- Aşamalar ---
+
+    async def _fetch(self, job: IndexingJob):
+        source = job.source
+        await self.manager._update_datasource_status(source.id, "in_progress")
+        job.log.info("Processing datasource.", event_name="DATASOURCE_PROCESS_START")
+
+        ingester = job.ingester = ingester_factory(source)
+        # Partiler geldikçe chunk kuyruğuna aktarılır; kuyruk doluysa akış (ve cursor) bekler.
+        # aclosing: akış yarıda bırakılırsa bağlantı / cursor GC beklenmeden hemen kapatılır.
+        async with aclosing(ingester.stream(source)) as stream:
+            async for documents in stream:
+                if job.failed:
+                    # Sonraki bir aşama hata aldıysa kaynağın geri kalanını okumanın anlamı yok.
+                    break
+                if not documents:
+                    continue
+                job.documents_loaded += len(documents)
+                metrics.DOCUMENTS_LOADED_TOTAL.labels(
+                    tenant_id=source.tenant_id, source_type=source.source_type
+                ).inc(len(documents))
+
+                await self._prepare(job)
+                job.pending_batches += 1
+                await self.chunk_queue.put(ChunkBatch(job, documents))
+
+        job.fetch_done = True
+        await self._maybe_finalize(job)
+
+    async def _prepare(self, job: IndexingJob):
+        """
+        Koleksiyonu hazırlar ve diff için kaynağın mevcut point ID'lerini okur.
+        """
+        if job.prepared:
+            return
+
+        source = job.source
+        job.collection_name = collection_name_for(source.tenant_id)
+        await self.manager.ensure_collection_exists(job.collection_name)
+
+        if job.incremental:
+            # Artımlı modda mevcut ID'ler parti bazında, sadece gelen dokümanlar için okunur.
+            pass
+        elif settings.KNOWLEDGE_INDEXING_DIFF_MODE:
+            job.existing_ids = await self.manager._fetch_existing_point_ids(
+                job.collection_name, source
+            )
+        else:
+            # Diff kapalıysa eski davranış: kaynağın tüm noktaları silinip baştan yazılır.
+            await self.manager._delete_source_points(job.collection_name, source)
+            await self._forget_duplicates(job, source_uri=source.source_uri)
+
+        job.prepared = True
+
+    async def _chunk(self, batch: ChunkBatch):
+        job = batch.job
+        if job.failed:
+            await self._complete_batch(batch)
+            return
+
+        if job.incremental:
+            await self._load_existing_for_batch(batch)
+
+        # Chunk'lama ve özetler döngü dışında hesaplanır; burada sadece ucuz manifest işi kalır.
+        chunked = await chunk_documents(
+            batch.documents, self.token_limits, self.manager.embedder.tokenizer
+        )
+        metadatas = []
+        for doc, chunks in zip(batch.documents, chunked):
+            for chunk, token_length, content_hash in chunks:
+                job.chunk_count += 1
+                point_id = job.manifest.add_hashed(content_hash)
+                if point_id in job.existing_ids:
+                    job.unchanged_count += 1
+                    continue
+
+                batch.point_ids.append(point_id)
+                batch.texts.append(chunk)
+                metadatas.append(doc.metadata)
+                if token_length is not None:
+                    batch.token_lengths.append(token_length)
+
+        if batch.texts and settings.KNOWLEDGE_INDEXING_DEDUP_MODE != "off":
+            metadatas = await self._deduplicate(batch, metadatas)
+
+        if batch.texts:
+            batch.payloads = await asyncio.to_thread(
+                _build_payloads, metadatas, batch.texts, job.source.tenant_id
+            )
+
+        # Dokümanlar artık gerekmiyor; kuyrukta bekleyen partinin belleği küçülür.
+        batch.documents = []
+
+        if not batch.texts:
+            await self._complete_batch(batch)
+            return
+
+        job.log.info(
+            f"Vectorizing {len(batch.texts)} chunks...",
+            event_name="VECTORIZATION_START",
+            chunk_count=len(batch.texts),
+        )
+        await self.embed_queue.put(batch)
+
+    async def _deduplicate(
+        self, batch: ChunkBatch, metadatas: List[dict]
+    ) -> List[dict]:
+        """
+        Partideki yeni chunk'ları kiracının SimHash indeksine karşı kontrol eder. Kopyalar 'skip'
+        modunda partiden çıkarılır, 'link' modunda (ve artımlı kaynaklarda) kanonik noktaya
+        bağlanır. Kopya olmayanlar iş başarıyla bitene kadar bekleyen (owner = span_id) kayıt
+        olarak indekse eklenir.
+        """
+        job = batch.job
+        source = job.source
+        mode = job.dedup_mode
+        index = await self.manager.get_dedup_index(source.tenant_id)
+        fingerprints = await asyncio.to_thread(
+            dedup.simhash_many, batch.texts, settings.KNOWLEDGE_INDEXING_DEDUP_MIN_WORDS
+        )
+
+        # 'skip' modunda aynı işin bekleyen chunk'ları da kanonik olabilir (iş ya bütün olarak
+        # yazılır ya da başarısız sayılır); 'link' modunda vektörü Qdrant'ta olan kayıtlar gerekir.
+        owner = job.span_id if mode == "skip" else None
+        if mode == "skip":
+            await self._verify_canonicals(job, index, fingerprints, metadatas)
+        kept: List[int] = []
+        kept_metadatas: List[dict] = []
+        for i, (fingerprint, metadata) in enumerate(zip(fingerprints, metadatas)):
+            if fingerprint is not None:
+                document_key = str(metadata.get(DOCUMENT_KEY_FIELD, ""))
+                canonical = index.find(
+                    fingerprint, source.source_uri, document_key, owner
+                )
+                if canonical is None:
+                    index.add(
+                        batch.point_ids[i],
+                        dedup.DedupEntry(
+                            fingerprint, source.source_uri, document_key, job.span_id
+                        ),
+                    )
+                else:
+                    job.duplicate_count += 1
+                    if mode == "skip":
+                        continue
+                    batch.linked[len(kept)] = canonical
+                    metadata = {**metadata, dedup.DUPLICATE_OF_FIELD: canonical}
+            kept.append(i)
+            kept_metadatas.append(metadata)
+
+        if len(kept) < len(batch.point_ids):
+            batch.point_ids = [batch.point_ids[i] for i in kept]
+            batch.texts = [batch.texts[i] for i in kept]
+            if batch.token_lengths:
+                batch.token_lengths = [batch.token_lengths[i] for i in kept]
+        return kept_metadatas
+
+    async def _verify_canonicals(
+        self,
+        job: IndexingJob,
+        index: dedup.SimHashIndex,
+        fingerprints: List[Optional[int]],
+        metadatas: List[dict],
+    ):
+        """
+        'skip' modunda atlamaya dayanak olacak kalıcı kanonik noktaların Qdrant'ta hâlâ durduğunu
+        doğrular. İndeks pod'a özeldir; kanonik nokta başka bir pod'da veya elle silinmiş olabilir.
+        Bulunamayan kayıtlar indeksten çıkarılır; chunk bir sonraki adayla eşleşir ya da embed edilir.
+        """
+        source = job.source
+        assert job.collection_name is not None
+        verified: Set[str] = set()
+        while True:
+            candidates: Set[str] = set()
+            for fingerprint, metadata in zip(fingerprints, metadatas):
+                if fingerprint is None:
+                    continue
+                document_key = str(metadata.get(DOCUMENT_KEY_FIELD, ""))
+                canonical = index.find(
+                    fingerprint, source.source_uri, document_key, job.span_id
+                )
+                if canonical is not None:
+                    candidates.add(canonical)
+            unverified = sorted(set(index.committed(candidates)) - verified)
+            if not unverified:
+                return
+            existing = await self.manager._retrieve_existing_ids(
+                job.collection_name, unverified
+            )
+            verified |= existing
+            missing = [point_id for point_id in unverified if point_id not in existing]
+            if not missing:
+                return
+            await self._forget_duplicates(job, point_ids=missing)
+
+    async def _load_existing_for_batch(self, batch: ChunkBatch):
+        """
+        Artımlı modda partideki dokümanların (document_key) Qdrant'taki mevcut noktalarını okur.
+        """
+        job = batch.job
+        keys = {
+            str(doc.metadata[DOCUMENT_KEY_FIELD])
+            for doc in batch.documents
+            if DOCUMENT_KEY_FIELD in doc.metadata
+        }
+        new_keys = sorted(keys - job.scanned_keys)
+        if not new_keys:
+            return
+
+        assert job.collection_name is not None
+        job.existing_ids |= await self.manager._fetch_existing_point_ids(
+            job.collection_name, job.source, document_keys=new_keys
+        )
+        job.scanned_keys.update(new_keys)
+
+    async def _embed(self, batch: ChunkBatch):
+        if batch.job.failed:
+            await self._complete_batch(batch)
+            return
+
+        if batch.linked:
+            batch.vectors = await self._embed_linked(batch)
+        else:
+            batch.vectors = await self.manager._compute_embeddings(
+                batch.texts, batch.token_lengths or None
+            )
+        # Metinler payload'larda ('content') zaten tutuluyor; ayrı liste upsert'e taşınmaz.
+        batch.texts = []
+        batch.token_lengths = []
+        await self.upsert_queue.put(batch)
+
+    async def _embed_linked(self, batch: ChunkBatch) -> np.ndarray:
+        """
+        Bağlı chunk'ların vektörleri kanonik noktalardan kopyalanır, sadece geri kalanlar encode
+        edilir. Kanonik nokta bu arada silinmişse chunk normal şekilde encode edilir.
+        """
+        job = batch.job
+        assert job.collection_name is not None
+        canonicals = await self.manager._retrieve_vectors(
+            job.collection_name, sorted(set(batch.linked.values()))
+        )
+        missing = set(batch.linked.values()) - canonicals.keys()
+        if missing:
+            await self._forget_duplicates(job, point_ids=sorted(missing))
+
+        vectors = np.empty(
+            (len(batch.texts), self.manager.embedder.dimension), dtype=np.float32
+        )
+        positions = []
+        for i in range(len(batch.texts)):
+            canonical = batch.linked.get(i)
+            if canonical in canonicals:
+                vectors[i] = canonicals[canonical]
+                continue
+            if canonical is not None:
+                job.duplicate_count -= 1
+                batch.payloads[i].pop(dedup.DUPLICATE_OF_FIELD, None)
+            positions.append(i)
+
+        if positions:
+            vectors[positions] = await self.manager._compute_embeddings(
+                [batch.texts[i] for i in positions],
+                [batch.token_lengths[i] for i in positions]
+                if batch.token_lengths
+                else None,
+            )
+        return vectors
+
+    async def _upsert(self, batch: ChunkBatch):
+        job = batch.job
+        if not job.failed:
+            assert job.collection_name is not None and batch.vectors is not None
+            await self.manager._upsert_points(
+                job.collection_name, batch.point_ids, batch.vectors, batch.payloads
+            )
+            job.upserted_count += len(batch.point_ids)
+
+        await self._complete_batch(batch)
+
+    # --- İş yaşam döngüsü ---
+
+    async def _complete_batch(self, batch: ChunkBatch):
+        job = batch.job
+        job.pending_batches -= 1
+        await self._maybe_finalize(job)
+
+    async def _maybe_finalize(self, job: IndexingJob):
+        if job.finalized or not job.fetch_done or job.pending_batches > 0:
+            return
+        job.finalized = True
+
+        try:
+            await self._finalize(job)
+        except Exception as e:
+            self._fail(job, e)
+            await self._record_failure(job)
+
+    async def _finalize(self, job: IndexingJob):
+        source = job.source
+
+        if job.failed:
+            await self._record_failure(job)
+            return
+
+        # Artımlı modda boş akış "değişiklik yok" demektir; boş/başarısız sayılmaz.
+        if not job.incremental:
+            if job.documents_loaded == 0:
+                job.log.warn(
+                    "Datasource returned empty.", event_name="DATASOURCE_EMPTY"
+                )
+                await self.manager._update_datasource_status(
+                    source.id, "empty_or_failed"
+                )
+                return
+
+            if job.chunk_count == 0:
+                job.log.warn("No chunks created.", event_name="CHUNK_GENERATION_FAILED")
+                await self.manager._update_datasource_status(source.id, "no_chunks")
+                return
+
+        await self._prepare(job)
+        assert job.collection_name is not None
+
+        # [ARCH-COMPLIANCE] Silme işlemi upsert'ten SONRA yapılır; arada boşluk (gap) oluşmaz.
+        vanished_ids = job.manifest.vanished(job.existing_ids)
+        if vanished_ids:
+            await self.manager._delete_points_by_id(
+                job.collection_name, list(vanished_ids)
+            )
+            job.deleted_count += len(vanished_ids)
+
+        removed_keys: Set[str] = set()
+        if job.incremental:
+            removed_keys = await self._delete_removed_documents(job)
+
+        if settings.KNOWLEDGE_INDEXING_DEDUP_MODE != "off":
+            await self._commit_duplicates(job, vanished_ids, removed_keys)
+
+        if job.duplicate_count:
+            metrics.CHUNKS_DEDUPLICATED_TOTAL.labels(
+                tenant_id=source.tenant_id,
+                source_type=source.source_type,
+                mode=job.dedup_mode,
+            ).inc(job.duplicate_count)
+        if job.deleted_count:
+            metrics.VECTORS_DELETED_TOTAL.labels(
+                tenant_id=source.tenant_id, collection=job.collection_name
+            ).inc(job.deleted_count)
+        metrics.CHUNKS_UNCHANGED_TOTAL.labels(
+            tenant_id=source.tenant_id, source_type=source.source_type
+        ).inc(job.unchanged_count)
+        metrics.VECTORS_UPSERTED_TOTAL.labels(
+            tenant_id=source.tenant_id, collection=job.collection_name
+        ).inc(job.upserted_count)
+
+        assert job.ingester is not None
+        indexed_at = job.ingester.watermark or datetime.now(timezone.utc)
+        await self.manager._update_datasource_status(
+            source.id, "success", update_time=True, indexed_at=indexed_at
+        )
+        try:
+            await job.ingester.commit(source)
+            await state_store.mark_indexed(source, indexed_at)
+        except Exception as e:
+            # Durum yazılamazsa kaynak bir sonraki döngüde sadece yeniden işlenir.
+            job.log.warn(
+                "Failed to persist ingester state.",
+                event_name="INGEST_STATE_COMMIT_FAILED",
+                error=str(e),
+            )
+        metrics.DATASOURCES_PROCESSED_TOTAL.labels(
+            tenant_id=source.tenant_id,
+            source_type=source.source_type,
+            status="success",
+        ).inc()
+        job.log.info(
+            f"Indexing successful for {job.upserted_count} vectors.",
+            event_name="DATASOURCE_PROCESS_END",
+            vectors_count=job.upserted_count,
+            unchanged_chunk_count=job.unchanged_count,
+            deleted_vector_count=job.deleted_count,
+            duplicate_chunk_count=job.duplicate_count,
+            incremental=job.incremental,
+        )
+
+    async def _commit_duplicates(
+        self, job: IndexingJob, vanished_ids: Set[str], removed_keys: Set[str]
+    ):
+        """
+        Silinen noktaların ve dokümanların kayıtlarını indeksten çıkarır, işin bekleyen kayıtlarını
+        kanonik yapıp durum deposuna yazar.
+        """
+        index = await self.manager.get_dedup_index(job.source.tenant_id)
+        forgotten = index.remove(vanished_ids)
+        if removed_keys:
+            forgotten += index.remove_documents(job.source.source_uri, removed_keys)
+        committed = index.commit(job.span_id)
+        await asyncio.to_thread(dedup.forget_entries, job.source.tenant_id, forgotten)
+        await asyncio.to_thread(dedup.persist_entries, job.source.tenant_id, committed)
+
+    async def _forget_duplicates(
+        self,
+        job: IndexingJob,
+        point_ids: Optional[List[str]] = None,
+        source_uri: Optional[str] = None,
+    ):
+        """Qdrant'ta artık bulunmayan noktaların (veya kaynağın tüm) kayıtlarını siler."""
+        if settings.KNOWLEDGE_INDEXING_DEDUP_MODE == "off":
+            return
+        index = await self.manager.get_dedup_index(job.source.tenant_id)
+        if source_uri is not None:
+            forgotten = index.remove_documents(source_uri)
+        else:
+            forgotten = index.remove(point_ids or [])
+        await asyncio.to_thread(dedup.forget_entries, job.source.tenant_id, forgotten)
+
+    async def _delete_removed_documents(self, job: IndexingJob) -> Set[str]:
+        """
+        Artımlı modda kaynaktan silinen dokümanların noktalarını document_key ile siler.
+        Tombstone ile bildirilen anahtarlar doğrudan, anti-join için ise kaynakta artık
+        bulunmayan anahtarlar Qdrant'taki anahtar kümesiyle karşılaştırılarak bulunur.
+        """
+        ingester = job.ingester
+        assert ingester is not None and job.collection_name is not None
+
+        removed_keys = set(ingester.deleted_keys or ())
+        if ingester.current_keys is not None:
+            indexed_keys = await self.manager._fetch_document_keys(
+                job.collection_name, job.source
+            )
+            removed_keys |= indexed_keys - ingester.current_keys
+
+        if not removed_keys:
+            return removed_keys
+
+        await self.manager._delete_points_by_document_keys(
+            job.collection_name, job.source, sorted(removed_keys)
+        )
+        job.log.info(
+            f"Removed vectors of {len(removed_keys)} deleted documents.",
+            event_name="DATASOURCE_DOCUMENTS_REMOVED",
+            document_count=len(removed_keys),
+        )
+        return removed_keys
+
+    def _fail(self, job: IndexingJob, error: Exception):
+        if job.failed:
+            return
+        job.failed = True
+        if job.collection_name:
+            # Koleksiyon silinmiş / değişmiş olabilir; bir sonraki kullanımda yeniden doğrulanır.
+            self.manager.collections.invalidate(job.collection_name)
+
+        if isinstance(error, asyncio.TimeoutError):
+            job.log.error(
+                "Network timeout during indexing operation.",
+                event_name="DATASOURCE_PROCESS_TIMEOUT",
+            )
+        else:
+            job.log.error(
+                f"Error processing datasource: {error}",
+                event_name="DATASOURCE_PROCESS_ERROR",
+                exc_info=True,
+            )
+
+    async def _record_failure(self, job: IndexingJob):
+        source = job.source
+        index = self.manager.dedup_indexes.get(source.tenant_id)
+        if index is not None:
+            index.discard(job.span_id)
+        await self.manager._update_datasource_status(source.id, "failed")
+        metrics.DATASOURCES_PROCESSED_TOTAL.labels(
+            tenant_id=source.tenant_id,
+            source_type=source.source_type,
+            status="failed",
+        ).inc()
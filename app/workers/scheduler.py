@@ -0,0 +1,257 @@
+# app/workers/scheduler.py
+import asyncio
+import os
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+import structlog
+
+from app.core import database, metrics
+from app.core.config import settings
+from app.core.models import DataSource
+
+logger = structlog.get_logger()
+
+_DATASOURCE_COLUMNS = "id, tenant_id, source_type, source_uri, last_indexed_at"
+
+
+class DatasourceScheduler:
+    """
+    Veri kaynaklarını kiralama (lease) ile talep eden ve durumlarını toplu yazan zamanlayıcı.
+    Birden fazla indeksleme pod'u aynı Postgres'e karşı çalışabilir: her pod 'FOR UPDATE SKIP LOCKED'
+    ile sadece kimsenin kiralamadığı (veya kirası dolmuş) kaynakları alır, işlerken kirayı uzatır
+    (heartbeat) ve iş bitince bırakır. Çöken bir pod'un kaynakları kira süresi dolunca yeniden alınır.
+    """
+
+    def __init__(self):
+        self.worker_id = f"{settings.NODE_NAME}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.leasing_enabled = settings.KNOWLEDGE_INDEXING_LEASING_ENABLED
+        self._leased_ids: Set[int] = set()
+        self._pending: Dict[int, Tuple[str, Optional[datetime], bool]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self.leasing_enabled:
+            await self._check_lease_columns()
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+
+    async def stop(self):
+        for task in (self._flush_task, self._heartbeat_task):
+            if task:
+                task.cancel()
+        await self.flush()
+        await self._release_all()
+
+    async def _check_lease_columns(self):
+        """
+        Kira kolonları 'migrations/0001_datasource_leases.sql' ile gelir; servis şemayı değiştirmez.
+        Kolonlar yoksa kirasız çalışmaya düşülmez (birden fazla pod aynı kaynakları işlerdi),
+        açılış başarısız olur.
+        """
+        async with database.acquire() as conn:
+            existing = await conn.fetch(
+                "SELECT column_name FROM information_schema.columns "
+                "WHERE table_name = 'datasources' AND column_name = ANY($1::text[])",
+                ["lease_owner", "lease_expires_at"],
+            )
+        missing = {"lease_owner", "lease_expires_at"} - {
+            record["column_name"] for record in existing
+        }
+        if missing:
+            logger.error(
+                "Datasource lease columns are missing; run 'python manage.py migrate-db'.",
+                event_name="DATASOURCE_LEASING_SCHEMA_MISSING",
+                missing_columns=sorted(missing),
+            )
+            raise RuntimeError(
+                f"datasources table is missing lease columns: {sorted(missing)}"
+            )
+        logger.info(
+            "Datasource leasing enabled.",
+            event_name="DATASOURCE_LEASING_ENABLED",
+            worker_id=self.worker_id,
+        )
+
+    async def claim(
+        self, tenant_id: Optional[str] = None, due_only: bool = True
+    ) -> List[DataSource]:
+        """
+        İndekslenecek kaynakları atomik olarak talep eder. 'due_only' ise son başarılı indekslemesi
+        KNOWLEDGE_INDEXING_INTERVAL_SECONDS'tan eski olmayan kaynaklar atlanır.
+        """
+        conditions = ["is_active = TRUE"]
+        args: list = []
+
+        if tenant_id and tenant_id != "all":
+            args.append(tenant_id)
+            conditions.append(f"tenant_id = ${len(args)}")
+
+        if due_only:
+            args.append(float(settings.KNOWLEDGE_INDEXING_INTERVAL_SECONDS))
+            conditions.append(
+                f"(last_indexed_at IS NULL OR last_indexed_at < now() - make_interval(secs => ${len(args)}))"
+            )
+
+        args.append(settings.KNOWLEDGE_INDEXING_CLAIM_LIMIT)
+        limit_param = f"${len(args)}"
+        order_by = "ORDER BY last_indexed_at NULLS FIRST, updated_at ASC"
+
+        if self.leasing_enabled:
+            conditions.append("(lease_expires_at IS NULL OR lease_expires_at < now())")
+            args.extend(
+                [self.worker_id, float(settings.KNOWLEDGE_INDEXING_LEASE_SECONDS)]
+            )
+            query = (
+                f"WITH due AS (SELECT id FROM datasources WHERE {' AND '.join(conditions)} "
+                f"{order_by} LIMIT {limit_param} FOR UPDATE SKIP LOCKED) "
+                f"UPDATE datasources d SET lease_owner = ${len(args) - 1}, "
+                f"lease_expires_at = now() + make_interval(secs => ${len(args)}) "
+                f"FROM due WHERE d.id = due.id "
+                f"RETURNING {', '.join('d.' + c for c in _DATASOURCE_COLUMNS.split(', '))}"
+            )
+        else:
+            query = (
+                f"SELECT {_DATASOURCE_COLUMNS} FROM datasources "
+                f"WHERE {' AND '.join(conditions)} {order_by} LIMIT {limit_param}"
+            )
+
+        async with database.acquire() as conn:
+            records = await conn.fetch(query, *args)
+
+        datasources = [DataSource(**record) for record in records]
+        # UPDATE ... RETURNING sırayı korumaz; en eski indekslenen önce işlenir.
+        datasources.sort(
+            key=lambda ds: (ds.last_indexed_at is not None, ds.last_indexed_at or 0)
+        )
+
+        if self.leasing_enabled:
+            self._leased_ids.update(ds.id for ds in datasources)
+            metrics.DATASOURCES_CLAIMED_TOTAL.inc(len(datasources))
+        return datasources
+
+    def update_status(
+        self, source_id: int, status: str, indexed_at: Optional[datetime] = None
+    ):
+        """
+        Durum güncellemesini tampona yazar (write-behind). Aynı kaynağın ardışık güncellemeleri
+        birleştirilir. 'in_progress' dışındaki her durum işin bittiğini gösterir ve kirayı bırakır.
+        """
+        previous = self._pending.get(source_id)
+        if indexed_at is None and previous is not None:
+            indexed_at = previous[1]
+
+        release = status != "in_progress"
+        if release:
+            self._leased_ids.discard(source_id)
+        self._pending[source_id] = (status, indexed_at, release)
+
+    async def flush(self):
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, {}
+        try:
+            async with database.acquire() as conn:
+                if self.leasing_enabled:
+                    await conn.executemany(
+                        "UPDATE datasources SET last_status = $2, "
+                        "last_indexed_at = COALESCE($3, last_indexed_at), "
+                        "lease_owner = CASE WHEN $4 AND lease_owner = $5 THEN NULL ELSE lease_owner END, "
+                        "lease_expires_at = CASE WHEN $4 AND lease_owner = $5 THEN NULL ELSE lease_expires_at END "
+                        "WHERE id = $1",
+                        [
+                            (source_id, status, indexed_at, release, self.worker_id)
+                            for source_id, (
+                                status,
+                                indexed_at,
+                                release,
+                            ) in pending.items()
+                        ],
+                    )
+                else:
+                    await conn.executemany(
+                        "UPDATE datasources SET last_status = $2, "
+                        "last_indexed_at = COALESCE($3, last_indexed_at) WHERE id = $1",
+                        [
+                            (source_id, status, indexed_at)
+                            for source_id, (status, indexed_at, _) in pending.items()
+                        ],
+                    )
+            metrics.DATASOURCE_STATUS_FLUSH_SIZE.observe(len(pending))
+        except Exception as e:
+            logger.error(
+                "Failed to flush datasource statuses.",
+                event_name="DB_UPDATE_ERROR",
+                source_ids=list(pending.keys()),
+                error=str(e),
+            )
+            # Yazılamayan güncellemeler, bu arada gelen daha yenilerini ezmeden tampona geri konur.
+            for source_id, value in pending.items():
+                self._pending.setdefault(source_id, value)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(
+                settings.KNOWLEDGE_INDEXING_STATUS_FLUSH_INTERVAL_SECONDS
+            )
+            await self.flush()
+
+    async def _heartbeat_loop(self):
+        interval = max(1.0, settings.KNOWLEDGE_INDEXING_LEASE_SECONDS / 3)
+        while True:
+            await asyncio.sleep(interval)
+            if not self.leasing_enabled or not self._leased_ids:
+                continue
+            try:
+                async with database.acquire() as conn:
+                    await conn.execute(
+                        "UPDATE datasources SET lease_expires_at = now() + make_interval(secs => $2) "
+                        "WHERE lease_owner = $1 AND id = ANY($3::bigint[])",
+                        self.worker_id,
+                        float(settings.KNOWLEDGE_INDEXING_LEASE_SECONDS),
+                        list(self._leased_ids),
+                    )
+            except Exception as e:
+                logger.warn(
+                    "Failed to extend datasource leases.",
+                    event_name="DATASOURCE_LEASE_HEARTBEAT_FAILED",
+                    lease_count=len(self._leased_ids),
+                    error=str(e),
+                )
+
+    async def has_active_leases(self, worker_id: str) -> bool:
+        """
+        Verilen worker'ın süresi dolmamış kirası olup olmadığı (yani hâlâ kaynak işleyip işlemediği).
+        Kiralama kapalıyken tek pod çalışır; başka bir worker kimliği önceki (sonlanmış) süreçtir.
+        """
+        if not self.leasing_enabled:
+            return False
+        async with database.acquire() as conn:
+            return bool(
+                await conn.fetchval(
+                    "SELECT EXISTS (SELECT 1 FROM datasources "
+                    "WHERE lease_owner = $1 AND lease_expires_at > now())",
+                    worker_id,
+                )
+            )
+
+    async def _release_all(self):
+        if not self.leasing_enabled:
+            return
+        try:
+            async with database.acquire() as conn:
+                await conn.execute(
+                    "UPDATE datasources SET lease_owner = NULL, lease_expires_at = NULL "
+                    "WHERE lease_owner = $1",
+                    self.worker_id,
+                )
+            self._leased_ids.clear()
+        except Exception as e:
+            logger.warn(
+                "Failed to release datasource leases on shutdown.",
+                event_name="DATASOURCE_LEASE_RELEASE_FAILED",
+                error=str(e),
+            )
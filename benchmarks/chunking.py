@@ -0,0 +1,125 @@
+# benchmarks/chunking.py
+"""
+Önceki özyinelemeli chunker ile tek geçişli, span tabanlı chunker'ı büyük Türkçe / İngilizce
+derlemlerde karşılaştırır ve MB/s değerlerini raporlar.
+
+Kullanım:
+    python -m benchmarks.chunking --megabytes 20
+    python -m benchmarks.chunking --corpus ./dump.txt --chunk-size 512 --chunk-overlap 50
+"""
+
+import argparse
+import random
+import time
+from pathlib import Path
+
+import structlog
+
+from app.core.chunking import iter_chunk_spans, split_text_into_chunks
+from benchmarks.legacy_chunking import split_text_into_chunks_legacy
+
+logger = structlog.get_logger()
+
+TURKISH = (
+    "müşteri siparişini iptal etmek istediğinde iade süreci otomatik olarak başlar ve "
+    "ücret beş iş günü içinde kartına yansır kargo şubede bekliyorsa teslimat adresi "
+    "değiştirilebilir fatura bilgileri hesap ayarlarından güncellenir garanti kapsamındaki "
+    "ürünler için servis kaydı açılır"
+).split()
+ENGLISH = (
+    "the customer can cancel an order before it ships and the refund is issued to the "
+    "original payment method within five business days invoices can be downloaded from "
+    "the account page and warranty claims require the original receipt"
+).split()
+
+
+def make_corpus(megabytes: float, seed: int) -> str:
+    # Paragraf / satır / cümle ayırıcıları gerçek dokümanlardaki oranlara yakın karıştırılır.
+    rng = random.Random(seed)
+    target = int(megabytes * 1_000_000)
+    paragraphs = []
+    size = 0
+    while size < target:
+        words = TURKISH if rng.random() < 0.5 else ENGLISH
+        sentences = [
+            " ".join(rng.choice(words) for _ in range(rng.randint(6, 28))).capitalize()
+            + rng.choice([".", ".", ".", "?", "!"])
+            for _ in range(rng.randint(1, 8))
+        ]
+        lines = [" ".join(sentences[i : i + 3]) for i in range(0, len(sentences), 3)]
+        paragraph = "\n".join(lines)
+        paragraphs.append(paragraph)
+        size += len(paragraph.encode("utf-8")) + 2
+    return "\n\n".join(paragraphs)
+
+
+def measure(label: str, fn, text: str, repeats: int):
+    megabytes = len(text.encode("utf-8")) / 1_000_000
+    best = float("inf")
+    result = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = fn(text)
+        best = min(best, time.perf_counter() - started)
+    logger.info(
+        f"{label}: {megabytes / best:.1f} MB/s",
+        event_name="BENCHMARK_RESULT",
+        variant=label,
+        seconds=round(best, 3),
+        mb_per_second=round(megabytes / best, 2),
+        chunks=len(result),
+    )
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--corpus", help="Düz metin dosyası (verilmezse sentetik derlem)"
+    )
+    parser.add_argument("--megabytes", type=float, default=10.0)
+    parser.add_argument("--chunk-size", type=int, default=512)
+    parser.add_argument("--chunk-overlap", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    text = (
+        Path(args.corpus).read_text(encoding="utf-8")
+        if args.corpus
+        else make_corpus(args.megabytes, args.seed)
+    )
+
+    legacy, legacy_time = measure(
+        "legacy_recursive",
+        lambda t: split_text_into_chunks_legacy(t, args.chunk_size, args.chunk_overlap),
+        text,
+        args.repeats,
+    )
+    chunks, chunks_time = measure(
+        "span_strings",
+        lambda t: split_text_into_chunks(t, args.chunk_size, args.chunk_overlap),
+        text,
+        args.repeats,
+    )
+    _, spans_time = measure(
+        "span_offsets",
+        lambda t: list(iter_chunk_spans(t, args.chunk_size, args.chunk_overlap)),
+        text,
+        args.repeats,
+    )
+
+    logger.info(
+        f"Speedup: {legacy_time / chunks_time:.2f}x (offsets only: {legacy_time / spans_time:.2f}x)",
+        event_name="BENCHMARK_SUMMARY",
+        speedup=round(legacy_time / chunks_time, 2),
+        offsets_speedup=round(legacy_time / spans_time, 2),
+        legacy_mean_chars=round(sum(map(len, legacy)) / max(len(legacy), 1), 1),
+        span_mean_chars=round(sum(map(len, chunks)) / max(len(chunks), 1), 1),
+        legacy_max_chars=max(map(len, legacy), default=0),
+        span_max_chars=max(map(len, chunks), default=0),
+    )
+
+
+if __name__ == "__main__":
+    main()
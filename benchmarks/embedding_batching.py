@@ -0,0 +1,119 @@
+# benchmarks/embedding_batching.py
+"""
+Sabit boyutlu (EMBEDDING_BATCH_SIZE=32, doküman sırası) embedding ile token bütçeli,
+uzunluğa göre gruplanmış embedding'i karşılaştırır ve chunks/s değerlerini raporlar.
+
+Kullanım:
+    python -m benchmarks.embedding_batching --chunks 2000 --max-tokens 8192
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+import structlog
+from sentence_transformers import SentenceTransformer
+
+from app.core.batching import build_token_budget_batches
+
+logger = structlog.get_logger()
+
+WORDS = (
+    "müşteri sipariş iade kargo fatura ödeme hesap şifre destek ürün garanti "
+    "customer order refund shipping invoice payment account password support product warranty"
+).split()
+
+
+def make_corpus(count: int, seed: int) -> list:
+    # Gerçek chunk dağılımına benzer: çoğunluğu kısa, bir kısmı chunk_size sınırına yakın.
+    rng = random.Random(seed)
+    chunks = []
+    for _ in range(count):
+        words = rng.choice([4, 8, 16, 32, 64, 96])
+        chunks.append(" ".join(rng.choice(WORDS) for _ in range(words)))
+    return chunks
+
+
+def encode_fixed(model, texts):
+    return model.encode(texts, batch_size=32, show_progress_bar=False)
+
+
+def encode_bucketed(model, texts, max_tokens, max_batch_size):
+    lengths = [
+        len(ids)
+        for ids in model.tokenizer(
+            texts,
+            truncation=True,
+            max_length=model.max_seq_length,
+            return_attention_mask=False,
+        )["input_ids"]
+    ]
+    vectors = np.empty(
+        (len(texts), model.get_sentence_embedding_dimension()), dtype=np.float32
+    )
+    for batch in build_token_budget_batches(lengths, max_tokens, max_batch_size):
+        vectors[batch] = model.encode(
+            [texts[i] for i in batch], batch_size=len(batch), show_progress_bar=False
+        )
+    return vectors
+
+
+def measure(label, fn, texts, repeats):
+    best = float("inf")
+    result = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = fn(texts)
+        best = min(best, time.perf_counter() - started)
+    logger.info(
+        f"{label}: {len(texts) / best:.1f} chunks/s",
+        event_name="BENCHMARK_RESULT",
+        variant=label,
+        seconds=round(best, 3),
+        chunks_per_second=round(len(texts) / best, 1),
+    )
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--model",
+        default="sentence-transformers/paraphrase-multilingual-mpnet-base-v2",
+    )
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--max-tokens", type=int, default=8192)
+    parser.add_argument("--max-batch-size", type=int, default=128)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    model = SentenceTransformer(args.model)
+    texts = make_corpus(args.chunks, args.seed)
+    encode_fixed(model, texts[:64])  # ısınma
+
+    fixed, fixed_time = measure(
+        "fixed_batch_32", lambda t: encode_fixed(model, t), texts, args.repeats
+    )
+    bucketed, bucketed_time = measure(
+        "token_budget",
+        lambda t: encode_bucketed(model, t, args.max_tokens, args.max_batch_size),
+        texts,
+        args.repeats,
+    )
+
+    # Sıra geri yüklemesi doğru mu? Aynı metinler aynı vektörleri üretmeli.
+    cosine = np.sum(fixed * bucketed, axis=1) / (
+        np.linalg.norm(fixed, axis=1) * np.linalg.norm(bucketed, axis=1)
+    )
+    logger.info(
+        f"Speedup: {fixed_time / bucketed_time:.2f}x",
+        event_name="BENCHMARK_SUMMARY",
+        speedup=round(fixed_time / bucketed_time, 2),
+        min_cosine=float(cosine.min()),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# benchmarks/html_extraction.py
+"""
+Kaydedilmiş HTML sayfalarından oluşan bir derlem üzerinde ayrıştırıcıları (html.parser, lxml,
+selectolax) karşılaştırır: pages/s ve html.parser çıktısına göre metin eşdeğerliği.
+--processes verilirse seçilen ayrıştırıcının süreç havuzundaki toplam verimi de ölçülür.
+
+Kullanım:
+    python -m benchmarks.html_extraction --corpus ./saved-pages --parsers html.parser lxml selectolax
+"""
+
+import argparse
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import structlog
+
+from app.core.html_extract import PARSERS, extract_html
+
+logger = structlog.get_logger()
+
+WORDS = (
+    "müşteri sipariş iade kargo fatura ödeme hesap şifre destek ürün garanti "
+    "customer order refund shipping invoice payment account password support product warranty"
+).split()
+
+
+def load_corpus(path: str) -> list:
+    files = sorted(p for p in Path(path).rglob("*") if p.suffix in (".html", ".htm"))
+    return [p.read_text(encoding="utf-8", errors="replace") for p in files]
+
+
+def make_corpus(count: int, seed: int) -> list:
+    # Derlem verilmezse: gezinme / script içeren, farklı boyutlarda sentetik sayfalar.
+    rng = random.Random(seed)
+    pages = []
+    for i in range(count):
+        nav = "".join(
+            f'<li><a href="/p/{rng.randint(0, 999)}">{rng.choice(WORDS)}</a></li>'
+            for _ in range(30)
+        )
+        body = "".join(
+            f"<p>{' '.join(rng.choice(WORDS) for _ in range(rng.randint(10, 80)))}</p>"
+            for _ in range(rng.choice([10, 50, 200, 800]))
+        )
+        pages.append(
+            f"<html><head><title>Sayfa {i}</title><script>var x = {i};</script></head>"
+            f"<body><header>Logo</header><nav><ul>{nav}</ul></nav><!-- yorum -->"
+            f"<main>{body}</main><footer>© Sentiric</footer></body></html>"
+        )
+    return pages
+
+
+def _extract_all(pages: list, parser: str) -> list:
+    return [extract_html(html, "", parser, collect_links=True) for html in pages]
+
+
+def measure(parser: str, pages: list, repeats: int):
+    best = float("inf")
+    results = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        results = _extract_all(pages, parser)
+        best = min(best, time.perf_counter() - started)
+    size_mb = sum(len(html) for html in pages) / 1_000_000
+    logger.info(
+        f"{parser}: {len(pages) / best:.1f} pages/s",
+        event_name="BENCHMARK_RESULT",
+        variant=parser,
+        seconds=round(best, 3),
+        pages_per_second=round(len(pages) / best, 1),
+        mb_per_second=round(size_mb / best, 2),
+    )
+    return results, best
+
+
+def equivalence(reference: list, candidate: list) -> dict:
+    # Satır kümeleri üzerinden Jaccard benzerliği; chunk'lara giren içerik aynı mı?
+    exact = 0
+    min_similarity = 1.0
+    total_similarity = 0.0
+    for expected, actual in zip(reference, candidate):
+        if expected.text == actual.text:
+            exact += 1
+            similarity = 1.0
+        else:
+            a, b = set(expected.text.splitlines()), set(actual.text.splitlines())
+            similarity = len(a & b) / max(len(a | b), 1)
+        min_similarity = min(min_similarity, similarity)
+        total_similarity += similarity
+    return {
+        "exact_ratio": round(exact / max(len(reference), 1), 4),
+        "mean_line_jaccard": round(total_similarity / max(len(reference), 1), 4),
+        "min_line_jaccard": round(min_similarity, 4),
+    }
+
+
+def measure_pool(parser: str, pages: list, processes: int):
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        # Isınma: süreçlerin başlaması ve modül importları ölçüme katılmaz.
+        list(
+            executor.map(
+                extract_html, pages[:processes], [""] * processes, [parser] * processes
+            )
+        )
+        started = time.perf_counter()
+        list(
+            executor.map(
+                extract_html,
+                pages,
+                [""] * len(pages),
+                [parser] * len(pages),
+                chunksize=4,
+            )
+        )
+        seconds = time.perf_counter() - started
+    logger.info(
+        f"{parser} x{processes} processes: {len(pages) / seconds:.1f} pages/s",
+        event_name="BENCHMARK_POOL_RESULT",
+        variant=parser,
+        processes=processes,
+        seconds=round(seconds, 3),
+        pages_per_second=round(len(pages) / seconds, 1),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", help="Kaydedilmiş .html dosyalarının dizini")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--parsers", nargs="+", default=list(PARSERS), choices=PARSERS)
+    parser.add_argument("--processes", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    pages = (
+        load_corpus(args.corpus) if args.corpus else make_corpus(args.pages, args.seed)
+    )
+    if not pages:
+        raise SystemExit(f"No .html files found in {args.corpus}")
+
+    reference, reference_time = measure("html.parser", pages, args.repeats)
+    for name in args.parsers:
+        if name == "html.parser":
+            continue
+        results, seconds = measure(name, pages, args.repeats)
+        logger.info(
+            f"{name} vs html.parser: {reference_time / seconds:.2f}x",
+            event_name="BENCHMARK_SUMMARY",
+            variant=name,
+            speedup=round(reference_time / seconds, 2),
+            **equivalence(reference, results),
+        )
+
+    if args.processes > 0:
+        for name in args.parsers:
+            measure_pool(name, pages, args.processes)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ import argparse
 import asyncpg
 import os
 import structlog
+from pathlib import Path
 from dotenv import load_dotenv
 
 structlog.configure(
@@ -74,6 +75,58 @@ async def trigger_indexing(host="localhost", port=17030):
     except Exception as e:
         logger.error(f"Connection error: {e}", event_name="CLI_HTTP_ERROR", exc_info=True)
 
+def check_embedding_parity(backend, quantize, corpus=None, min_cosine=0.99):
+    from app.embedders.parity import load_corpus, measure_parity
+    from app.embedders.sentence_transformer_embedder import SentenceTransformerEmbedder
+
+    model_name = os.getenv("QDRANT_DB_EMBEDDING_MODEL_NAME", "sentence-transformers/paraphrase-multilingual-mpnet-base-v2")
+    state_dir = os.getenv("KNOWLEDGE_INDEXING_STATE_DIR", "/app/index-state")
+    cache_folder = os.getenv("HF_HOME", "/app/model-cache")
+
+    reference = SentenceTransformerEmbedder(model_name, cache_folder)
+    if backend == "onnx":
+        from app.embedders.onnx_embedder import OnnxEmbedder
+        candidate = OnnxEmbedder(model_name, cache_folder, export_root=f"{state_dir}/onnx", quantize=quantize)
+    else:
+        candidate = reference
+
+    report = measure_parity(reference, candidate, load_corpus(corpus))
+    passed = report["min_cosine"] >= min_cosine
+    log = logger.info if passed else logger.error
+    log("Embedding parity report", event_name="CLI_EMBEDDING_PARITY", backend=candidate.identity, passed=passed, **report)
+    return passed
+
+async def migrate_collections(tenant_id=None, batch_size=256, drop_source=False):
+    from app.core.collections import migrate_tenant_collections
+    from app.workers.indexing_worker import IndexingManager
+
+    manager = IndexingManager(app_state=None)
+    try:
+        await manager._check_qdrant()
+        copied = await migrate_tenant_collections(manager, tenant_id, batch_size, drop_source)
+        logger.info("Collection migration finished.", event_name="CLI_COLLECTIONS_MIGRATED", collections=copied)
+    except Exception as e:
+        logger.error(f"Collection migration failed: {e}", event_name="CLI_MIGRATION_ERROR", exc_info=True)
+        raise SystemExit(1)
+    finally:
+        await manager.close_qdrant()
+
+async def migrate_db():
+    # migrations/ altındaki SQL dosyaları ad sırasıyla uygulanır; dosyalar tekrar çalıştırılabilir (IF NOT EXISTS).
+    migrations_dir = Path(__file__).resolve().parent / "migrations"
+    conn = None
+    try:
+        conn = await asyncpg.connect(DB_URL)
+        for path in sorted(migrations_dir.glob("*.sql")):
+            await conn.execute(path.read_text(encoding="utf-8"))
+            logger.info(f"Migration applied: {path.name}", event_name="CLI_MIGRATION_APPLIED", migration=path.name)
+    except Exception as e:
+        logger.error(f"Database migration failed: {e}", event_name="CLI_DB_ERROR", exc_info=True)
+        raise SystemExit(1)
+    finally:
+        if conn:
+            await conn.close()
+
 def main():
     parser = argparse.ArgumentParser(description="Sentiric Knowledge Manager")
     subparsers = parser.add_subparsers(dest="command", required=True)
@@ -87,7 +140,20 @@ def main():
     list_parser.add_argument("--tenant", help="Filter by Tenant ID")
 
     trigger_parser = subparsers.add_parser("run", help="Trigger immediate re-indexing")
+
+    parity_parser = subparsers.add_parser("parity", help="Compare an embedding backend against the torch backend")
+    parity_parser.add_argument("--backend", default="onnx", choices=["onnx", "sentence_transformers"], help="Candidate backend")
+    parity_parser.add_argument("--quantize", action="store_true", help="Use the int8-quantized ONNX model")
+    parity_parser.add_argument("--corpus", help="Text file with one sample per line (default: built-in sample)")
+    parity_parser.add_argument("--min-cosine", type=float, default=0.99, help="Fail if any sample falls below this cosine")
     
+    subparsers.add_parser("migrate-db", help="Apply SQL migrations in migrations/ to POSTGRES_URL")
+
+    migrate_parser = subparsers.add_parser("migrate-collections", help="Copy per-tenant collections into QDRANT_MULTITENANT_COLLECTION")
+    migrate_parser.add_argument("--tenant", help="Only migrate this tenant")
+    migrate_parser.add_argument("--batch-size", type=int, default=256, help="Points copied per batch")
+    migrate_parser.add_argument("--drop-source", action="store_true", help="Delete each per-tenant collection after a verified copy")
+
     args = parser.parse_args()
 
     if args.command == "add":
@@ -96,6 +162,13 @@ def main():
         asyncio.run(list_sources(args.tenant))
     elif args.command == "run":
         asyncio.run(trigger_indexing())
+    elif args.command == "migrate-db":
+        asyncio.run(migrate_db())
+    elif args.command == "migrate-collections":
+        asyncio.run(migrate_collections(args.tenant, args.batch_size, args.drop_source))
+    elif args.command == "parity":
+        if not check_embedding_parity(args.backend, args.quantize, args.corpus, args.min_cosine):
+            raise SystemExit(1)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,7 @@
+-- migrations/0001_datasource_leases.sql
+-- Çoklu pod kiralama (KNOWLEDGE_INDEXING_LEASING_ENABLED) için datasources kolonları.
+-- Servis açılışta bu kolonları kontrol eder; yoksa başlamaz. Uygulamak için:
+--   python manage.py migrate-db
+ALTER TABLE datasources
+    ADD COLUMN IF NOT EXISTS lease_owner TEXT,
+    ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ;